@@ -0,0 +1,176 @@
+# benchmark_stages.py
+
+import sys
+import os
+import json
+import time
+import datetime
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+import click
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.open_raw_file import open_raw_file
+from src.read_adult_data import read_adult_data
+from src.write_adult_data import write_adult_data
+from src.validate_df import validate_df
+from src.generate_adult_data import generate_adult_data
+from scripts.run_pipeline import run_stage
+
+STAGES = ["read_adult_data", "validate_df", "eda", "split_and_fit", "evaluate_model"]
+
+
+def benchmark_stages(reference, scale, work_dir, stages, random_seed):
+    """
+    Run the stages of the analysis on synthetic data `scale` times the size of the reference.
+
+    Each stage reads the outputs of the previous ones from `work_dir`, and the
+    scripts run in this interpreter through `run_stage`. Wall time, CPU time and
+    peak memory traced by tracemalloc are measured for every stage; tracemalloc
+    slows allocation-heavy code down, so times are comparable between runs of
+    this benchmark rather than with unprofiled runs. The first scale also pays
+    for importing the libraries of each script.
+
+    Returns a list of one dict of results per stage.
+    """
+    n_rows = len(reference) * scale
+    raw_file = os.path.join(work_dir, "adult.data")
+    cleaned_file = os.path.join(work_dir, "cleaned_data.csv")
+    generate_adult_data(n_rows, reference, random_state=random_seed).to_csv(raw_file, header=False, index=False)
+
+    state = {}
+
+    def read_stage():
+        state["raw"] = read_adult_data(raw_file, header=False, verbose=False)
+        return len(state["raw"])
+
+    def validate_stage():
+        state["validated"] = validate_df(state["raw"], fingerprint=True)
+        write_adult_data(state["validated"], cleaned_file)
+        return len(state["raw"])
+
+    def eda_stage():
+        run_stage("eda", {"processed_dir": cleaned_file, "results_dir": os.path.join(work_dir, "figures")})
+        return len(state["validated"])
+
+    def split_and_fit_stage():
+        run_stage("split_and_fit", {
+            "processed_dir": cleaned_file, "preprocessed_dir": work_dir, "random_seed": random_seed,
+            "models_dir": os.path.join(work_dir, "models"),
+        })
+        return len(state["validated"])
+
+    def evaluate_stage():
+        run_stage("evaluate_model", {
+            "x_dir": os.path.join(work_dir, "X_test.csv"), "y_dir": os.path.join(work_dir, "y_test.csv"),
+            "pickle_loc": os.path.join(work_dir, "models", "model.joblib"),
+            "results_figure_dir": os.path.join(work_dir, "figures"), "results_table_dir": os.path.join(work_dir, "table"),
+        })
+        return len(read_adult_data(os.path.join(work_dir, "y_test.csv"), verbose=False))
+
+    stage_functions = {
+        "read_adult_data": read_stage,
+        "validate_df": validate_stage,
+        "eda": eda_stage,
+        "split_and_fit": split_and_fit_stage,
+        "evaluate_model": evaluate_stage,
+    }
+
+    results = []
+    for stage in STAGES:
+        # Later stages need the outputs of the earlier ones, so those always run
+        if stage not in stages and not any(STAGES.index(later) > STAGES.index(stage) for later in stages):
+            continue
+        tracemalloc.start()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        rows = stage_functions[stage]()
+        wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        if stage in stages:
+            results.append({
+                "stage": stage,
+                "scale": scale,
+                "rows": rows,
+                "wall_time_s": wall_time,
+                "cpu_time_s": cpu_time,
+                "rows_per_s": rows / wall_time,
+                "peak_memory_mb": peak_memory / 1e6,
+            })
+            print(f"{stage:>16} x{scale:<4} {rows:>10,} rows {wall_time:8.2f}s "
+                  f"{rows / wall_time:>12,.0f} rows/s {peak_memory / 1e6:9.1f} MB peak")
+    return results
+
+
+@click.command()
+@click.option('--raw_dir', type=str, default="data/raw/adult.zip", help="Path to the raw data the synthetic data follows, a ZIP archive or a file")
+@click.option('--member', type=str, default="adult.data", help="Name of the raw data file inside the ZIP archive")
+@click.option('--scales', type=str, default="1,10", help="Comma separated multiples of the raw data size to benchmark, such as 1,10,100")
+@click.option('--stages', type=str, default=",".join(STAGES), help="Comma separated stages to benchmark")
+@click.option('--random_seed', type=int, default=522, help="Seed of the synthetic data and of the data split")
+@click.option('--output', type=str, default="results/benchmarks/benchmark.json", help="Path of the JSON file of results")
+@click.option('--baseline', type=str, default=None, help="JSON file of an earlier run to compare the wall times with")
+def main(raw_dir, member, scales, stages, random_seed, output, baseline):
+    """
+    Benchmark how the stages of the analysis scale with synthetic data.
+
+    Parameters:
+        raw_dir (str): Path to the raw data, whose marginals the synthetic data follows.
+        member (str): Name of the raw data file inside the ZIP archive.
+        scales (str): Comma separated multiples of the raw data size.
+        stages (str): Comma separated stages to benchmark.
+        random_seed (int): Seed of the synthetic data and of the data split.
+        output (str): Path of the JSON file of results.
+        baseline (str): JSON file of an earlier run to compare with.
+
+    Outputs:
+        - Prints the wall time, rows per second and peak memory of each stage.
+        - Saves them to a JSON file, with the environment they were measured in.
+    """
+    scales = [int(scale) for scale in scales.split(",")]
+    stages = stages.split(",")
+    unknown_stages = set(stages) - set(STAGES)
+    if unknown_stages:
+        raise click.BadParameter(f"Unknown stages {sorted(unknown_stages)}, choose from {STAGES}", param_hint="--stages")
+
+    with open_raw_file(raw_dir, member if raw_dir.endswith(".zip") else None) as f:
+        reference = read_adult_data(f, header=False, verbose=False)
+
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as work_dir:
+            results += benchmark_stages(reference, scale, work_dir, stages, random_seed)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "reference_rows": len(reference),
+        "random_seed": random_seed,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to {output}")
+
+    if baseline is not None:
+        with open(baseline) as f:
+            baseline_times = {(result["stage"], result["scale"]): result["wall_time_s"] for result in json.load(f)["results"]}
+        for result in results:
+            key = (result["stage"], result["scale"])
+            if key in baseline_times:
+                print(f"{result['stage']:>16} x{result['scale']:<4} {result['wall_time_s'] / baseline_times[key]:6.2f}x the baseline wall time")
+
+
+if __name__ == '__main__':
+    main()
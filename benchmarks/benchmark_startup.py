@@ -0,0 +1,108 @@
+# benchmark_startup.py
+
+import sys
+import os
+import json
+import time
+import datetime
+import platform
+import statistics
+import subprocess
+import click
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+COMMANDS = ["download", "validate", "eda", "train", "evaluate", "predict", "pipeline"]
+
+
+def benchmark_startup(args, repeat):
+    """
+    Time `repeat` cold starts of `python <args>` from the project root.
+
+    Every run is a new interpreter, as when a Makefile or an orchestrator calls
+    the command, so the times include interpreter start-up and every import.
+
+    Returns a dict of the minimum and median wall time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT_DIR, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times)}
+
+
+def imported_modules(args):
+    """Return the top-level packages imported by `python -X importtime <args>`, with their cumulative import time in seconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT_DIR, check=True, capture_output=True, text=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  ") and not name.strip().startswith("_") and cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative) / 1e6
+    return modules
+
+
+@click.command()
+@click.option('--repeat', type=int, default=10, help="Number of cold starts timed per command")
+@click.option('--output', type=str, default="results/benchmarks/startup.json", help="Path of the JSON file of results")
+@click.option('--baseline', type=str, default=None, help="JSON file of an earlier run to compare the median times with")
+def main(repeat, output, baseline):
+    """
+    Benchmark the start-up time of the command-line interface.
+
+    Parameters:
+        repeat (int): Number of cold starts timed per command.
+        output (str): Path of the JSON file of results.
+        baseline (str): JSON file of an earlier run to compare with.
+
+    Outputs:
+        - Prints the minimum and median start-up time of `scripts/cli.py --help`
+          and of the --help of every subcommand, and the slowest imports of the
+          `train --help` start-up.
+        - Saves them to a JSON file, with the environment they were measured in.
+    """
+    cases = {"cli --help": ["scripts/cli.py", "--help"]}
+    cases.update({f"cli {command} --help": ["scripts/cli.py", command, "--help"] for command in COMMANDS})
+
+    results = []
+    for name, args in cases.items():
+        result = {"command": name, **benchmark_startup(args, repeat)}
+        results.append(result)
+        print(f"{name:>24} {result['min_s'] * 1000:8.0f} ms min {result['median_s'] * 1000:8.0f} ms median")
+
+    slowest_imports = sorted(imported_modules(cases["cli train --help"]).items(), key=lambda module: -module[1])[:10]
+    print("Slowest imports of `cli train --help`:")
+    for module, seconds in slowest_imports:
+        print(f"{module:>24} {seconds * 1000:8.1f} ms")
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+        "slowest_imports": dict(slowest_imports),
+    }
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to {output}")
+
+    if baseline is not None:
+        with open(baseline) as f:
+            baseline_times = {result["command"]: result["median_s"] for result in json.load(f)["results"]}
+        for result in results:
+            if result["command"] in baseline_times:
+                print(f"{result['command']:>24} {result['median_s'] / baseline_times[result['command']]:6.2f}x the baseline median time")
+
+
+if __name__ == '__main__':
+    main()
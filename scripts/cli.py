@@ -0,0 +1,57 @@
+# cli.py
+
+import sys
+import os
+import importlib
+import click
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Subcommand name: (script in `scripts/` whose `main` runs it, short help)
+COMMANDS = {
+    "download": ("download_data", "Download the dataset archive."),
+    "validate": ("read_and_validate", "Read, validate and clean the raw data."),
+    "eda": ("eda", "Plot the distribution of income over the categorical features."),
+    "train": ("split_and_fit", "Split the data and fit the KNN classifier."),
+    "evaluate": ("evaluate_model", "Score the model on the test split."),
+    "predict": ("predict", "Score a data file of any size with the trained model."),
+    "pipeline": ("run_pipeline", "Run every stage, skipping those whose outputs are cached."),
+}
+
+
+class LazyGroup(click.Group):
+    """
+    A click group that imports the script of a subcommand only when it is invoked.
+
+    Listing the subcommands, for --help, uses the short help of `COMMANDS` and
+    imports none of them.
+    """
+
+    def list_commands(self, ctx):
+        return list(COMMANDS)
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in COMMANDS:
+            return None
+        script, _ = COMMANDS[cmd_name]
+        return importlib.import_module(f"scripts.{script}").main
+
+    def format_commands(self, ctx, formatter):
+        rows = [(name, short_help) for name, (_, short_help) in COMMANDS.items()]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup)
+def cli():
+    """
+    Run the stages of the adult income analysis.
+
+    Every stage is a subcommand taking the options of its script, for example
+    `python scripts/cli.py train --help`. The scripts import pandas, scikit-learn,
+    altair or matplotlib inside the command that uses them, so neither listing
+    the subcommands nor the --help of one loads them.
+    """
+
+
+if __name__ == '__main__':
+    cli()
@@ -6,31 +6,67 @@ import sys
 import os
 import click
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.read_zip import read_zip
+from src.profiler import profile_option, step
 
 @click.command()
-@click.option('--url', type=str, required=True, help="URL of the dataset to be downloaded (must be a ZIP file).")
+@profile_option
+@click.option('--url', type=str, required=True, multiple=True, help="URL of a dataset to be downloaded (must be a ZIP file). Repeat to download several at once; each must end in a different file name.")
+@click.option('--mirror', type=str, multiple=True, help="URL of a mirror of the --url ending in the same file name. Repeat for several mirrors; the fastest one is used.")
 @click.option('--target_dir', type=str, required=True, help="Path to the directory where the data will be stored.")
-def main(url, target_dir):
+@click.option('--extract/--no-extract', default=True, help="Whether to extract the archive or keep it zipped for reading in place.")
+@click.option('--n_jobs', type=int, default=4, help="Number of archives downloaded at a time.")
+@click.option('--timeout', type=float, default=60, help="Seconds to wait for a server before giving up on a request.")
+@click.option('--retries', type=int, default=3, help="Number of times a failed request is retried, with exponential backoff.")
+def main(url, mirror, target_dir, extract, n_jobs, timeout, retries):
     """
     Command-line interface for downloading and extracting downloaded files.
 
     Parameters:
     ----------
-    url : str
-        The URL of the ZIP file to download.
+    url : tuple of str
+        The URLs of the ZIP files to download, each ending in a different file name.
+    mirror : tuple of str
+        URLs of mirrors of the archives, each belonging to the `url` ending in the
+        same file name. An archive is downloaded from the fastest of its URL and
+        its mirrors.
     target_dir : str
-        The directory to save and extract the contents of the downloaded file.
+        The directory to save and extract the contents of the downloaded files.
+    extract : bool
+        Whether to extract the archives after downloading them.
+    n_jobs : int
+        Number of archives downloaded, and extracted, at a time.
+    timeout : float
+        Seconds to wait for a server before giving up on a request.
+    retries : int
+        Number of times a failed request is retried.
 
     Returns:
     -------
     None
+
+    Raises:
+    ------
+    click.UsageError:
+        If a mirror ends in a file name no `url` ends in.
+    click.ClickException:
+        If an archive could not be downloaded, exiting with a non-zero status.
     """
-    try:
-        read_zip(url, target_dir)
-    except Exception as e:
-        print(f"An error has occurred: {e}")
+    from src.download_archives import download_archives
 
+    archives = [[archive_url] for archive_url in url]
+    for mirror_url in mirror:
+        matches = [mirrors for mirrors in archives if os.path.basename(mirrors[0]) == os.path.basename(mirror_url)]
+        if not matches:
+            raise click.UsageError(f"--mirror {mirror_url} ends in a file name that no --url ends in")
+        matches[0].append(mirror_url)
+
+    try:
+        with step("download_archives"):
+            sources = download_archives(archives, target_dir, n_jobs=n_jobs, timeout=timeout, retries=retries, extract=extract)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    for name, source in sources.items():
+        print(f"{name} downloaded from {source}")
 
 if __name__ == '__main__':
     main()
@@ -5,40 +5,80 @@
 import sys
 import os
 import click  
-import pandas as pd
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.generate_bar_chart_and_save import generate_bar_chart_and_save
+from src.profiler import profile_option, step
+
+
+# (plot title, plotted column, file name) of each plot
+PLOTS = [
+    ("Marital Status", "marital-status", "eda1.png"),
+    ("Relationships", "relationship", "eda2.png"),
+    ("Occupations", "occupation", "eda3.png"),
+    ("Workclass", "workclass", "eda4.png"),
+    ("Race", "race", "eda5.png"),
+    ("Sex", "sex", "eda6.png")
+]
+
+
+def plot_eda(data_adult, results_dir):
+    """
+    Plot the distribution of income over each categorical column of `PLOTS`.
+
+    Args:
+        data_adult (pandas.DataFrame): Adult income data with the plotted columns and 'income'.
+        results_dir (str): Path to the directory where the generated plots will be saved.
+
+    Returns:
+        int: Number of plots rendered, the others were unchanged and skipped.
+    """
+    from src.count_by_income import count_by_income
+    from src.generate_bar_chart_and_save import generate_bar_chart_and_save
+
+    # Count the rows of every (column, income) pair once, so only the counts are put into the plots
+    with step("count_by_income", rows=len(data_adult)):
+        counts = count_by_income(data_adult, [y_axis_name for _, y_axis_name, _ in PLOTS])
+
+    def render(plot):
+        y_axis_label, y_axis_name, plot_name = plot
+        with step(f"render {plot_name}", rows=len(counts[y_axis_name])):
+            return generate_bar_chart_and_save(
+                counts[y_axis_name], y_axis_label, y_axis_name, results_dir, plot_name,
+                count_column="count", skip_unchanged=True,
+            )
+
+    # Render the plots one at a time, skipping those whose counts and labels have not changed
+    with step("render_plots"):
+        rendered = [render(plot) for plot in PLOTS]
+
+    print(f"EDA successfully performed: {sum(rendered)} plots rendered, {len(rendered) - sum(rendered)} unchanged plots skipped!")
+    return sum(rendered)
 
 
 @click.command()
-@click.option('--processed_dir', type=str, help="Path to processed training data (CSV file)", required=True)
+@profile_option
+@click.option('--processed_dir', type=str, help="Path to processed training data (CSV, Parquet or Feather file)", required=True)
 @click.option('--results_dir', type=str, help="Path to the directory where the plots will be saved", required=True)
 def main(processed_dir, results_dir):
     """
     Perform exploratory data analysis and generate bar plots.
 
     Args:
-        processed_dir (str): Path to the processed training data in CSV format.
+        processed_dir (str): Path to the processed training data in CSV, Parquet or Feather format.
         results_dir (str): Path to the directory where the generated plots will be saved.
 
     Outputs:
         Six bar plots showing the distribution of income for various categorical variables.
     """
-    # Load the dataset from the specified directory
-    data_adult = pd.read_csv(processed_dir)
-    tup_list = [
-        ("Marital Status", "marital-status", "eda1.png"),
-        ("Relationships", "relationship", "eda2.png"),
-        ("Occupations", "occupation", "eda3.png"),
-        ("Workclass", "workclass", "eda4.png"),
-        ("Race", "race", "eda5.png"),
-        ("Sex", "sex", "eda6.png")
-    ]
-    for y_axis_label, y_axis_name, plot_name in tup_list:
-        generate_bar_chart_and_save(data_adult, y_axis_label, y_axis_name, results_dir, plot_name)
-
-    print("EDA successfully performed and plots saved!")
+    from src.read_adult_data import read_adult_data
+
+    # Load only the plotted columns of the dataset from the specified directory
+    columns = [y_axis_name for _, y_axis_name, _ in PLOTS] + ["income"]
+    with step("read_adult_data") as record:
+        data_adult = read_adult_data(processed_dir, columns=columns)
+        record["rows"] = len(data_adult)
+
+    plot_eda(data_adult, results_dir)
 
 # Entry point of the script
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
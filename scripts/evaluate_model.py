@@ -5,64 +5,121 @@
 import sys
 import os
 import click
-import pickle
-import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.metrics import ConfusionMatrixDisplay
+import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
+from src.profiler import profile_option, step
+
+def evaluate_model(model, X_test_chunks, y_test, results_figure_dir, results_table_dir, n_jobs=1, model_path=None):
+    """
+    Score a fitted model on the test set and save its metrics and confusion matrix.
+
+    Parameters:
+        model (object): The fitted model.
+        X_test_chunks (iterable of pandas.DataFrame): Test features, one DataFrame per chunk.
+        y_test (pandas.Series): Test labels, in the order of the chunks.
+        results_figure_dir (str): Directory to save the confusion matrix plot.
+        results_table_dir (str): Directory to save the test score and metrics.
+        n_jobs (int): Number of worker processes scoring chunks in parallel, -1 for one per core.
+        model_path (str, optional): Path the worker processes load the model from,
+            memory mapping a .joblib artifact. By default `model` is sent to them.
+            Scoring in this process always uses `model`, never loading it again.
+
+    Returns:
+        pandas.DataFrame: The metrics, one row per metric.
+    """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import ConfusionMatrixDisplay
+    from src.predict_chunks import predict_chunks
+    from src.evaluate_predictions import evaluate_predictions
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    # Predict the labels and probabilities of the test set in a single pass
+    start = time.perf_counter()
+    with step("predict_chunks") as record:
+        source = model if model_path is None or n_jobs == 1 else model_path
+        predictions = pd.concat(predict_chunks(source, X_test_chunks, n_jobs=n_jobs, proba=True), ignore_index=True)
+        record["rows"] = len(predictions)
+    print(f"Scored {len(predictions)} test rows in {time.perf_counter() - start:.1f}s with {n_jobs} worker(s)")
+
+    with step("evaluate_predictions", rows=len(predictions)):
+        metrics, matrix, report = evaluate_predictions(y_test, predictions, model.classes_)
+
+    # Save the model's test score (accuracy) to a CSV file, along with every other metric
+    test_score = metrics.set_index("metric").loc["accuracy", "value"]
+    print(f"The model obtained a final test score of: {test_score}")
+    print(f"Test metrics:\n{metrics.to_string(index=False)}")
+
+    test_score_file = create_dir_and_file_if_not_exist(results_table_dir, "test_score.csv")
+    pd.DataFrame({'test_score': [test_score]}).to_csv(test_score_file, index=False)
+    metrics.to_csv(create_dir_and_file_if_not_exist(results_table_dir, "test_metrics.csv"), index=False)
+    matrix.to_csv(create_dir_and_file_if_not_exist(results_table_dir, "confusion_matrix.csv"))
+    report.to_csv(create_dir_and_file_if_not_exist(results_table_dir, "classification_report.csv"))
+
+    with step("render_confusion_matrix"):
+        # Generate the confusion matrix plot from the same predictions
+        ConfusionMatrixDisplay(
+            confusion_matrix=matrix.to_numpy(),
+            display_labels=model.classes_,
+        ).plot(values_format="d")  # Format values as integers
+
+        # Save the confusion matrix plot to the results directory
+        cm_path = create_dir_and_file_if_not_exist(results_figure_dir, "cm.png")
+        plt.title('Confusion Matrix for Income Prediction KNN Model', fontsize=16)
+        plt.savefig(cm_path, dpi=300, bbox_inches='tight')
+        plt.close()  
+
+    print("Model evaluation completed successfully!")
+
+    return metrics
+
 
 @click.command()
-@click.option('--x_dir', type=str, help="Path to X_test CSV file", required=True)
-@click.option('--y_dir', type=str, help="Path to y_test CSV file", required=True)
-@click.option('--pickle_loc', type=str, help="Path to the pickle file containing the trained model", required=True)
+@profile_option
+@click.option('--x_dir', type=str, help="Path to X_test CSV, Parquet or Feather file", required=True)
+@click.option('--y_dir', type=str, help="Path to y_test CSV, Parquet or Feather file", required=True)
+@click.option('--pickle_loc', type=str, help="Path to the trained model, a pickle file or a memory-mappable .joblib artifact", required=True)
 @click.option('--results_figure_dir', type=str, help="Path to the directory where the plots will be saved", required=True)
 @click.option('--results_table_dir', type=str, help="Path to the directory where the table will be saved", required=True)
-def main(x_dir, y_dir, pickle_loc, results_figure_dir, results_table_dir):
+@click.option('--chunksize', type=int, default=100_000, help="Number of test rows to score at a time")
+@click.option('--n_jobs', type=int, default=1, help="Number of worker processes, -1 for one per core")
+def main(x_dir, y_dir, pickle_loc, results_figure_dir, results_table_dir, chunksize, n_jobs):
     """
     Main function to evaluate a model's performance on test data.
     
     Parameters:
-        x_dir(str): Path to the CSV file containing test features.
-        y_dir (str): Path to the CSV file containing test labels.
+        x_dir(str): Path to the CSV, Parquet or Feather file containing test features.
+        y_dir (str): Path to the CSV, Parquet or Feather file containing test labels.
         results_dir (str): Directory to save evaluation results (e.g., confusion matrix).
         table_dir (str): Directory to save final prediction score.
-        pickle_loc (str): Path to the pickle file containing the trained model.
+        pickle_loc (str): Path to the trained model, a pickle file or a .joblib artifact.
+        chunksize (int): Number of test rows read and scored at a time.
+        n_jobs (int): Number of worker processes scoring chunks in parallel.
     
     Outputs:
         - Prints the model's test score.
+        - Saves the test score, the metrics, the confusion matrix and the
+          per-class precision, recall and F1 to the table directory.
         - Saves the confusion matrix plot to the specified results directory.
-    """
-    # Load the trained model from the pickle file
-    with open(pickle_loc, 'rb') as f:
-        model = pickle.load(f)
-    
-    # Load test datasets
-    X_test = pd.read_csv(x_dir)  # Features for testing
-    y_test = pd.read_csv(y_dir)  # Labels for testing
 
-    # Calculate the model's test score, and save it to a CSV file
-    test_score = model.score(X_test, y_test)
-    print(f"The model obtained a final test score of: {test_score}")
-        
-    test_score_file = create_dir_and_file_if_not_exist(results_table_dir, "test_score.csv")
-    pd.DataFrame({'test_score': [test_score]}).to_csv(test_score_file, index=False)
+    The model scores the test set once, chunk by chunk, and every metric is
+    computed from those predictions and probabilities.
+    """
+    from src.read_adult_data import read_adult_data
+    from src.model_artifact import load_model
 
-    # Generate and save the confusion matrix plot
-    ConfusionMatrixDisplay.from_estimator(
-        model,
-        X_test,
-        y_test,
-        values_format="d"  # Format values as integers
-    )
+    # Load the trained model, memory mapping its arrays when it is a .joblib artifact
+    with step("load_model"):
+        model = load_model(pickle_loc)
 
-    # Save the confusion matrix plot to the results directory
-    cm_path = create_dir_and_file_if_not_exist(results_figure_dir, "cm.png")
-    plt.title('Confusion Matrix for Income Prediction KNN Model', fontsize=16)
-    plt.savefig(cm_path, dpi=300, bbox_inches='tight')
-    plt.close()  
+    # Load the test labels, and the test features one chunk at a time
+    X_test_chunks = read_adult_data(x_dir, chunksize=chunksize, columns=list(model.feature_names_in_))  # Features for testing
+    y_test = read_adult_data(y_dir).squeeze("columns")  # Labels for testing
 
-    print("Model evaluation completed successfully!")
+    evaluate_model(model, X_test_chunks, y_test, results_figure_dir, results_table_dir, n_jobs=n_jobs, model_path=pickle_loc)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,68 @@
+# predict.py
+
+import sys
+import os
+import time
+import click
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
+from src.profiler import profile_option, step
+
+
+@click.command()
+@profile_option
+@click.option('--input_dir', type=str, help="Path to the data to score (CSV, Parquet or Feather file)", required=True)
+@click.option('--pickle_loc', type=str, help="Path to the trained model, a pickle file or a memory-mappable .joblib artifact", required=True)
+@click.option('--output_dir', type=str, help="Path to the directory where the predictions will be saved", required=True)
+@click.option('--output_name', type=str, default="predictions.csv", help="File name of the predictions, its extension sets the format")
+@click.option('--chunksize', type=int, default=100_000, help="Number of rows to score at a time")
+@click.option('--n_jobs', type=int, default=1, help="Number of worker processes, -1 for one per core")
+@click.option('--proba', is_flag=True, help="Also write the predicted probability of each class")
+def main(input_dir, pickle_loc, output_dir, output_name, chunksize, n_jobs, proba):
+    """
+    Score a file of any size with the trained model, one chunk at a time.
+
+    Parameters:
+        input_dir (str): Path to the data to score, with at least the model's features.
+        pickle_loc (str): Path to the trained model, a pickle file or a .joblib artifact.
+        output_dir (str): Directory to save the predictions.
+        output_name (str): File name of the predictions, ending in .csv, .parquet or .feather.
+        chunksize (int): Number of rows read and scored at a time.
+        n_jobs (int): Number of worker processes scoring chunks in parallel.
+        proba (bool): Whether to write the predicted probabilities too.
+
+    Outputs:
+        - Writes one prediction per input row, in the order of the input.
+        - Prints the number of rows scored per second.
+    """
+    from src.predict_chunks import predict_chunks
+    from src.model_artifact import load_model
+    from src.read_adult_data import read_adult_data
+    from src.write_adult_data import write_adult_data
+
+    # Load the trained model once, to read only the columns it was fitted on
+    with step("load_model"):
+        model = load_model(pickle_loc)
+    columns = list(model.feature_names_in_)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    # This process scores with the model already loaded, worker processes load it from the file
+    if n_jobs != 1:
+        model = pickle_loc
+
+    start = time.perf_counter()
+    chunks = read_adult_data(input_dir, chunksize=chunksize, columns=columns)
+    predictions = predict_chunks(model, chunks, n_jobs=n_jobs, proba=proba)
+    output_file = create_dir_and_file_if_not_exist(output_dir, output_name)
+    with step("predict_and_write_chunks") as record:
+        n_rows = record["rows"] = write_adult_data(predictions, output_file)
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {n_rows} rows in {elapsed:.1f}s ({n_rows / elapsed:,.0f} rows per second) with {n_jobs} worker(s)")
+    print(f"Predictions saved to {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,46 +4,195 @@
 
 import sys
 import os
+import glob
 import click
-import pandas as pd
-import pandera as pa
+import shutil
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.data_format import FORMATS
 from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
-from src.validate_df import validate_df
+from src.open_raw_file import open_raw_file
+from src.validation_cache import validation_cache_key, hash_file, cache_path
 from src.validate_raw_file import validate_raw_file
+from src.profiler import profile_option, step
+
+
+def read_and_validate(raw_dir, member=None, error_sink=None):
+    """
+    Read the raw data into a DataFrame and validate it.
+
+    Parameters:
+    - raw_dir (str): Path to the raw data file, or to the ZIP archive holding it.
+    - member (str): Name of the raw data file inside the archive, read without extracting it.
+    - error_sink (ErrorSink): Sink the failures and examples of failing rows are added to.
+
+    Returns:
+    - tuple: The validated DataFrame, and the report of the rows failing each check.
+    """
+    from src.read_adult_data import read_adult_data
+    from src.validate_df import validate_df
+
+    with open_raw_file(raw_dir, member) as raw_file:
+        with step("read_adult_data") as record:
+            data_adult = read_adult_data(raw_file, header=False)
+            record["rows"] = len(data_adult)
+
+    with step("validate_df", rows=len(data_adult)):
+        return validate_df(data_adult, return_report=True, error_sink=error_sink, fingerprint=True)
 
 
 @click.command()
-@click.option('--raw_dir', type=str, help="Path to raw data")
+@profile_option
+@click.option('--raw_dir', type=str, help="Path to raw data, or to the ZIP archive holding it when --member is given, or a glob pattern of several")
+@click.option('--member', type=str, multiple=True, help="Name of a raw data file inside the ZIP archive at --raw_dir, repeated to read several")
 @click.option('--processor_dir', type=str, help="Path to directory where processed data will be written to")
-def main(raw_dir, processor_dir):
+@click.option('--chunksize', type=int, default=None, help="Number of rows to read and validate at a time, to clean files bigger than memory")
+@click.option('--format', 'file_format', type=click.Choice(list(FORMATS)), default="csv", help="File format of the cleaned data")
+@click.option('--cache_dir', type=str, default=None, help="Directory of cached validation results, reused while the raw file is unchanged")
+@click.option('--state_dir', type=str, default=None, help="Directory of the watermark of an incremental run, which only validates and appends the rows added to the raw file since the last run")
+@click.option('--verify_prefix', is_flag=True, default=False, help="Hash the whole raw file processed by earlier incremental runs, to catch edits in its middle")
+@click.option('--n_jobs', type=int, default=1, help="Number of worker processes reading several raw files")
+@click.option('--error_log', type=str, default="data/logs/validation_errors.jsonl", help="Path of the JSON lines file of the failure counts and examples of failing rows")
+@click.option('--error_sample_size', type=int, default=100, help="Maximum number of examples of failing rows in --error_log")
+def main(raw_dir, member, processor_dir, chunksize, file_format, cache_dir, state_dir, verify_prefix, n_jobs, error_log, error_sample_size):
     """
     Main function for reading and validating raw data.
 
     Parameters:
-    - raw_dir (str): Path to the raw data file.
+    - raw_dir (str): Path to the raw data file, or to the ZIP archive holding it, or a glob pattern
+      matching several of them.
+    - member (tuple of str): Names of the raw data files inside each archive, read without extracting them.
     - processor_dir (str): Directory to save the processed data.
+    - chunksize (int): Number of rows validated at a time. Reads the whole file at once when not given.
+    - file_format (str): Format of the cleaned data file, one of 'csv', 'parquet' or 'feather'.
+    - cache_dir (str): Directory of cached results, keyed by a hash of the raw file, the schema and the
+      error sample size. A cached result holds the cleaned data, the report and the error log.
+    - state_dir (str): Directory of the byte offset, prefix hash and row fingerprints of the rows
+      processed so far, for an incremental run over an uncompressed raw file that is only appended to.
+    - verify_prefix (bool): Whether an incremental run hashes the whole processed part of the raw file.
+      By default only its length and its first and last 64 KiB are hashed, which does not catch
+      rows edited in the middle of it.
+    - n_jobs (int): Number of worker processes parsing and validating several raw files at once.
+      Several files are merged into one cleaned dataset with a 'source_file' column, without
+      the rows repeated across them.
+    - error_log (str): Path of the JSON lines file of the number of rows failing each check and of a
+      uniform sample of the failing rows, which takes the same memory however dirty the raw data is.
+    - error_sample_size (int): Maximum number of failing rows sampled into the error log.
     """
+    import pandas as pd
+    from src.read_adult_data import read_adult_data
+    from src.write_adult_data import write_adult_data
+    from src.validate_df import SCHEMA_KEY, COLUMNS
+    from src.row_fingerprint import FINGERPRINT_COLUMN
+    from src.validate_df_iter import validate_df_iter
+    from src.error_sink import ErrorSink
+
+    paths = sorted(glob.glob(raw_dir)) if glob.has_magic(raw_dir) else [raw_dir]
+    sources = [(path, name) for path in paths for name in (member or [None])]
+    if not sources:
+        raise FileNotFoundError(f"Unable to find raw file in {raw_dir}. Please check the download step.")
+    if len(sources) > 1 and (chunksize is not None or state_dir is not None):
+        raise click.UsageError("--chunksize and --state_dir read a single raw file")
 
-    # Step 1: Validate raw data file
-    validate_raw_file(raw_dir)
+    # Step 1: Validate raw data files
+    with step("validate_raw_file"):
+        for path, name in sources:
+            validate_raw_file(path, name)
     print("Data Validation 1 passed: File existence and format verified.")
 
-    # Step 2: Read data into a DataFrame
-    col_names = [
-        'age', 'workclass', 'fnlwgt', 'education', 'education-num',
-        'marital-status', 'occupation', 'relationship', 'race', 'sex',
-        'capital-gain', 'capital-loss', 'hours-per-week', 'native-country', 'income'
-    ]
-    data_adult = pd.read_csv(raw_dir, names=col_names)
+    output_file = create_dir_and_file_if_not_exist(processor_dir, "cleaned_data" + FORMATS[file_format])
+    error_sink = ErrorSink(error_sample_size)
 
-    # Step 3: Validate data frame
-    validated_data = validate_df(data_adult)
-    print("Data Validation 2 passed: Dataframe validated successfully.")
+    # Validate and append only the rows added since the last incremental run
+    if state_dir is not None:
+        from src.ingest_incremental import ingest_incremental
+
+        if member or file_format != "csv":
+            raise click.UsageError("--state_dir needs an uncompressed raw file, without --member, and --format=csv")
+        with step("ingest_incremental") as record:
+            result = ingest_incremental(
+                raw_dir, output_file, state_dir, chunksize=chunksize, error_sink=error_sink,
+                **({"window": None} if verify_prefix else {}),
+            )
+            record["rows"] = result["rows_read"]
+        report = result["report"]
+        print(f"Data Validation 2 passed: {'Raw file rewritten, validated from the start' if result['rebuilt'] else 'Validated the new rows'}.")
+        print(f"Appended {result['rows_written']} of {result['rows_read']} new rows, "
+              f"{result['clean_rows']} of {result['rows']} rows kept in total.")
+        if (report["failure_count"] > 0).any():
+            print(f"New rows failing each check:\n{report[report['failure_count'] > 0].to_string(index=False)}")
+        error_sink.write(error_log)
+        print(f"Cleaned data saved to {output_file}")
+        return
+
+    # Reuse the cleaned data of an unchanged raw file
+    if cache_dir is not None:
+        with step("hash_raw_file"):
+            key = validation_cache_key(
+                SCHEMA_KEY, *[part for path, name in sources for part in (hash_file(path), name)], file_format, error_sample_size
+            )
+        cached_output_file = cache_path(cache_dir, key, os.path.basename(output_file))
+        cached_error_log = cache_path(cache_dir, key, "validation_errors.jsonl")
+        cached_report_file = cache_path(cache_dir, key, "report.csv")
+        if os.path.isfile(cached_report_file):
+            with step("restore_cached_result"):
+                shutil.copyfile(cached_output_file, output_file)
+                # The error log of an earlier run describes other data
+                os.makedirs(os.path.dirname(error_log) or ".", exist_ok=True)
+                shutil.copyfile(cached_error_log, error_log)
+                report = pd.read_csv(cached_report_file)
+            print("Data Validation 2 passed: Raw file unchanged, reusing cached validation result.")
+            print(f"Rows failing each check:\n{report[report['failure_count'] > 0].to_string(index=False)}")
+            print(f"Failure counts and examples of failing rows restored to {error_log}")
+            print(f"Cleaned data saved to {output_file}")
+            return
+
+    if len(sources) > 1:
+        from src.read_raw_files import read_raw_files
+
+        # Steps 2-3: Read and validate every file, in parallel, and merge them
+        with step("read_raw_files") as record:
+            validated_data, report = read_raw_files(sources, n_jobs=n_jobs, error_sink=error_sink)
+            record["rows"] = len(validated_data)
 
-    # Step 4: Save validated data
-    output_file = create_dir_and_file_if_not_exist(processor_dir, "cleaned_data.csv")
-    validated_data.to_csv(output_file, index=False)
+        # Step 4: Save validated data
+        with step("write_adult_data") as record:
+            n_validated = record["rows"] = write_adult_data(validated_data, output_file)
+    elif chunksize is None:
+        # Steps 2-3: Read data into a DataFrame and validate it
+        validated_data, report = read_and_validate(*sources[0], error_sink=error_sink)
+
+        # Step 4: Save validated data
+        with step("write_adult_data") as record:
+            n_validated = record["rows"] = write_adult_data(validated_data, output_file)
+    else:
+        with open_raw_file(*sources[0]) as raw_file:
+            # Steps 2-4: Read, validate and append the data one chunk at a time
+            chunks = read_adult_data(raw_file, header=False, chunksize=chunksize)
+            reports = []
+            def validated_chunks():
+                for validated_chunk, chunk_report in validate_df_iter(chunks, error_sink=error_sink, fingerprint=True):
+                    reports.append(chunk_report)
+                    yield validated_chunk
+            with step("read_validate_write_chunks") as record:
+                n_validated = record["rows"] = write_adult_data(
+                    validated_chunks(), output_file, columns=COLUMNS + [FINGERPRINT_COLUMN]
+                )
+        report = pd.concat(reports).groupby(["column", "check"], sort=False, as_index=False).sum()
+
+    with step("write_error_log"):
+        error_sink.write(error_log)
+
+    if cache_dir is not None:
+        # The report is written last, marking the entry complete
+        with step("store_cached_result"):
+            shutil.copyfile(output_file, cached_output_file)
+            shutil.copyfile(error_log, cached_error_log)
+            report.to_csv(cached_report_file, index=False)
+
+    print("Data Validation 2 passed: Dataframe validated successfully.")
+    print(f"Kept {n_validated} rows. Rows failing each check:\n"
+          f"{report[report['failure_count'] > 0].to_string(index=False)}")
+    print(f"Failure counts and {len(error_sink.examples)} examples of failing rows saved to {error_log}")
     print(f"Cleaned data saved to {output_file}")
 
 
@@ -0,0 +1,215 @@
+# run_pipeline.py
+
+import sys
+import os
+import time
+import click
+import importlib.util
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.data_format import FORMATS
+from src.stage_cache import stage_cache_key, stage_code_paths, restore_stage, store_stage
+from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
+from src.profiler import profile_option, step
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Stages run every time: the download has no inputs to key its cache on, and only
+# the server knows whether the archive changed, which `read_zip` asks cheaply with
+# a conditional request
+UNCACHED_STAGES = {"download_data"}
+
+
+def pipeline_stages(url, random_seed, file_format):
+    """
+    List the stages of the analysis as (name, parameters, inputs, outputs).
+
+    Each name is the script in `scripts/` that runs the stage, and the parameters
+    are passed to it as command-line options.
+    """
+    extension = FORMATS[file_format]
+    return [
+        ("download_data",
+         {"url": url, "target_dir": "data/raw", "extract": False},
+         [],
+         ["data/raw/adult.zip"]),
+        ("read_and_validate",
+         {"raw_dir": "data/raw/adult.zip", "member": "adult.data", "processor_dir": "data/processed", "format": file_format},
+         ["data/raw/adult.zip"],
+         [f"data/processed/cleaned_data{extension}"]),
+        ("eda",
+         {"processed_dir": f"data/processed/cleaned_data{extension}", "results_dir": "results/figures"},
+         [f"data/processed/cleaned_data{extension}"],
+         [f"results/figures/eda{i}.png" for i in range(1, 7)]),
+        ("split_and_fit",
+         {"processed_dir": f"data/processed/cleaned_data{extension}", "preprocessed_dir": "data/processed",
+          "random_seed": random_seed, "models_dir": "results/models", "format": file_format},
+         [f"data/processed/cleaned_data{extension}"],
+         [f"data/processed/X_test{extension}", f"data/processed/y_test{extension}", "results/models/model.pickle",
+          "results/models/model.joblib", "results/models/model.joblib.json", "results/models/model_lookup.pickle"]),
+        ("evaluate_model",
+         {"x_dir": f"data/processed/X_test{extension}", "y_dir": f"data/processed/y_test{extension}",
+          "pickle_loc": "results/models/model.joblib", "results_figure_dir": "results/figures",
+          "results_table_dir": "results/table"},
+         [f"data/processed/X_test{extension}", f"data/processed/y_test{extension}", "results/models/model.joblib",
+          "results/models/model.joblib.json"],
+         ["results/figures/cm.png", "results/table/test_score.csv", "results/table/test_metrics.csv",
+          "results/table/confusion_matrix.csv", "results/table/classification_report.csv"]),
+    ]
+
+
+def load_stage(name):
+    """Import the script of a stage as a module."""
+    spec = importlib.util.spec_from_file_location(f"scripts.{name}", os.path.join(SCRIPTS_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_stage(name, params):
+    """Run the `main` command of a stage's script in this interpreter."""
+    module = load_stage(name)
+
+    args = []
+    for option, value in params.items():
+        if value is True:
+            args.append(f"--{option}")
+        elif value is False:
+            args.append(f"--no-{option}")
+        else:
+            args.append(f"--{option}={value}")
+    module.main.main(args=args, standalone_mode=False)
+
+
+def run_in_memory(stages, write_intermediate=False):
+    """
+    Run the stages after the download in this interpreter, passing data between them in memory.
+
+    The cleaned DataFrame goes from validation to the EDA and to the split and
+    fit, and the fitted pipeline and the test split go to the evaluation, so the
+    cleaned data and the test split are neither written nor parsed again. The
+    figures, models and tables are saved as usual, and the intermediate data
+    files only when `write_intermediate` is True.
+
+    Parameters
+    ----------
+    stages : list of tuple
+        The stages of `pipeline_stages`, whose parameters and outputs give the paths.
+    write_intermediate : bool, optional
+        Whether to also write the cleaned data and the test split.
+    """
+    from src.write_adult_data import write_adult_data
+
+    params = {name: stage_params for name, stage_params, _, _ in stages}
+    outputs = {name: output_paths for name, _, _, output_paths in stages}
+
+    print("[read_and_validate] Running in memory")
+    with step("read_and_validate"):
+        validated_data, report = load_stage("read_and_validate").read_and_validate(
+            params["read_and_validate"]["raw_dir"], params["read_and_validate"]["member"]
+        )
+        if write_intermediate:
+            write_adult_data(validated_data, create_dir_and_file_if_not_exist(*os.path.split(outputs["read_and_validate"][0])))
+    print(f"Kept {len(validated_data)} rows. Rows failing each check:\n"
+          f"{report[report['failure_count'] > 0].to_string(index=False)}")
+
+    print("[eda] Running in memory")
+    with step("eda"):
+        load_stage("eda").plot_eda(validated_data, params["eda"]["results_dir"])
+
+    print("[split_and_fit] Running in memory")
+    fit_params = params["split_and_fit"]
+    with step("split_and_fit"):
+        pipe, X_test, y_test = load_stage("split_and_fit").split_and_fit(
+            validated_data, fit_params["random_seed"], fit_params["models_dir"],
+        )
+        if write_intermediate:
+            X_test_file, y_test_file = outputs["split_and_fit"][:2]
+            write_adult_data(X_test, create_dir_and_file_if_not_exist(*os.path.split(X_test_file)))
+            write_adult_data(y_test, create_dir_and_file_if_not_exist(*os.path.split(y_test_file)))
+
+    print("[evaluate_model] Running in memory")
+    evaluate_params = params["evaluate_model"]
+    with step("evaluate_model"):
+        load_stage("evaluate_model").evaluate_model(
+            pipe, [X_test], y_test, evaluate_params["results_figure_dir"], evaluate_params["results_table_dir"]
+        )
+
+
+@click.command()
+@profile_option
+@click.option('--url', type=str, default="https://archive.ics.uci.edu/static/public/2/adult.zip", help="URL of the dataset to be downloaded (must be a ZIP file).")
+@click.option('--random_seed', type=int, default=522, help="Random seed that will be used in data split")
+@click.option('--format', 'file_format', type=click.Choice(list(FORMATS)), default="csv", help="File format of the intermediate data")
+@click.option('--cache_dir', type=str, default="data/cache/stages", help="Directory of the cached stage outputs")
+@click.option('--force', is_flag=True, help="Run every stage even when its outputs are cached")
+@click.option('--in_memory', is_flag=True, help="Pass the data between the stages after the download in memory, without the stage cache")
+@click.option('--write_intermediate', is_flag=True, help="With --in_memory, also write the cleaned data and the test split")
+def main(url, random_seed, file_format, cache_dir, force, in_memory, write_intermediate):
+    """
+    Run the analysis stages in order, skipping the ones whose outputs are cached.
+
+    Parameters:
+    ----------
+    url : str
+        The URL of the ZIP file to download.
+    random_seed : int
+        Selected seed for test data split.
+    file_format : str
+        Format of the intermediate data files, one of 'csv', 'parquet' or 'feather'.
+    cache_dir : str
+        Directory where the outputs of each stage are cached.
+    force : bool
+        Whether to rerun every stage regardless of the cache.
+    in_memory : bool
+        Whether to run the stages after the download with `run_in_memory`.
+    write_intermediate : bool
+        Whether the in-memory run also writes the cleaned data and the test split.
+
+    Each stage is keyed by a hash of its script and the `src` modules it imports,
+    its parameters and the content of its inputs. When the cache holds outputs
+    for that key they are copied into place and the stage is skipped, so a
+    `touch` or a fresh checkout does not rerun anything.
+
+    The download is never cached: it always runs, and downloads the archive
+    again only when the server says it changed, so the following stages rerun
+    exactly when the archive did.
+
+    With --in_memory, the download runs as usual, and the other stages always
+    run, handing their DataFrames and the fitted model to each other.
+
+    With --profile, the steps of every stage that runs are recorded in the same trace.
+    """
+    stages = pipeline_stages(url, random_seed, file_format)
+    for name, params, input_paths, output_paths in stages[:1] if in_memory else stages:
+        if name in UNCACHED_STAGES:
+            print(f"[{name}] Running")
+            run_stage(name, params)
+            continue
+
+        with step(f"{name} cache lookup"):
+            code_paths = stage_code_paths(os.path.join(SCRIPTS_DIR, f"{name}.py"))
+            key = stage_cache_key(name, code_paths, params, input_paths)
+            restored = not force and restore_stage(cache_dir, name, key, output_paths)
+
+        if restored:
+            print(f"[{name}] Skipped, outputs restored from cache {key[:12]}")
+            continue
+
+        print(f"[{name}] Running")
+        start = time.perf_counter()
+        run_stage(name, params)
+        missing_paths = [path for path in output_paths if not os.path.isfile(path)]
+        if missing_paths:
+            raise click.ClickException(f"Stage {name} did not create {missing_paths}")
+        with step(f"{name} cache store"):
+            store_stage(cache_dir, name, key, output_paths)
+        print(f"[{name}] Finished in {time.perf_counter() - start:.1f}s, cached as {key[:12]}")
+
+    if in_memory:
+        start = time.perf_counter()
+        run_in_memory(stages, write_intermediate)
+        print(f"Ran the stages in memory in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,131 +5,174 @@
 import sys
 import os
 import click
-import pandas as pd
 import pickle
-from sklearn.compose import make_column_transformer
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.pipeline import make_pipeline
-from sklearn.model_selection import train_test_split
-from sklearn.neighbors import KNeighborsClassifier
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import FeatureLabelCorrelation
-from deepchecks.tabular.checks.data_integrity import FeatureFeatureCorrelation
-from deepchecks.tabular.checks import ClassImbalance
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.data_format import FORMATS, data_columns
 from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
+from src.profiler import profile_option, step
 
+# Features of the model, the other columns are only validated
+CATEGORICAL_FEATURES = ["marital-status", "relationship", "occupation", "workclass", "race"]
+BINARY_FEATURES = ["sex"]
 
-@click.command()
-@click.option('--processed_dir', type=str, help="Path to processed training data (CSV file)", required=True)
-@click.option('--preprocessed_dir', type=str, help="Path to save split data", required=True)
-@click.option('--random_seed', type=int, help="Random seed that will be used in data split", required=True)
-@click.option('--models_dir', type=str, help="Path to the directory where the model will be saved", required=True)
-def main(processed_dir, preprocessed_dir, random_seed, models_dir):
+# Candidate parameters of the KNN classifier cross-validated with --search
+PARAM_GRID = {
+    "n_neighbors": [5, 10, 25, 50],
+    "weights": ["uniform", "distance"],
+    "metric": ["euclidean", "manhattan"],
+}
+
+
+def split_and_fit(data_adult, random_seed, models_dir, sparse=False, validation_sample_size=None,
+                  use_deepchecks=False, search=False, cv=5, n_jobs=-1, results_table_dir="results/table", split="random"):
     """
-    Main function to process data, validate it, train a KNN classifier, and save the trained model.
+    Split the cleaned data, validate the training split, and fit and save the KNN pipeline.
 
     Parameters:
     -----------
-    processed_dir : str
-        Path to the processed training data in CSV format.
-    preprocessed_dir : str
-        Path to save split data.
+    data_adult : pandas.DataFrame
+        Cleaned adult income data with the model's features and 'income'. The
+        training split is validated on every other column too, as in the checks
+        of the whole cleaned data.
     random_seed : int
         Selected seed for test data split
     models_dir : str
         Path to the directory where the trained model and any results will be saved.
+    sparse : bool
+        Whether the one-hot encoded features are kept as a float32 CSR matrix instead
+        of a dense float32 array. The sparse matrix is several times smaller, but KNN
+        predicts on it more slowly and may break distance ties differently.
+    validation_sample_size : int or None
+        Number of training rows sampled with `random_seed` for the data validation,
+        or None to validate all of them.
+    use_deepchecks : bool
+        Whether to run the deepchecks checks instead of the built-in ones, which
+        enforce the same conditions without importing deepchecks.
+    search : bool
+        Whether to cross-validate the KNN parameters in PARAM_GRID and fit the
+        candidate with the best mean accuracy, instead of the default parameters.
+    cv : int
+        Number of stratified cross-validation folds of the search.
+    n_jobs : int
+        Number of parallel jobs of the search, -1 to use all cores.
+    results_table_dir : str
+        Path to the directory where the search results table will be saved.
+    split : str
+        'random' to shuffle the rows with `random_seed` before splitting them, or
+        'fingerprint' to assign each row from its row fingerprint, so the split of
+        a row does not change as rows are appended to the data. The fingerprints
+        that `validate_df` added to the data are reused, for the split and the
+        hash of the data, when there are any.
+
+    Returns:
+    --------
+    tuple
+        The fitted pipeline, and the test features and labels.
 
     Workflow:
     ---------
-    1. Load the dataset from the specified CSV file.
-    2. Split the dataset into training and testing sets.
-    3. Perform data validation checks:
+    1. Split the dataset into training and testing sets.
+    2. Perform data validation checks:
         a. Check for class imbalance in the target variable.
         b. Check feature-label correlation.
         c. Check feature-feature correlation.
-    4. Preprocess the data by handling categorical and binary features.
-    5. Train a K-Nearest Neighbors classifier.
-    6. Save the trained model as a pickle file.
+    3. Preprocess the data by handling categorical and binary features.
+    4. Train a K-Nearest Neighbors classifier, optionally with the parameters found by a search.
+    5. Save the trained model as a pickle file and as a memory-mappable artifact, with
+       the `hash_rows` hash of the cleaned data, which is the same however it was passed
+       and reuses the row fingerprints carried with it.
+    6. Compile the model into a lookup table of feature profiles and save it too.
     """
-    
-    # Load the dataset from the specified directory
-    data_adult = pd.read_csv(processed_dir)
-    print(f"Loaded data from {processed_dir} with shape {data_adult.shape}")
+    import numpy as np
+    import scipy.sparse
+    from sklearn.compose import make_column_transformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import OneHotEncoder
+    from sklearn.pipeline import make_pipeline
+    from sklearn.model_selection import train_test_split
+    from sklearn.neighbors import KNeighborsClassifier
+    from src.profile_lookup_model import ProfileLookupModel
+    from src.validate_training_data import validate_training_data
+    from src.search_knn import search_knn
+    from src.model_artifact import save_model
+    from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
+    from src.fingerprint_split import fingerprint_split
+    from src.validation_cache import hash_rows
+    from src.validate_df import COLUMNS
+
+    print(f"Categorical features: {CATEGORICAL_FEATURES}")
+    print(f"Binary features: {BINARY_FEATURES}")
+
+    # Reuse the fingerprints `validate_df` computed from the schema columns, rather than hashing every row again
+    fingerprints = None
+    if FINGERPRINT_COLUMN in data_adult.columns:
+        fingerprints = data_adult[FINGERPRINT_COLUMN].to_numpy()
+    # Row fingerprints and source files are bookkeeping, neither features nor validated
+    data_adult = data_adult.drop(columns=[FINGERPRINT_COLUMN, "source_file"], errors="ignore")
+    if list(data_adult.columns) != COLUMNS:
+        fingerprints = None
+    if fingerprints is None and split == "fingerprint":
+        fingerprints = row_fingerprint(data_adult)
+    with step("hash_training_data", rows=len(data_adult)):
+        training_data_sha256 = hash_rows(data_adult, fingerprints)
 
     # Data Split: Split the data into training and testing sets (80% train, 20% test)
-    train_df, test_df = train_test_split(data_adult, test_size=0.20, random_state=random_seed)
+    with step("train_test_split", rows=len(data_adult)):
+        if split == "fingerprint":
+            in_test = fingerprint_split(fingerprints, test_size=0.20, random_seed=random_seed)
+            train_df, test_df = data_adult[~in_test], data_adult[in_test]
+        else:
+            train_df, test_df = train_test_split(data_adult, test_size=0.20, random_state=random_seed)
+    # Only the model's features are used, in the order of the data
+    features = [column for column in data_adult.columns if column in BINARY_FEATURES + CATEGORICAL_FEATURES]
     X_train, y_train = (
-        train_df.drop(columns=['income']),
+        train_df[features],
         train_df["income"],
     )
     X_test, y_test = (
-        test_df.drop(columns=['income']),
+        test_df[features],
         test_df["income"],
     )
-
-    X_test_file = create_dir_and_file_if_not_exist(preprocessed_dir,"X_test.csv")
-    X_test.to_csv(X_test_file, index=False)
-
-    y_test_file = create_dir_and_file_if_not_exist(preprocessed_dir, "y_test.csv")
-    y_test.to_csv(y_test_file, index=False)
-
     print(f"Split data into train (shape: {X_train.shape}) and test (shape: {X_test.shape}) sets")
 
-    # Validation 3: Target and Response distribution using Deepchecks
-    adult_train_ds = Dataset(train_df, label="income", cat_features=[])
+    # Validation 3: Target and Response distribution
     target_counts = train_df["income"].value_counts()
     print(f"Target distribution:\n{target_counts}")
 
-    # Check for class imbalance: Ensure that no class ratio is less than 40%
-    check_dist = ClassImbalance().add_condition_class_ratio_less_than(0.4).run(adult_train_ds)
-    if not check_dist.passed_conditions():
-        raise ValueError("Class imbalance check failed: Target classes do not meet the required distribution.")
+    if use_deepchecks:
+        with step("deepchecks", rows=len(train_df)):
+            _run_deepchecks(train_df, validation_sample_size, random_seed)
+    else:
+        # Validation 3 and 4 with the conditions of the deepchecks checks, computed from contingency tables
+        with step("validate_training_data", rows=len(train_df)):
+            validation = validate_training_data(train_df, label="income", sample_size=validation_sample_size, random_state=random_seed)
+        print(f"Least to most frequent class ratio: {validation['class_ratio']:.4f}")
+        print(f"Feature-label predictive power scores:\n{validation['pps'].round(4)}")
+        print(f"Highly correlated feature pairs: {validation['correlated_pairs']}")
 
-    print("Data Validation 3 passed: The target has at least a 40%/60% split!")
-
-    # Validation 4: Deepcheck Validations for Feature-Label and Feature-Feature Correlations
-    # Check Feature-Label Correlation: Ensure no feature has a Pearson correlation > 0.9 with the label
-    check_feat_label_corr = FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.9)
-    check_feat_label_corr_result = check_feat_label_corr.run(dataset=adult_train_ds)
-    
-    if not check_feat_label_corr_result.passed_conditions():
-        raise ValueError("Feature-Label correlation check failed: One or more features exceed the correlation threshold.")
-
-    # Check Feature-Feature Correlation: Ensure no more than 3 feature pairs have correlation > 0.8
-    check_feat_feat_corr = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(0.8, 3)
-    check_feat_feat_corr_result = check_feat_feat_corr.run(dataset=adult_train_ds)
-    
-    if not check_feat_feat_corr_result.passed_conditions():
-        raise ValueError("Feature-Feature correlation check failed: Too many highly correlated feature pairs.")
-
-    print("Data Validation 4 passed: Deep checks validation has been performed successfully!")
-
-    # Column selection: Define which features are categorical, binary, or to be dropped
-    categorical_features = ["marital-status", "relationship", "occupation", "workclass", "race"]
-    binary_features = ["sex"]
-    drop_features = ["age", "fnlwgt", "education", "education-num", "capital-gain", "capital-loss", "hours-per-week", "native-country"]
-    
-    print(f"Categorical features: {categorical_features}")
-    print(f"Binary features: {binary_features}")
-    print(f"Features to drop: {drop_features}")
+    print("Data Validation 3 passed: The target class ratio meets the required distribution!")
+    print("Data Validation 4 passed: Feature-label and feature-feature correlation checks have been performed successfully!")
 
     # Preprocessing pipelines for different feature types
+    # One-hot values are encoded as float32, which KNN uses as is and which halves the
+    # footprint of its training matrix compared to float64
+    encoding = dict(dtype=np.float32, sparse_output=sparse)
+
     # Binary features are one-hot encoded, dropping one category to avoid multicollinearity
-    binary_transformer = OneHotEncoder(drop="if_binary", dtype=int)
+    binary_transformer = OneHotEncoder(drop="if_binary", **encoding)
 
     # Categorical features are imputed with a constant ('missing') and then one-hot encoded
     categorical_transformer = make_pipeline(
         SimpleImputer(strategy="constant", fill_value="missing"),
-        OneHotEncoder(handle_unknown="ignore", sparse_output=False),
+        OneHotEncoder(handle_unknown="ignore", **encoding),
     )
 
-    # Combine transformers into a column transformer
-    preprocessor = make_column_transformer(   
-        (binary_transformer, binary_features),    
-        (categorical_transformer, categorical_features),
-        ("drop", drop_features),
+    # Combine transformers into a column transformer, dropping any other column,
+    # and keep the combined output sparse only when asked to
+    preprocessor = make_column_transformer(
+        (binary_transformer, BINARY_FEATURES),
+        (categorical_transformer, CATEGORICAL_FEATURES),
+        sparse_threshold=1.0 if sparse else 0.0,
     )
 
     print("Preprocessing pipeline created.")
@@ -138,25 +181,191 @@ def main(processed_dir, preprocessed_dir, random_seed, models_dir):
     model = KNeighborsClassifier()
     print("Initialized KNeighborsClassifier.")
 
+    # Search the KNN parameters, preprocessing each fold once for all candidates
+    if search:
+        with step("search_knn", rows=len(X_train)):
+            search_results, best_params = search_knn(
+                preprocessor, X_train, y_train, PARAM_GRID, cv=cv, n_jobs=n_jobs, random_state=random_seed
+            )
+        search_results_file = create_dir_and_file_if_not_exist(results_table_dir, "search_results.csv")
+        search_results.to_csv(search_results_file, index=False)
+        print(f"Search results saved to {search_results_file}:\n{search_results.head()}")
+
+        model.set_params(**best_params)
+        print(f"Best KNN parameters: {best_params}")
+
     # Create a pipeline that first preprocesses the data and then fits the model
     pipe = make_pipeline(preprocessor, model)
     print("Pipeline created with preprocessing and KNN model.")
 
     # Fit the pipeline on the training data
-    pipe.fit(X_train, y_train)
+    with step("fit", rows=len(X_train)):
+        pipe.fit(X_train, y_train)
     print("Pipeline fitted on the training data.")
 
+    # Report the footprint of the encoded training matrix the KNN model keeps
+    X_train_encoded = pipe[-1]._fit_X
+    if scipy.sparse.issparse(X_train_encoded):
+        encoded_bytes = X_train_encoded.data.nbytes + X_train_encoded.indices.nbytes + X_train_encoded.indptr.nbytes
+    else:
+        encoded_bytes = X_train_encoded.nbytes
+    dense_float64_bytes = X_train_encoded.shape[0] * X_train_encoded.shape[1] * np.dtype(np.float64).itemsize
+    print(
+        f"Encoded training matrix: {type(X_train_encoded).__name__} of shape {X_train_encoded.shape}, "
+        f"{encoded_bytes / 1e6:.2f} MB ({dense_float64_bytes / 1e6:.2f} MB as dense float64)"
+    )
+
     # Evaluate the model's training score
-    train_score = pipe.score(X_train, y_train)
+    with step("training_score", rows=len(X_train)):
+        train_score = pipe.score(X_train, y_train)
     print(f"Training score: {train_score:.4f} obtained")
 
     # Save the trained pipeline (including preprocessing and model) as a pickle file
     model_path = create_dir_and_file_if_not_exist(models_dir, "model.pickle")
-    with open(model_path, 'wb') as f:
+    with step("save_model"), open(model_path, 'wb') as f:
         pickle.dump(pipe, f)
-    print(f"Successfully saved the trained model to {model_path}")
+    print(f"Successfully saved the trained model ({os.path.getsize(model_path) / 1e6:.2f} MB) to {model_path}")
+
+    # Save it again as an artifact whose arrays are memory mapped on load, with the training data it came from
+    artifact_path = create_dir_and_file_if_not_exist(models_dir, "model.joblib")
+    with step("save_model_artifact"):
+        save_model(pipe, artifact_path, metadata={
+            "training_data_sha256": training_data_sha256,
+            "random_seed": random_seed,
+            "params": {name: str(value) for name, value in model.get_params().items()},
+        })
+    print(f"Saved the memory-mappable model artifact to {artifact_path}")
+
+    # Compile the pipeline into a lookup table of the feature profiles seen in training
+    with step("compile_lookup_model", rows=len(X_train)):
+        lookup_model = ProfileLookupModel(pipe, BINARY_FEATURES + CATEGORICAL_FEATURES).compile(X_train)
+    lookup_model_path = create_dir_and_file_if_not_exist(models_dir, "model_lookup.pickle")
+    with open(lookup_model_path, 'wb') as f:
+        pickle.dump(lookup_model, f)
+    print(f"Compiled {len(lookup_model)} feature profiles into a lookup model saved to {lookup_model_path}")
 
     print("Successfully split data and trained the model. A PICKLE file has been created!")
+    return pipe, X_test, y_test
+
+
+@click.command()
+@profile_option
+@click.option('--processed_dir', type=str, help="Path to processed training data (CSV, Parquet or Feather file)", required=True)
+@click.option('--preprocessed_dir', type=str, help="Path to save split data", required=True)
+@click.option('--random_seed', type=int, help="Random seed that will be used in data split", required=True)
+@click.option('--models_dir', type=str, help="Path to the directory where the model will be saved", required=True)
+@click.option('--format', 'file_format', type=click.Choice(list(FORMATS)), default="csv", help="File format of the split data")
+@click.option('--sparse', is_flag=True, help="Keep the one-hot encoded features as a sparse CSR matrix from fit through prediction")
+@click.option('--validation_sample_size', type=int, default=None, help="Number of training rows sampled with the random seed for the data validation, all rows by default")
+@click.option('--deepchecks', 'use_deepchecks', is_flag=True, help="Validate the training data with deepchecks instead of the built-in checks")
+@click.option('--search', is_flag=True, help="Cross-validate the KNN parameters in PARAM_GRID and fit the best candidate")
+@click.option('--cv', type=int, default=5, help="Number of cross-validation folds of the search")
+@click.option('--n_jobs', type=int, default=-1, help="Number of parallel jobs of the search, -1 to use all cores")
+@click.option('--results_table_dir', type=str, default="results/table", help="Path to the directory where the search results will be saved")
+@click.option('--split', type=click.Choice(["random", "fingerprint"]), default="random", help="Split the rows at random, or by their row fingerprint so appended rows never move earlier ones between the splits")
+def main(processed_dir, preprocessed_dir, random_seed, models_dir, file_format, sparse, validation_sample_size, use_deepchecks,
+         search, cv, n_jobs, results_table_dir, split):
+    """
+    Main function to process data, validate it, train a KNN classifier, and save the trained model.
+
+    Parameters:
+    -----------
+    processed_dir : str
+        Path to the processed training data in CSV, Parquet or Feather format.
+    preprocessed_dir : str
+        Path to save split data.
+    random_seed : int
+        Selected seed for test data split
+    models_dir : str
+        Path to the directory where the trained model and any results will be saved.
+    file_format : str
+        Format of the split data files, one of 'csv', 'parquet' or 'feather'.
+    sparse : bool
+        Whether the one-hot encoded features are kept as a float32 CSR matrix instead
+        of a dense float32 array. The sparse matrix is several times smaller, but KNN
+        predicts on it more slowly and may break distance ties differently.
+    validation_sample_size : int or None
+        Number of training rows sampled with `random_seed` for the data validation,
+        or None to validate all of them.
+    use_deepchecks : bool
+        Whether to run the deepchecks checks instead of the built-in ones, which
+        enforce the same conditions without importing deepchecks.
+    search : bool
+        Whether to cross-validate the KNN parameters in PARAM_GRID and fit the
+        candidate with the best mean accuracy, instead of the default parameters.
+    cv : int
+        Number of stratified cross-validation folds of the search.
+    n_jobs : int
+        Number of parallel jobs of the search, -1 to use all cores.
+    results_table_dir : str
+        Path to the directory where the search results table will be saved.
+    split : str
+        'random' or 'fingerprint', the row fingerprints being read from the
+        cleaned data, which carries them since validation.
+
+    Workflow:
+    ---------
+    1. Load the cleaned data from the specified file.
+    2. Split, validate and fit with `split_and_fit`.
+    3. Save the test split for `evaluate_model.py`.
+    """
+    from src.read_adult_data import read_adult_data
+    from src.write_adult_data import write_adult_data
+    from src.row_fingerprint import FINGERPRINT_COLUMN
+    from src.validate_df import COLUMNS
+
+    # Load every column, which the training split is validated on, and the row fingerprints
+    # validation added, which the data hash and the split reuse, but no other bookkeeping column
+    columns = COLUMNS + ([FINGERPRINT_COLUMN] if FINGERPRINT_COLUMN in data_columns(processed_dir) else [])
+    with step("read_adult_data") as record:
+        data_adult = read_adult_data(processed_dir, columns=columns)
+        record["rows"] = len(data_adult)
+    print(f"Loaded data from {processed_dir} with shape {data_adult.shape}")
+
+    _, X_test, y_test = split_and_fit(
+        data_adult, random_seed, models_dir, sparse=sparse,
+        validation_sample_size=validation_sample_size, use_deepchecks=use_deepchecks, search=search, cv=cv,
+        n_jobs=n_jobs, results_table_dir=results_table_dir, split=split,
+    )
+
+    with step("write_test_data", rows=len(X_test)):
+        X_test_file = create_dir_and_file_if_not_exist(preprocessed_dir, "X_test" + FORMATS[file_format])
+        write_adult_data(X_test, X_test_file)
+
+        y_test_file = create_dir_and_file_if_not_exist(preprocessed_dir, "y_test" + FORMATS[file_format])
+        write_adult_data(y_test, y_test_file)
+    print(f"Test data saved to {X_test_file} and {y_test_file}")
+
+
+def _run_deepchecks(train_df, sample_size, random_seed):
+    """Run validations 3 and 4 with deepchecks, which is only imported when asked for."""
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.checks import FeatureLabelCorrelation
+    from deepchecks.tabular.checks.data_integrity import FeatureFeatureCorrelation
+    from deepchecks.tabular.checks import ClassImbalance
+
+    if sample_size is not None and sample_size < len(train_df):
+        train_df = train_df.sample(n=sample_size, random_state=random_seed)
+    adult_train_ds = Dataset(train_df, label="income", cat_features=[])
+
+    # Check for class imbalance: Ensure the ratio of the least to the most frequent class is less than 0.4
+    check_dist = ClassImbalance().add_condition_class_ratio_less_than(0.4).run(adult_train_ds)
+    if not check_dist.passed_conditions():
+        raise ValueError("Class imbalance check failed: Target classes do not meet the required distribution.")
+
+    # Check Feature-Label Correlation: Ensure no feature has a predictive power score >= 0.9 with the label
+    check_feat_label_corr = FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.9)
+    check_feat_label_corr_result = check_feat_label_corr.run(dataset=adult_train_ds)
+
+    if not check_feat_label_corr_result.passed_conditions():
+        raise ValueError("Feature-Label correlation check failed: One or more features exceed the correlation threshold.")
+
+    # Check Feature-Feature Correlation: Ensure no more than 3 feature pairs have correlation > 0.8
+    check_feat_feat_corr = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(0.8, 3)
+    check_feat_feat_corr_result = check_feat_feat_corr.run(dataset=adult_train_ds)
+
+    if not check_feat_feat_corr_result.passed_conditions():
+        raise ValueError("Feature-Feature correlation check failed: Too many highly correlated feature pairs.")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,34 @@
+
+
+def count_by_income(adult_data_frame, columns, target="income"):
+    """
+    Count the rows of every (column, income) pair with a single grouping pass.
+
+    The rows are grouped once by all of `columns` and the target together, which
+    leaves at most one row per distinct profile. The counts of each column are then
+    summed from that small table instead of from the full DataFrame.
+
+    Parameters:
+    ----------
+    adult_data_frame : pandas.DataFrame
+        The DataFrame containing the `columns` and the `target` column.
+    columns : list of str
+        Columns to count the target values of.
+    target : str, optional
+        Name of the target column, 'income' by default.
+
+    Returns:
+    -------
+    dict of str to pandas.DataFrame
+        For every column, a DataFrame with the columns `column`, `target` and
+        'count', holding one row per pair of values that occurs in the data.
+    """
+    profile_counts = adult_data_frame.groupby(
+        list(columns) + [target], observed=True, dropna=False
+    ).size()
+
+    counts = {}
+    for column in columns:
+        column_counts = profile_counts.groupby(level=[column, target], observed=True, dropna=False).sum()
+        counts[column] = column_counts.rename("count").reset_index()
+    return counts
@@ -0,0 +1,30 @@
+import os
+
+
+# File extension of each supported data format
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+
+def data_format(filepath_or_buffer):
+    """Return the format of a data file from its extension, 'csv' for file objects."""
+    if isinstance(filepath_or_buffer, (str, os.PathLike)):
+        extension = os.path.splitext(filepath_or_buffer)[1]
+        for file_format, format_extension in FORMATS.items():
+            if extension == format_extension:
+                return file_format
+    return "csv"
+
+
+def data_columns(path):
+    """Return the column names of a CSV, Parquet or Feather file without reading its rows."""
+    file_format = data_format(path)
+    if file_format == "csv":
+        import pandas as pd
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    import pyarrow.ipc
+    import pyarrow.parquet
+    if file_format == "parquet":
+        return pyarrow.parquet.read_schema(path).names
+    with pyarrow.ipc.open_file(path) as reader:
+        return reader.schema.names
@@ -0,0 +1,150 @@
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.read_zip import read_zip
+
+
+def download_archives(archives, directory, n_jobs=4, timeout=60, retries=3, backoff_factor=0.5, extract=True):
+    """
+    Download several ZIP archives concurrently, each from the fastest of its mirrors, and extract them.
+
+    Every archive is given by its URL, or by the list of URLs of its mirrors, which
+    must all end in the file name the archive is saved as. Archives are never
+    grouped by file name alone: two archives with the same file name would
+    overwrite each other, and are rejected.
+
+    Every archive is downloaded by its own thread with `read_zip`, so it keeps
+    its checksum, conditional request and resume support, and is extracted as
+    soon as it is downloaded, while the other archives are still being fetched.
+    The threads share one session, whose connection pool keeps the connections
+    to each server open between requests and which retries failed connections
+    and 429 and 5xx responses with exponential backoff.
+
+    The mirrors of an archive are probed at the same time with a HEAD request, and
+    the archive is downloaded from the first one to answer successfully. Should that
+    download fail, the next mirror to have answered is tried, then the mirrors that
+    did not answer.
+
+    Parameters
+    ----------
+    archives : list of str or list of list of str
+        The URL of each ZIP archive, or the URLs of its mirrors.
+    directory : str
+        Directory the archives are saved and extracted to.
+    n_jobs : int, optional
+        Number of archives downloaded at a time.
+    timeout : float, optional
+        Seconds to wait for a server before giving up on a request.
+    retries : int, optional
+        Number of times a failed request is retried.
+    backoff_factor : float, optional
+        Seconds to wait before the first retry, doubled for every further retry.
+    extract : bool, optional
+        Whether to extract the members of the archives.
+
+    Returns
+    -------
+    dict
+        The URL each archive, by file name, was downloaded from.
+
+    Raises
+    ------
+    ValueError
+        If the mirrors of an archive end in different file names, if two archives
+        end in the same file name, or if an archive could not be downloaded from
+        any of its mirrors, once every other archive has been downloaded.
+    """
+    archives = _archives_by_name(archives)
+
+    downloaded, errors = {}, {}
+    with _session(retries, backoff_factor, pool_size=n_jobs) as session, ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {
+            executor.submit(_download_archive, mirrors, directory, session, timeout, extract): name
+            for name, mirrors in archives.items()
+        }
+        for future in as_completed(futures):
+            try:
+                downloaded[futures[future]] = future.result()
+            except ValueError as error:
+                errors[futures[future]] = error
+
+    if errors:
+        message = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        raise ValueError(f"Unable to download {len(errors)} of {len(archives)} archives. {message}") from next(iter(errors.values()))
+    return {name: downloaded[name] for name in archives}
+
+
+def _archives_by_name(archives):
+    """Return the mirrors of each archive by the file name it is saved as, rejecting ambiguous names."""
+    by_name = {}
+    for mirrors in archives:
+        mirrors = [mirrors] if isinstance(mirrors, str) else list(mirrors)
+        names = {os.path.basename(url) for url in mirrors}
+        if len(names) != 1:
+            raise ValueError(f"The mirrors of an archive must end in the same file name, not {sorted(names)}.")
+        name = names.pop()
+        if name in by_name:
+            raise ValueError(
+                f"{by_name[name][0]} and {mirrors[0]} would both be saved as {name}. "
+                "Give the mirrors of one archive together, and archives distinct file names."
+            )
+        by_name[name] = mirrors
+    return by_name
+
+
+def _download_archive(mirrors, directory, session, timeout, extract):
+    """Download an archive from the first of its mirrors that works, returning its URL."""
+    failures = []
+    for url in _mirrors_by_speed(mirrors, session, timeout):
+        try:
+            read_zip(url, directory, timeout=timeout, extract=extract, session=session)
+            return url
+        except (ValueError, requests.RequestException, zipfile.BadZipFile) as error:
+            failures.append(f"{url} ({error})")
+    raise ValueError(f"Every mirror failed: {', '.join(failures)}")
+
+
+def _mirrors_by_speed(mirrors, session, timeout):
+    """Yield the mirrors answering a HEAD request, fastest first, then the others."""
+    if len(mirrors) == 1:
+        yield from mirrors
+        return
+
+    # Probes share the pooled session, so the download reuses the probe's connection,
+    # and a mirror answering only after a retry is ranked behind those answering at once
+    executor = ThreadPoolExecutor(max_workers=len(mirrors))
+    try:
+        probes = {executor.submit(session.head, url, timeout=timeout, allow_redirects=True): url for url in mirrors}
+        unhealthy = []
+        for probe in as_completed(probes):
+            try:
+                healthy = probe.result().status_code < 400
+            except requests.RequestException:
+                healthy = False
+            if healthy:
+                yield probes[probe]
+            else:
+                unhealthy.append(probes[probe])
+        yield from (url for url in mirrors if url in unhealthy)
+    finally:
+        # Do not wait for slow mirrors once an archive is downloaded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _session(retries, backoff_factor, pool_size):
+    """Return a session retrying failed requests, with a connection pool of `pool_size` connections per server."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,111 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+
+class ErrorSink:
+    """
+    Collect the validation failures of a dataset of any size in a fixed amount of memory.
+
+    The number of rows failing each check is counted exactly, and a uniform random
+    sample of at most `sample_size` failing rows is kept with reservoir sampling,
+    so memory does not grow with the number of rows or failures. Sinks filled in
+    separate processes are combined with `merge`, and the result is written as
+    JSON lines with `write`.
+
+    Parameters
+    ----------
+    sample_size : int, optional
+        Maximum number of example failing rows kept.
+    random_state : int, optional
+        Seed of the sampling.
+    """
+
+    def __init__(self, sample_size=100, random_state=None):
+        self.sample_size = sample_size
+        self.counts = {}
+        self.failing_rows = 0
+        self.examples = []
+        self._rng = np.random.default_rng(random_state)
+
+    def add(self, data, failures):
+        """
+        Count the failures of a batch of rows and sample some of the failing rows.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            The rows that were checked.
+        failures : list of tuple
+            One (column, check, failed row mask) triple per check, the masks
+            having one entry per row of `data`.
+        """
+        for column, check, failed in failures:
+            self.counts[(column, check)] = self.counts.get((column, check), 0) + int(failed.sum())
+        if not failures:
+            return
+        failed = np.column_stack([failed for _, _, failed in failures])
+        positions = np.flatnonzero(failed.any(axis=1))
+
+        # Algorithm R: the i-th failing row replaces a random example with probability sample_size / i
+        seen = self.failing_rows + np.arange(len(positions))
+        slots = np.where(seen < self.sample_size, seen, self._rng.integers(0, seen + 1))
+        self.failing_rows += len(positions)
+        accepted = {}
+        for slot, position in zip(slots, positions):
+            if slot < self.sample_size:
+                accepted[slot] = position
+        if not accepted:
+            return
+
+        rows = np.fromiter(accepted.values(), dtype=np.int64, count=len(accepted))
+        values = json.loads(data.iloc[rows].to_json(orient="records"))
+        names = [f"{column}:{check}" for column, check, _ in failures]
+        for slot, row, row_values in zip(accepted, rows, values):
+            example = {"failed_checks": [name for name, fail in zip(names, failed[row]) if fail], "values": row_values}
+            if slot < len(self.examples):
+                self.examples[slot] = example
+            else:
+                self.examples.append(example)
+
+    def merge(self, other):
+        """Add the counts and the examples of another sink, keeping the sample uniform over both."""
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        total = self.failing_rows + other.failing_rows
+        size = min(self.sample_size, len(self.examples) + len(other.examples))
+        if total:
+            # Draw the examples from each sink in proportion to the failing rows it saw
+            from_self = self._rng.hypergeometric(self.failing_rows, other.failing_rows, size)
+            self.examples = (
+                [self.examples[i] for i in self._rng.choice(len(self.examples), from_self, replace=False)]
+                + [other.examples[i] for i in self._rng.choice(len(other.examples), size - from_self, replace=False)]
+            )
+        self.failing_rows = total
+
+    @property
+    def report(self):
+        """The number of rows failing each check, with the columns 'column', 'check' and 'failure_count'."""
+        return pd.DataFrame(
+            [(column, check, count) for (column, check), count in self.counts.items()],
+            columns=["column", "check", "failure_count"],
+        )
+
+    def write(self, path):
+        """
+        Write the counts and the examples to a JSON lines file, one record per line.
+
+        Every check gets a record of type 'count', followed by a 'summary' record
+        with the number of failing rows and one 'example' record per sampled row,
+        with its failed checks and values. The file is written one line at a time
+        and replaces any earlier one once complete.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".part", "w") as f:
+            for (column, check), count in self.counts.items():
+                f.write(json.dumps({"type": "count", "column": column, "check": check, "failure_count": count}) + "\n")
+            f.write(json.dumps({"type": "summary", "failing_rows": self.failing_rows, "examples": len(self.examples)}) + "\n")
+            for example in self.examples:
+                f.write(json.dumps({"type": "example", **example}) + "\n")
+        os.replace(path + ".part", path)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics import (
+    accuracy_score, confusion_matrix, precision_recall_fscore_support,
+    roc_auc_score, average_precision_score, log_loss,
+)
+
+
+def evaluate_predictions(y_true, predictions, classes):
+    """
+    Compute every evaluation metric from one set of predictions.
+
+    The predictions are those of `predict_chunks`, so the model only has to score
+    the test set once for the label metrics and the probability metrics alike.
+
+    Parameters:
+    ----------
+    y_true : pandas.Series
+        The true labels.
+    predictions : pandas.DataFrame
+        The 'prediction' column and, for the probability metrics, one
+        'proba_<class>' column per class, in the order of `y_true`.
+    classes : array-like
+        The classes of the model, in the order of its probabilities. The last
+        class is the positive class of the binary probability metrics.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per metric with the columns 'metric' and 'value': 'accuracy',
+        the macro and weighted 'precision', 'recall' and 'f1', and, when the
+        probabilities are given, 'roc_auc', 'average_precision' and 'log_loss'.
+    pandas.DataFrame
+        The confusion matrix, with the true classes as rows and the predicted
+        classes as columns.
+    pandas.DataFrame
+        The 'precision', 'recall', 'f1' and 'support' of each class.
+    """
+    y_true = np.asarray(y_true)
+    y_pred = predictions["prediction"].to_numpy()
+    classes = list(classes)
+
+    metrics = [("accuracy", accuracy_score(y_true, y_pred))]
+    for average in ["macro", "weighted"]:
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_true, y_pred, labels=classes, average=average, zero_division=0
+        )
+        metrics += [(f"precision_{average}", precision), (f"recall_{average}", recall), (f"f1_{average}", f1)]
+
+    proba_columns = [f"proba_{label}" for label in classes]
+    if all(column in predictions for column in proba_columns):
+        probabilities = predictions[proba_columns].to_numpy()
+        if len(classes) == 2:
+            is_positive = y_true == classes[-1]
+            metrics += [
+                ("roc_auc", roc_auc_score(is_positive, probabilities[:, -1])),
+                ("average_precision", average_precision_score(is_positive, probabilities[:, -1])),
+            ]
+        else:
+            metrics.append(("roc_auc", roc_auc_score(y_true, probabilities, labels=classes, multi_class="ovr")))
+        metrics.append(("log_loss", log_loss(y_true, probabilities, labels=classes)))
+
+    metrics = pd.DataFrame(metrics, columns=["metric", "value"])
+    metrics["value"] = metrics["value"].astype(float)
+
+    matrix = pd.DataFrame(
+        confusion_matrix(y_true, y_pred, labels=classes),
+        index=pd.Index(classes, name="true"),
+        columns=pd.Index(classes, name="predicted"),
+    )
+
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y_true, y_pred, labels=classes, zero_division=0
+    )
+    report = pd.DataFrame(
+        {"precision": precision, "recall": recall, "f1": f1, "support": support},
+        index=pd.Index(classes, name="class"),
+    )
+
+    return metrics, matrix, report
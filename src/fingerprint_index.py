@@ -0,0 +1,89 @@
+import os
+import numpy as np
+
+
+class FingerprintIndex:
+    """
+    A set of 64-bit row fingerprints that grows by appending sorted runs.
+
+    Each batch of fingerprints added is sorted into a run of its own, and a run is
+    merged with the one before it only once that one is at most twice its size,
+    as in a log-structured merge tree. Adding N fingerprints in batches therefore
+    moves each of them O(log N) times rather than re-sorting the whole index on
+    every batch, and the index holds O(log N) runs, each searched with a binary
+    search.
+
+    Saved indexes keep one `.npy` file per run, named after the number of
+    fingerprints added before it, so `save` writes only the runs created or
+    merged since the last save and `load` memory-maps the others.
+
+    Parameters
+    ----------
+    runs : list of numpy.ndarray, optional
+        Sorted, unique uint64 fingerprints, oldest run first.
+    """
+
+    def __init__(self, runs=()):
+        self._runs = []
+        self._unsaved = set()
+        for run in runs:
+            self._runs.append((len(self), np.asarray(run, dtype=np.uint64)))
+            self._unsaved.add(self._runs[-1][0])
+
+    def __len__(self):
+        return sum(len(run) for _, run in self._runs)
+
+    def contains(self, fingerprints):
+        """Return a boolean mask of the `fingerprints` already in the index."""
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for _, run in self._runs:
+            if len(run):
+                positions = np.minimum(np.searchsorted(run, fingerprints), len(run) - 1)
+                found |= run[positions] == fingerprints
+        return found
+
+    def add(self, fingerprints):
+        """Add fingerprints not yet in the index as a new run, merging the smallest runs."""
+        run = np.unique(np.asarray(fingerprints, dtype=np.uint64))
+        if not len(run):
+            return
+        self._runs.append((len(self), run))
+        self._unsaved.add(self._runs[-1][0])
+        while len(self._runs) > 1 and len(self._runs[-2][1]) <= 2 * len(self._runs[-1][1]):
+            (start, older), (merged_start, newer) = self._runs.pop(-2), self._runs.pop()
+            self._runs.append((start, np.sort(np.concatenate([older, newer]), kind="mergesort")))
+            self._unsaved.discard(merged_start)
+            self._unsaved.add(start)
+
+    @classmethod
+    def load(cls, directory):
+        """Memory-map the runs saved in `directory`, giving an empty index when there are none."""
+        index = cls()
+        if os.path.isdir(directory):
+            for start in sorted(_run_starts(directory)):
+                index._runs.append((start, np.load(_run_path(directory, start), mmap_mode="r")))
+        return index
+
+    def save(self, directory):
+        """Write the runs created or merged since the last save, then delete the files of runs merged away."""
+        os.makedirs(directory, exist_ok=True)
+        for start, run in self._runs:
+            if start in self._unsaved:
+                path = _run_path(directory, start)
+                with open(path + ".part", "wb") as f:
+                    np.save(f, run)
+                os.replace(path + ".part", path)
+        self._unsaved.clear()
+        starts = {start for start, _ in self._runs}
+        for start in _run_starts(directory):
+            if start not in starts:
+                os.remove(_run_path(directory, start))
+
+
+def _run_path(directory, start):
+    return os.path.join(directory, f"{start:020d}.npy")
+
+
+def _run_starts(directory):
+    return [int(name[:-4]) for name in os.listdir(directory) if name.endswith(".npy") and name[:-4].isdigit()]
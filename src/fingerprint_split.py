@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def fingerprint_split(fingerprints, test_size=0.2, random_seed=0):
+    """
+    Assign every row to the train or the test split from its row fingerprint.
+
+    The fingerprint is mixed with the seed and its top bits are mapped to [0, 1),
+    so a row lands in the same split whatever other rows the data holds. Rows
+    appended to the data later never move an earlier row between the splits,
+    and duplicate rows always land in the same split. No random permutation of
+    the data is needed, so the split costs one multiplication per row.
+
+    Parameters
+    ----------
+    fingerprints : numpy.ndarray
+        The uint64 fingerprints of the rows, from `row_fingerprint`.
+    test_size : float, optional
+        Expected share of the rows in the test split.
+    random_seed : int, optional
+        Seed choosing which rows form the test split.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask of the rows in the test split.
+    """
+    seed = np.uint64(random_seed % 2**64)
+    # Multiplying by an odd constant spreads the seeded fingerprints over the top bits
+    mixed = (np.asarray(fingerprints, dtype=np.uint64) ^ seed) * np.uint64(0x9E3779B97F4A7C15)
+    return (mixed >> np.uint64(11)) < np.uint64(int(test_size * 2**53))
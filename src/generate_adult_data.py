@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from src.validate_df import CATEGORIES, INTEGER_RANGES, COLUMNS
+
+# Range of the integer columns without bounds in the schema, when there is no reference
+DEFAULT_INTEGER_RANGE = (0, 100_000)
+
+
+def generate_adult_data(n_rows, reference=None, random_state=None):
+    """
+    Generate a synthetic adult income DataFrame of any size.
+
+    Every column is sampled independently. With a reference, such as the raw
+    adult.data file, categorical columns follow its value frequencies and integer
+    columns are resampled from its values, so the marginals, including invalid
+    values like '?', match the reference. Without one, categories are uniform over
+    the allowed values of `validate_df` and integers uniform over their range.
+
+    Parameters:
+    ----------
+    n_rows : int
+        Number of rows to generate.
+    reference : pandas.DataFrame, optional
+        Data with the columns of the adult income dataset to take the marginals from.
+    random_state : int, optional
+        Seed of the generator.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The synthetic data, with the columns of the adult income dataset, category
+        dtype for the categorical columns and int64 for the integer columns.
+    """
+    rng = np.random.default_rng(random_state)
+
+    data = {}
+    for column in COLUMNS:
+        if column in CATEGORIES:
+            if reference is None:
+                values, probabilities = pd.Index(CATEGORIES[column]), None
+            else:
+                frequencies = reference[column].value_counts(normalize=True, sort=False)
+                frequencies = frequencies[frequencies > 0]
+                values, probabilities = frequencies.index.astype(str), frequencies.to_numpy()
+            codes = rng.choice(len(values), size=n_rows, p=probabilities)
+            data[column] = pd.Categorical.from_codes(codes, categories=values)
+        elif reference is None:
+            low, high = INTEGER_RANGES[column] or DEFAULT_INTEGER_RANGE
+            data[column] = rng.integers(low, high, size=n_rows, endpoint=True)
+        else:
+            data[column] = rng.choice(reference[column].dropna().to_numpy(dtype=np.int64), size=n_rows)
+
+    return pd.DataFrame(data)
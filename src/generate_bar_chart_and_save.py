@@ -1,3 +1,5 @@
+import os
+import hashlib
 import altair as alt
 from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
 
@@ -6,10 +8,15 @@ def generate_bar_chart_and_save(
     y_axis_label, 
     y_axis_name,
     plot_dir, 
-    plot_name):
+    plot_name,
+    count_column=None,
+    skip_unchanged=False):
     """
     Generate bar char and save it to the directory.
 
+    Pass the counts from `count_by_income` together with `count_column` to embed
+    only the aggregated table in the chart instead of every row of the data.
+
     Parameters:
     ----------
     adult_income_dataframe : pandas.DataFrame
@@ -25,16 +32,41 @@ def generate_bar_chart_and_save(
         directory to where your plot will be saved.
     plot_name: str
         name of your plot. 
+    count_column : str, optional
+        Column holding pre-aggregated row counts. Every row is counted once when
+        it is None.
+    skip_unchanged : bool, optional
+        Whether to skip rendering when the plot exists and was rendered from the
+        same chart specification, as recorded in `<plot_name>.sha256`.
+
+    Returns:
+    -------
+    bool
+        Whether the plot was rendered, False when it was skipped.
     """
+    x_axis = alt.X('count():Q') if count_column is None else alt.X(f'sum({count_column}):Q').title('Count of Records')
 
     plot = alt.Chart(adult_data_frame, title=f"Income Distribution by: {y_axis_label}").mark_bar(opacity=0.75).encode(
-        alt.Y(y_axis_name).title(y_axis_label),
-        alt.X('count():Q'),
-        alt.Color('income', title='Income'),
-        alt.Column('income', title='Income')
+        alt.Y(y_axis_name, type='nominal').title(y_axis_label),
+        x_axis,
+        alt.Color('income:N', title='Income'),
+        alt.Column('income:N', title='Income')
     ).properties(
         height=200,
         width=300
     )
     dir = create_dir_and_file_if_not_exist(plot_dir, plot_name)
-    plot.save(dir, scale_factor=2.0)
\ No newline at end of file
+
+    # The specification holds the data, so it identifies the rendered plot
+    spec_sha256 = hashlib.sha256(plot.to_json(sort_keys=True).encode()).hexdigest()
+    hash_file = dir + '.sha256'
+    if skip_unchanged and os.path.isfile(dir) and os.path.isfile(hash_file):
+        with open(hash_file) as f:
+            if f.read().strip() == spec_sha256:
+                return False
+
+    plot.save(dir, scale_factor=2.0)
+    if skip_unchanged:
+        with open(hash_file, 'w') as f:
+            f.write(spec_sha256)
+    return True
\ No newline at end of file
@@ -0,0 +1,221 @@
+import io
+import os
+import json
+import hashlib
+import pandas as pd
+from src.fingerprint_index import FingerprintIndex
+from src.read_adult_data import read_adult_data
+from src.write_adult_data import write_adult_data
+from src.row_fingerprint import FINGERPRINT_COLUMN
+from src.validate_df import SCHEMA_KEY, COLUMNS
+from src.validate_df_iter import validate_df_iter
+
+# Bump when the layout of the watermark, the fingerprint index or the output changes
+WATERMARK_VERSION = 3
+
+# Number of new rows read and validated at a time when no chunk size is given
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def ingest_incremental(raw_path, output_file, state_dir, chunksize=None, window=64 * 1024, error_sink=None):
+    """
+    Validate only the rows appended to a raw data file since the last call, and append the clean ones.
+
+    The state of the last call is kept in `state_dir`: a watermark, that is the byte
+    offset and number of raw rows processed, the number of clean rows written and
+    a hash of the processed prefix, and `fingerprints/`, a `FingerprintIndex` of
+    the 64-bit fingerprints of the clean rows, against which the new rows are
+    deduplicated. Only the bytes after the offset are read and parsed, and the
+    fingerprints of the new rows are saved as a run of their own, merged with
+    the older runs only once they are about as big, so the cost of a call
+    follows the size of the new data rather than of the whole file.
+
+    By default the prefix hash covers only the length of the prefix and its first
+    and last `window` bytes, so checking it does not read the whole history
+    either. It catches a file that was replaced, truncated or rewritten at either
+    end, but NOT an edit in the middle of the processed prefix that keeps its
+    length: such rows stay as they were first validated. Pass `window=None` to
+    hash the whole prefix instead, which catches any edit at the cost of reading
+    the whole file on every call. When the hash no longer matches, the file is
+    shorter than the offset, the schema changed or the output is missing, the
+    file was rewritten rather than appended to, and it is processed again from
+    the start. A last line without a newline may still be being written, and is
+    left for the next call.
+
+    Parameters
+    ----------
+    raw_path : str
+        Path to the raw data file, without a header, such as adult.data.
+    output_file : str
+        Path of the cleaned CSV file the clean rows are appended to.
+    state_dir : str
+        Directory of the watermark and the fingerprint index.
+    chunksize : int, optional
+        Number of new rows to read and validate at a time, DEFAULT_CHUNKSIZE by
+        default. The new bytes are streamed from the raw file, so memory follows
+        the chunk size rather than the size of the new data.
+    window : int or None, optional
+        Number of bytes at each end of the processed prefix that are hashed, or
+        None to hash the whole prefix.
+    error_sink : ErrorSink, optional
+        Sink the failures of the new rows are added to.
+
+    Returns
+    -------
+    dict
+        'rebuilt' (whether the file was processed from the start), 'rows_read'
+        and 'rows_written' by this call, the total 'offset', 'rows' and
+        'clean_rows' processed so far, and 'report', the number of new rows
+        failing each check.
+
+    Raises
+    ------
+    ValueError
+        If `output_file` is not a CSV file.
+    """
+    if not output_file.endswith(".csv"):
+        raise ValueError(f"Incremental ingestion appends to a CSV file, not {output_file}.")
+
+    os.makedirs(state_dir, exist_ok=True)
+    watermark_path = os.path.join(state_dir, "watermark.json")
+    index_dir = os.path.join(state_dir, "fingerprints")
+
+    with open(raw_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        watermark = _read_watermark(watermark_path)
+        seen = FingerprintIndex.load(index_dir)
+        rebuilt = not _is_prefix(watermark, seen, f, size, raw_path, output_file, window)
+        if rebuilt:
+            watermark = {"offset": 0, "rows": 0, "clean_rows": 0}
+            seen = FingerprintIndex()
+            write_adult_data(pd.DataFrame(columns=COLUMNS + [FINGERPRINT_COLUMN]), output_file)
+        else:
+            # Drop any rows an interrupted call appended after the watermark
+            with open(output_file, "ab") as output:
+                output.truncate(watermark["output_size"])
+
+        # Parse only the complete lines after the watermark, streamed from the raw file
+        start = watermark["offset"]
+        end = _complete_lines_end(f, start, size)
+        f.seek(start)
+        tail = io.BufferedReader(_BoundedReader(f, end))
+
+        rows_read = 0
+        def counted_chunks():
+            nonlocal rows_read
+            if end > start:
+                for chunk in read_adult_data(tail, header=False, chunksize=chunksize or DEFAULT_CHUNKSIZE, verbose=False):
+                    rows_read += len(chunk)
+                    yield chunk
+
+        reports, rows_written = [], 0
+        for validated_chunk, report in validate_df_iter(counted_chunks(), seen=seen, error_sink=error_sink, fingerprint=True):
+            write_adult_data(validated_chunk, output_file, append=True)
+            rows_written += len(validated_chunk)
+            reports.append(report)
+
+        watermark = {
+            "version": WATERMARK_VERSION,
+            "raw_path": os.path.abspath(raw_path),
+            "output_file": os.path.abspath(output_file),
+            "schema_key": SCHEMA_KEY,
+            "offset": end,
+            "rows": watermark["rows"] + rows_read,
+            "clean_rows": watermark["clean_rows"] + rows_written,
+            "output_size": os.path.getsize(output_file),
+            "window": window,
+            "prefix_sha256": _prefix_digest(f, end, window),
+        }
+
+    _write_state(watermark, watermark_path, seen, index_dir)
+
+    if reports:
+        report = pd.concat(reports).groupby(["column", "check"], sort=False, as_index=False).sum()
+    else:
+        report = pd.DataFrame(columns=["column", "check", "failure_count"])
+    return {
+        "rebuilt": rebuilt,
+        "rows_read": rows_read,
+        "rows_written": rows_written,
+        "offset": watermark["offset"],
+        "rows": watermark["rows"],
+        "clean_rows": watermark["clean_rows"],
+        "report": report,
+    }
+
+
+def _read_watermark(watermark_path):
+    """Return the watermark of the last call, or None."""
+    if not os.path.isfile(watermark_path):
+        return None
+    with open(watermark_path) as f:
+        return json.load(f)
+
+
+def _is_prefix(watermark, seen, f, size, raw_path, output_file, window):
+    """Whether the watermark and the fingerprint index still describe the start of the raw file and the output."""
+    return (
+        watermark is not None
+        and watermark.get("version") == WATERMARK_VERSION
+        and watermark["raw_path"] == os.path.abspath(raw_path)
+        and watermark["output_file"] == os.path.abspath(output_file)
+        and watermark["schema_key"] == SCHEMA_KEY
+        and watermark["window"] == window
+        and watermark["offset"] <= size
+        # An index saved by a call interrupted before its watermark has more rows
+        and len(seen) == watermark["clean_rows"]
+        and os.path.isfile(output_file)
+        and os.path.getsize(output_file) >= watermark["output_size"]
+        and _prefix_digest(f, watermark["offset"], window) == watermark["prefix_sha256"]
+    )
+
+
+def _prefix_digest(f, offset, window, block_size=1024 * 1024):
+    """Hash the length and the first and last `window` bytes of the first `offset` bytes of `f`, or all of them."""
+    digest = hashlib.sha256(str(offset).encode())
+    f.seek(0)
+    if window is None:
+        for start in range(0, offset, block_size):
+            digest.update(f.read(min(block_size, offset - start)))
+        return digest.hexdigest()
+    digest.update(f.read(min(window, offset)))
+    f.seek(max(0, offset - window))
+    digest.update(f.read(min(window, offset)))
+    return digest.hexdigest()
+
+
+def _complete_lines_end(f, start, size, block_size=64 * 1024):
+    """Return the offset just past the last newline after `start`, or `start` when there is none."""
+    position = size
+    while position > start:
+        block_start = max(start, position - block_size)
+        f.seek(block_start)
+        newline = f.read(position - block_start).rfind(b"\n")
+        if newline != -1:
+            return block_start + newline + 1
+        position = block_start
+    return start
+
+
+class _BoundedReader(io.RawIOBase):
+    """Read a binary file from its current position up to the offset `end`, without loading it."""
+
+    def __init__(self, f, end):
+        self._f = f
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._f.read(max(0, min(len(buffer), self._end - self._f.tell())))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _write_state(watermark, watermark_path, seen, index_dir):
+    """Save the new runs of the fingerprint index, then the watermark, each file replacing the old one at once."""
+    seen.save(index_dir)
+    with open(watermark_path + ".part", "w") as f:
+        json.dump(watermark, f, indent=2)
+    os.replace(watermark_path + ".part", watermark_path)
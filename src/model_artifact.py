@@ -0,0 +1,107 @@
+import os
+import json
+import pickle
+import joblib
+import sklearn
+from src.validation_cache import hash_file
+
+# Bump when the layout of the artifact or its header changes
+ARTIFACT_VERSION = 1
+
+
+def save_model(model, path, metadata=None):
+    """
+    Save a model as a memory-mappable artifact with a version and hash header.
+
+    The model is written with joblib without compression, which stores every
+    numeric array, such as the training matrix of a KNN classifier, as raw aligned
+    bytes that `load_model` memory maps. The header is written next to it in
+    `<path>.json`.
+
+    Parameters
+    ----------
+    model : object
+        The fitted model or pipeline.
+    path : str
+        Path of the artifact, conventionally ending in '.joblib'.
+    metadata : dict, optional
+        JSON serializable values identifying how the model was trained, such as
+        the hash of the training data, stored in the header.
+
+    Returns
+    -------
+    dict
+        The header.
+    """
+    partial_path = path + '.part'
+    joblib.dump(model, partial_path, compress=0)
+    os.replace(partial_path, path)
+
+    header = {
+        'artifact_version': ARTIFACT_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'joblib_version': joblib.__version__,
+        'size': os.path.getsize(path),
+        'sha256': hash_file(path),
+        'metadata': metadata or {},
+    }
+    with open(path + '.json', 'w') as f:
+        json.dump(header, f, indent=2)
+    return header
+
+
+def load_model(path, mmap_mode='r', verify=False, metadata=None):
+    """
+    Load a model saved with `save_model`, or a pickled model.
+
+    The numeric arrays of an artifact are memory mapped read-only by default, so
+    loading does not copy them and every process scoring with the same artifact
+    shares a single copy in the page cache. Files ending in '.pickle' are read
+    with pickle as before.
+
+    Parameters
+    ----------
+    path : str
+        Path of the artifact or pickle file.
+    mmap_mode : str or None, optional
+        Memory map mode of the arrays, None to read them into memory.
+    verify : bool, optional
+        Whether to check the SHA-256 checksum of the artifact against its header,
+        which reads the whole file.
+    metadata : dict, optional
+        Values the metadata of the header must match, such as the hash of the
+        current training data.
+
+    Returns
+    -------
+    object
+        The model.
+
+    Raises
+    ------
+    ValueError
+        If the artifact has no header or is stale: saved by another artifact
+        version or scikit-learn version, changed since it was saved, or saved
+        with different metadata.
+    """
+    if path.endswith('.pickle'):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    if not os.path.isfile(path + '.json'):
+        raise ValueError(f"The model artifact {path} has no header {path}.json.")
+    with open(path + '.json') as f:
+        header = json.load(f)
+
+    if header.get('artifact_version') != ARTIFACT_VERSION:
+        raise ValueError(f"The model artifact {path} has version {header.get('artifact_version')}, expected {ARTIFACT_VERSION}.")
+    if header.get('sklearn_version') != sklearn.__version__:
+        raise ValueError(f"The model artifact {path} was saved with scikit-learn {header.get('sklearn_version')}, "
+                         f"but {sklearn.__version__} is installed.")
+    if os.path.getsize(path) != header.get('size') or (verify and hash_file(path) != header.get('sha256')):
+        raise ValueError(f"The model artifact {path} does not match the checksum in its header.")
+    for key, value in (metadata or {}).items():
+        if header['metadata'].get(key) != value:
+            raise ValueError(f"The model artifact {path} is stale: its {key} is {header['metadata'].get(key)}, expected {value}.")
+
+    return joblib.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,30 @@
+import zipfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def open_raw_file(raw_dir, member=None):
+    """
+    Open the raw data file for reading, either on disk or inside a ZIP archive.
+
+    When `member` is given the member is decompressed as it is read, so it can be
+    passed straight to `pandas.read_csv` without extracting the archive first.
+
+    Parameters
+    ----------
+    raw_dir : str
+        Path to the raw data file, or to the ZIP archive holding it.
+    member : str, optional
+        Name of the raw data file inside the archive at `raw_dir`.
+
+    Yields
+    ------
+    file object
+        A binary file object positioned at the start of the raw data.
+    """
+    if member is None:
+        with open(raw_dir, 'rb') as f:
+            yield f
+    else:
+        with zipfile.ZipFile(raw_dir, 'r') as zip_ref, zip_ref.open(member) as f:
+            yield f
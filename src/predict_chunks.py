@@ -0,0 +1,69 @@
+import collections
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.model_artifact import load_model
+
+# Model loaded once by each worker process
+_worker_model = None
+
+
+def predict_chunks(model_path, chunks, n_jobs=1, proba=False):
+    """
+    Score chunks of data with a saved or fitted model, optionally across worker processes.
+
+    The model is loaded once per process. Workers loading a `save_model` artifact
+    memory map its arrays, sharing one copy of the training data, while a fitted
+    model is used as is in this process and pickled once to each worker. With several workers at most two
+    chunks per worker are in flight at a time, so memory stays bounded however
+    many chunks there are, and predictions come back in the order of the chunks.
+
+    Parameters
+    ----------
+    model_path : str or object
+        Path to the trained model, a pickle file or a `save_model` artifact, or
+        the fitted model itself.
+    chunks : iterable of pandas.DataFrame
+        Features to score, one DataFrame per chunk.
+    n_jobs : int, optional
+        Number of worker processes. 1 scores in this process.
+    proba : bool, optional
+        Whether to add the predicted probability of each class. The prediction is
+        then the most probable class, so the model scores each chunk only once.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The 'prediction' column, and one 'proba_<class>' column per class when
+        `proba` is True, for each chunk.
+    """
+    if n_jobs == 1:
+        _load_model(model_path)
+        for chunk in chunks:
+            yield _predict(chunk, proba)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_load_model, initargs=(model_path,)) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_predict, chunk, proba))
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _load_model(model_path):
+    global _worker_model
+    _worker_model = load_model(model_path) if isinstance(model_path, str) else model_path
+
+
+def _predict(chunk, proba):
+    if not proba:
+        return pd.DataFrame({"prediction": _worker_model.predict(chunk)})
+
+    # Derive the predictions from the probabilities, so the model is only run once
+    probabilities = _worker_model.predict_proba(chunk)
+    predictions = pd.DataFrame({"prediction": _worker_model.classes_[probabilities.argmax(axis=1)]})
+    for i, label in enumerate(_worker_model.classes_):
+        predictions[f"proba_{label}"] = probabilities[:, i]
+    return predictions
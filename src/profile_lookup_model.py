@@ -0,0 +1,90 @@
+import numpy as np
+from src.row_fingerprint import row_fingerprint
+
+
+class ProfileLookupModel:
+    """
+    A fitted pipeline compiled into a lookup table of feature profiles.
+
+    The KNN pipeline only looks at a handful of categorical features, so only a
+    few thousand distinct inputs, or profiles, ever reach it. Each profile's
+    prediction and probabilities are computed once with the pipeline and stored
+    under the profile's 64-bit row fingerprint. Predicting is then a sorted
+    array lookup. Profiles not in the table are scored with the pipeline on
+    demand and added to it, so the output is always the same as the pipeline's.
+
+    Parameters
+    ----------
+    pipe : sklearn.pipeline.Pipeline
+        The fitted pipeline, with `feature_names_in_`, `classes_`, `predict`
+        and `predict_proba`.
+    features : list of str, optional
+        The columns the pipeline actually uses. Defaults to all columns it was
+        fitted on.
+    """
+
+    def __init__(self, pipe, features=None):
+        self.pipe = pipe
+        self.features = list(pipe.feature_names_in_) if features is None else list(features)
+        self.feature_names_in_ = pipe.feature_names_in_
+        self.classes_ = pipe.classes_
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._predictions = np.empty(0, dtype=self.classes_.dtype)
+        self._probabilities = np.empty((0, len(self.classes_)))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def compile(self, X):
+        """
+        Add the profiles found in `X` to the table.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Features, for example the training set.
+
+        Returns
+        -------
+        ProfileLookupModel
+            The model itself.
+        """
+        self._lookup(X)
+        return self
+
+    def predict(self, X):
+        """Predict the class of every row of `X`, exactly as the pipeline would."""
+        positions = self._lookup(X)
+        return self._predictions[positions]
+
+    def predict_proba(self, X):
+        """Predict the class probabilities of every row of `X`, exactly as the pipeline would."""
+        positions = self._lookup(X)
+        return self._probabilities[positions]
+
+    def _lookup(self, X):
+        """Return the table position of each row's profile, scoring new profiles first."""
+        keys = row_fingerprint(X, self.features)
+        positions = self._positions(keys)
+
+        missing = positions < 0
+        if missing.any():
+            new_keys, first_rows = np.unique(keys[missing], return_index=True)
+            new_profiles = X.iloc[np.flatnonzero(missing)[first_rows]]
+            self._insert(new_keys, self.pipe.predict(new_profiles), self.pipe.predict_proba(new_profiles))
+            positions = self._positions(keys)
+        return positions
+
+    def _positions(self, keys):
+        """Find `keys` in the sorted table, -1 where they are missing."""
+        if not len(self._keys):
+            return np.full(len(keys), -1)
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[positions] == keys, positions, -1)
+
+    def _insert(self, keys, predictions, probabilities):
+        keys = np.concatenate([self._keys, keys])
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._predictions = np.concatenate([self._predictions, predictions])[order]
+        self._probabilities = np.concatenate([self._probabilities, probabilities])[order]
@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import inspect
+import threading
+import functools
+import contextlib
+import click
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Profiler of the running command, when it was started with --profile
+_active = None
+
+
+class Profiler:
+    """
+    Record the wall time, CPU time, memory and row count of named steps.
+
+    Steps are timed with `step` and may be nested. They are saved in the trace
+    event format, which trace viewers such as Perfetto or chrome://tracing open
+    as a timeline.
+
+    The CPU time of a step, 'cpu_time_s', is that of the thread running it, so
+    steps run concurrently in threads each get their own. The CPU time of the
+    whole process over the step, including the threads it starts, is
+    'process_cpu_time_s'. Memory is the current resident set size, 'rss_mb',
+    at the end of the step, and 'process_peak_rss_mb', the highest resident set
+    size of the process since it started, not only during the step.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._depths = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._main_stack = self._stack()
+
+    def _stack(self):
+        """Names of the steps open in the calling thread."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def step(self, name, rows=None):
+        """
+        Time the code in the `with` block as a step called `name`.
+
+        Yields a dict whose 'rows' entry can be set in the block once the number
+        of rows the step processed is known.
+        """
+        record = {"rows": rows}
+        stack = self._stack()
+        # Steps of other threads nest under the step open in the main thread
+        depth = len(stack) if stack is self._main_stack else len(self._main_stack) + len(stack)
+        stack.append(name)
+        start, cpu_start, process_cpu_start = time.perf_counter(), time.thread_time(), time.process_time()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            rss, peak_rss = _rss_mb(), _peak_rss_mb()
+            # The kernel updates the high-water mark lazily, so it may trail the current size
+            if rss is not None and peak_rss is not None:
+                peak_rss = max(peak_rss, rss)
+            args = {
+                "cpu_time_s": round(time.thread_time() - cpu_start, 6),
+                "process_cpu_time_s": round(time.process_time() - process_cpu_start, 6),
+                "process_peak_rss_mb": peak_rss,
+                "rss_mb": rss,
+            }
+            if record["rows"] is not None:
+                args["rows"] = int(record["rows"])
+            self.events.append({
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6),
+                "dur": round((end - start) * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            })
+            self._depths.append(depth)
+
+    def summary(self):
+        """Return a table of the steps in the order they started, nested steps indented."""
+        lines = [f"{'step':<40} {'wall (s)':>9} {'cpu (s)':>9} {'proc. peak RSS (MB)':>20} {'rows':>12}"]
+        steps = sorted(zip(self.events, self._depths), key=lambda step: (step[0]["ts"], step[1]))
+        for event, depth in steps:
+            name = "  " * depth + event["name"]
+            args = event["args"]
+            rows = f"{args['rows']:,}" if "rows" in args else ""
+            peak_rss = f"{args['process_peak_rss_mb']:.1f}" if args["process_peak_rss_mb"] is not None else ""
+            lines.append(f"{name:<40} {event['dur'] / 1e6:>9.3f} {args['cpu_time_s']:>9.3f} {peak_rss:>20} {rows:>12}")
+        return "\n".join(lines)
+
+    def save(self, path):
+        """Write the steps to `path` as a trace event JSON file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f, indent=1)
+
+
+def step(name, rows=None):
+    """
+    Time a step of the running command when it is profiled, otherwise do nothing.
+
+    Usage: `with step("fit") as record: ...`, setting `record["rows"]` in the
+    block to record the number of rows.
+    """
+    if _active is None:
+        return contextlib.nullcontext({"rows": rows})
+    return _active.step(name, rows)
+
+
+def profile_option(command):
+    """
+    Add a --profile option to a click command, placed right below `@click.command()`.
+
+    With --profile, the whole command and the steps it marks with `step` are
+    recorded, saved as a trace event JSON file at the given path and summarized.
+    A command run from another profiled command, as `run_pipeline` runs the
+    stages, records its steps in the trace of that command instead.
+    """
+    name = os.path.splitext(os.path.basename(inspect.getfile(command)))[0]
+
+    @click.option('--profile', 'profile_path', type=str, default=None,
+                  help="Path of a trace event JSON file to save the time, CPU time, memory and rows of each step to")
+    @functools.wraps(command)
+    def wrapper(*args, profile_path=None, **kwargs):
+        global _active
+        if profile_path is None or _active is not None:
+            with step(name):
+                return command(*args, **kwargs)
+
+        _active = Profiler()
+        try:
+            with _active.step(name):
+                return command(*args, **kwargs)
+        finally:
+            profiler, _active = _active, None
+            profiler.save(profile_path)
+            print(f"Profile saved to {profile_path}:\n{profiler.summary()}")
+
+    return wrapper
+
+
+def _peak_rss_mb():
+    """Highest resident set size of the process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes
+    return round(peak / 1e6 if os.uname().sysname == "Darwin" else peak * 1024 / 1e6, 1)
+
+
+def _rss_mb():
+    """Current resident set size of the process, in MB, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
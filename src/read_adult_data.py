@@ -0,0 +1,139 @@
+import sys
+import numpy as np
+import pandas as pd
+from src.validate_df import CATEGORIES, COLUMNS
+from src.data_format import data_format
+from src.row_fingerprint import FINGERPRINT_COLUMN
+
+
+def read_adult_data(filepath_or_buffer, header=True, chunksize=None, verbose=True, columns=None):
+    """
+    Read adult income data into a DataFrame with compact dtypes.
+
+    Leading spaces are stripped while parsing, the categorical columns are loaded
+    as `pandas.CategoricalDtype` with the category sets of the `validate_df`
+    schema, and the integer columns are downcast to the smallest integer type
+    that holds them. Values outside the schema are kept as extra categories, so
+    `validate_df` can still find them.
+
+    Raw files may have the quirks of adult.test: its first line starts with
+    '|', so raw files are read with '|' as the comment character, and the
+    trailing '.' of its income labels is removed, so '>50K.' is read as '>50K'.
+    A comment character drops everything from the '|' to the end of the line,
+    wherever it appears; the adult data has no '|' in its values, so this only
+    skips the lines starting with one.
+
+    Paths ending in .parquet or .feather are read with pyarrow, loading only
+    the requested `columns` from disk.
+
+    Parameters
+    ----------
+    filepath_or_buffer : str or file object
+        Path to the CSV, Parquet or Feather file, or a CSV file object as
+        returned by `open_raw_file`.
+    header : bool, optional
+        Whether a CSV file starts with a header row. Files without one, such as
+        the raw adult.data file, are read with the columns of the schema.
+    chunksize : int, optional
+        Number of rows to read at a time. When given, an iterator of DataFrames
+        is returned instead of a single DataFrame.
+    verbose : bool, optional
+        Whether to print how much memory the compact dtypes saved.
+    columns : list of str, optional
+        Columns to load. Defaults to all columns of the file.
+
+    Returns
+    -------
+    pandas.DataFrame or iterator of pandas.DataFrame
+        The adult income data.
+    """
+    file_format = data_format(filepath_or_buffer)
+    if file_format == "csv":
+        chunks = pd.read_csv(
+            filepath_or_buffer,
+            header=0 if header else None,
+            names=None if header else COLUMNS,
+            usecols=columns,
+            skipinitialspace=True,
+            comment=None if header else "|",
+            dtype={column: "category" for column in CATEGORIES},
+            chunksize=chunksize,
+        )
+    elif chunksize is not None:
+        chunks = _read_arrow_batches(filepath_or_buffer, file_format, chunksize, columns)
+    elif file_format == "parquet":
+        chunks = pd.read_parquet(filepath_or_buffer, columns=columns)
+    else:
+        chunks = pd.read_feather(filepath_or_buffer, columns=columns)
+
+    if chunksize is not None:
+        return (_compact_dtypes(chunk) for chunk in chunks)
+
+    data = _compact_dtypes(chunks)
+    if verbose:
+        memory = data.memory_usage(deep=True).sum()
+        saved = _default_memory_usage(data) - memory
+        print(f"Loaded {len(data)} rows into {memory / 1e6:.1f} MB, "
+              f"saving {saved / 1e6:.1f} MB ({saved} bytes) over default dtypes.")
+    return data
+
+
+def _read_arrow_batches(path, file_format, chunksize, columns):
+    """Yield DataFrames of at most `chunksize` rows from a Parquet or Feather file."""
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    if file_format == "parquet":
+        batches = pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        with pyarrow.ipc.open_file(path) as reader:
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(offset, chunksize).to_pandas()
+
+
+def _compact_dtypes(data):
+    """Apply the schema's category sets and downcast the integer columns, keeping row fingerprints as uint64."""
+    for column in data.columns:
+        if column == FINGERPRINT_COLUMN:
+            data[column] = data[column].astype("uint64")
+        elif column in CATEGORIES:
+            if column == "income":
+                data[column] = _strip_trailing_periods(data[column])
+            known = CATEGORIES[column]
+            extra = sorted(set(data[column].cat.categories) - set(known))
+            data[column] = data[column].cat.set_categories(known + extra)
+        elif pd.api.types.is_integer_dtype(data[column]):
+            if isinstance(data[column].dtype, pd.api.extensions.ExtensionDtype) and not data[column].hasnans:
+                data[column] = data[column].astype("int64")
+            data[column] = pd.to_numeric(data[column], downcast="integer")
+    return data
+
+
+def _strip_trailing_periods(series):
+    """Remove a trailing '.' from the categories of a categorical Series, merging the categories it duplicates."""
+    categories = series.cat.categories
+    stripped = categories.str.rstrip(".")
+    if stripped.equals(categories):
+        return series
+    unique = stripped.unique()
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes == -1, -1, unique.get_indexer(stripped)[codes])
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=unique), index=series.index, name=series.name)
+
+
+def _default_memory_usage(data):
+    """Estimate the bytes the same data takes as object strings and 64-bit numbers."""
+    n_bytes = 0
+    for column in data.columns:
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            counts = data[column].value_counts(dropna=False)
+            n_bytes += 8 * len(data) + sum(sys.getsizeof(value) * count for value, count in counts.items())
+        else:
+            n_bytes += 8 * len(data)
+    return n_bytes
@@ -0,0 +1,95 @@
+import os
+import functools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.open_raw_file import open_raw_file
+from src.error_sink import ErrorSink
+from src.read_adult_data import read_adult_data
+from src.row_fingerprint import FINGERPRINT_COLUMN
+from src.validate_df import validate_df
+
+
+def read_raw_files(sources, n_jobs=1, error_sink=None):
+    """
+    Read and validate several raw data files, optionally in parallel, and merge them into one cleaned dataset.
+
+    Every file is parsed, validated and fingerprinted in its own worker process,
+    so reading adult.data and adult.test takes about as long as the bigger of the
+    two. `read_adult_data` handles the quirks of each file, such as the first line
+    and the trailing '.' of the income labels of adult.test. Rows repeated across
+    files are kept only in the first file, in the order of `sources`, and a
+    'source_file' column records which file each row came from.
+
+    Parameters
+    ----------
+    sources : list of tuple
+        One (path, member) pair per raw file: the path to the raw file, or to the
+        ZIP archive holding it, and the name of the file inside the archive, or None.
+    n_jobs : int, optional
+        Number of worker processes. 1 reads every file in this process.
+    error_sink : ErrorSink, optional
+        Sink the failures of every file are added to. Each worker fills a sink
+        of its own, merged into this one.
+
+    Returns
+    -------
+    tuple
+        The cleaned DataFrame of every file, with a categorical 'source_file'
+        column, and the report of the rows failing each check, with one row per
+        file and check. The 'duplicate_rows' count of a file includes the rows
+        already found in an earlier file.
+    """
+    read = functools.partial(_read_raw_file, sample_size=None if error_sink is None else error_sink.sample_size)
+    if n_jobs == 1 or len(sources) == 1:
+        results = [read(source) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(sources))) as executor:
+            results = list(executor.map(read, sources))
+
+    # Keep the first occurrence of every row across files
+    fingerprints = np.concatenate([fingerprint for _, _, fingerprint, _ in results])
+    keep = np.zeros(len(fingerprints), dtype=bool)
+    keep[np.unique(fingerprints, return_index=True)[1]] = True
+
+    names = [_source_name(path, member) for path, member in sources]
+    frames, reports, start = [], [], 0
+    for name, (validated, report, fingerprint, file_sink) in zip(names, results):
+        file_keep = keep[start:start + len(fingerprint)]
+        start += len(fingerprint)
+        report.loc[report["check"] == "duplicate_rows", "failure_count"] += int((~file_keep).sum())
+        if error_sink is not None:
+            file_sink.add(validated, [("DataFrame", "duplicate_rows", ~file_keep)])
+            error_sink.merge(file_sink)
+        frames.append(validated[file_keep].assign(source_file=name))
+        reports.append(report.assign(source_file=name))
+
+    data = pd.concat(_union_categories(frames), ignore_index=True)
+    data["source_file"] = pd.Categorical(data["source_file"], categories=list(dict.fromkeys(names)))
+    report = pd.concat(reports, ignore_index=True)[["source_file", "column", "check", "failure_count"]]
+    return data, report
+
+
+def _read_raw_file(source, sample_size=None):
+    """Read, validate and fingerprint one raw file, collecting its failures in a sink of `sample_size` examples."""
+    path, member = source
+    with open_raw_file(path, member) as raw_file:
+        data = read_adult_data(raw_file, header=False, verbose=False)
+    error_sink = None if sample_size is None else ErrorSink(sample_size)
+    validated, report = validate_df(data, return_report=True, error_sink=error_sink, fingerprint=True)
+    return validated, report, validated[FINGERPRINT_COLUMN].to_numpy(), error_sink
+
+
+def _source_name(path, member):
+    return member if member is not None else os.path.basename(path)
+
+
+def _union_categories(frames):
+    """Give each categorical column the same categories in every frame, so concatenating keeps it categorical."""
+    columns = [column for column in frames[0].columns if isinstance(frames[0][column].dtype, pd.CategoricalDtype)]
+    for column in columns:
+        categories = pd.Index([])
+        for frame in frames:
+            categories = categories.append(frame[column].cat.categories.difference(categories, sort=False))
+        frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return frames
@@ -1,19 +1,42 @@
 import os
+import json
+import zlib
+import hashlib
 import requests
 import zipfile
 from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
 
 
-def read_zip(url, directory):
+def read_zip(url, directory, sha256=None, chunk_size=1024 * 1024, timeout=60, extract=True, session=None):
     """
     Read a zip file from the given URL and extract its contents to the specified directory.
 
+    The archive is streamed to disk in chunks of `chunk_size` bytes, so peak memory
+    does not depend on the size of the archive. An interrupted download is kept as
+    `<name>.zip.part` and resumed with an HTTP Range request on the next call. The
+    checksum, ETag and Last-Modified value of a finished download are stored next
+    to the archive in `<name>.zip.json`, and the download is skipped when they show
+    that the archive has not changed.
+
     Parameters:
     ----------
     url : str
         The URL of the zip file to be read.
     directory : str
         The directory where the contents of the zip file will be extracted.
+    sha256 : str, optional
+        Expected SHA-256 checksum of the archive. When the archive on disk already
+        has this checksum no request is sent at all.
+    chunk_size : int, optional
+        Number of bytes written to disk at a time.
+    timeout : float, optional
+        Seconds to wait for the server before giving up.
+    extract : bool, optional
+        Whether to extract the members of the archive. Pass False to keep only
+        the archive and read its members in place with `open_raw_file`.
+    session : requests.Session, optional
+        Session sending the request, to reuse its connection pool and retry
+        policy across downloads. A new connection is opened when not given.
 
     Returns:
     -------
@@ -22,28 +45,158 @@ def read_zip(url, directory):
     Raises:
     ------
     ValueError:
-        If the URL is invalid or does not point to a ZIP file.
+        If the URL is invalid, does not point to a ZIP file, the server sends part
+        of the archive when the whole of it was asked for, or the downloaded
+        archive does not match `sha256`.
     """
-    # Send an HTTP GET request to the URL
-    request = requests.get(url)
     filename_from_url = os.path.basename(url)
 
-    # Check if the URL is accessible
-    if request.status_code != 200:
-        raise ValueError("The URL provided does not exist.")
-    
     # Ensure the URL points to a ZIP file
     if not filename_from_url.endswith('.zip'):
         raise ValueError("The URL provided does not point to a ZIP file.")
-    
-    # Save the ZIP file to the target directory
+
     path_to_zip_file = create_dir_and_file_if_not_exist(directory, filename_from_url)
-    with open(path_to_zip_file, 'wb') as f:
-        f.write(request.content)
+    metadata_file = path_to_zip_file + '.json'
+    partial_file = path_to_zip_file + '.part'
+    metadata = _read_metadata(metadata_file)
 
-    # Extract the contents of the ZIP file
-    with zipfile.ZipFile(path_to_zip_file, 'r') as zip_ref:
-        zip_ref.extractall(directory)
+    # Skip the download when the archive on disk is the one we expect
+    local_sha256 = None
+    if os.path.isfile(path_to_zip_file):
+        local_sha256 = _file_sha256(path_to_zip_file, chunk_size)
+        if sha256 is not None and local_sha256 == sha256:
+            print(f"Archive {path_to_zip_file} matches the expected checksum, skipping download.")
+            _extract(path_to_zip_file, directory, extract)
+            return
+    if local_sha256 is None or local_sha256 != metadata.get('sha256'):
+        # The metadata no longer describes the archive on disk, but may still describe
+        # an interrupted download to resume
+        metadata = {key: value for key, value in metadata.items() if key == 'partial'}
+
+    # Send an HTTP GET request to the URL, asking only for what we do not have yet
+    headers = {}
+    if metadata.get('sha256') and sha256 in (None, metadata['sha256']):
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+    else:
+        partial = metadata.get('partial', {})
+        validator = partial.get('etag') or partial.get('last_modified')
+        if os.path.isfile(partial_file) and validator and partial.get('url') == url:
+            headers['Range'] = f"bytes={os.path.getsize(partial_file)}-"
+            headers['If-Range'] = validator
+
+    request = (session or requests).get(url, headers=headers, stream=True, timeout=timeout)
+
+    # Part of the archive other than the part we asked for cannot be appended to the
+    # partial file, so start over without a Range request
+    if request.status_code == 206 and _range_start(request) != headers.get('Range'):
+        request.close()
+        if 'Range' in headers:
+            headers = {}
+            request = (session or requests).get(url, stream=True, timeout=timeout)
+        if request.status_code == 206:
+            request.close()
+            raise ValueError(f"The server of {url} sent part of the archive when the whole of it was asked for.")
+
+    # The server tells us the archive on disk is current
+    if request.status_code == 304:
+        request.close()
+        print(f"Archive {path_to_zip_file} is up to date, skipping download.")
+        _extract(path_to_zip_file, directory, extract)
+        return
+
+    # Check if the URL is accessible
+    if request.status_code not in (200, 206):
+        request.close()
+        raise ValueError("The URL provided does not exist.")
+
+    # Remember how to resume this download before writing any of it
+    resume = request.status_code == 206
+    metadata = {
+        'url': url,
+        'partial': {
+            'url': url,
+            'etag': request.headers.get('ETag'),
+            'last_modified': request.headers.get('Last-Modified'),
+        },
+    }
+    _write_metadata(metadata_file, metadata)
+
+    # Stream the ZIP file to the target directory
+    with request, open(partial_file, 'ab' if resume else 'wb') as f:
+        for chunk in request.iter_content(chunk_size=chunk_size):
+            f.write(chunk)
+
+    downloaded_sha256 = _file_sha256(partial_file, chunk_size)
+    if sha256 is not None and downloaded_sha256 != sha256:
+        os.remove(partial_file)
+        raise ValueError(f"The archive downloaded from {url} does not match the expected checksum.")
+    os.replace(partial_file, path_to_zip_file)
+
+    _write_metadata(metadata_file, {
+        'url': url,
+        'sha256': downloaded_sha256,
+        'etag': request.headers.get('ETag'),
+        'last_modified': request.headers.get('Last-Modified'),
+    })
+
+    # Extract the contents of the ZIP file, replacing the members of an older archive
+    _extract(path_to_zip_file, directory, extract, overwrite=True)
 
     # Print success message
-    print(f"Successfully downloaded and extracted data to: {directory}")
\ No newline at end of file
+    if extract:
+        print(f"Successfully downloaded and extracted data to: {directory}")
+    else:
+        print(f"Successfully downloaded data to: {path_to_zip_file}")
+
+
+def _extract(path_to_zip_file, directory, extract=True, overwrite=False):
+    """Extract the archive, leaving members already on disk with the same content untouched unless `overwrite`."""
+    if not extract:
+        return
+    with zipfile.ZipFile(path_to_zip_file, 'r') as zip_ref:
+        for member in zip_ref.infolist():
+            target = os.path.join(directory, member.filename)
+            if overwrite or member.is_dir() or not _same_content(target, member):
+                zip_ref.extract(member, directory)
+
+
+def _same_content(path, member, chunk_size=1024 * 1024):
+    """Whether the file at `path` has the size and CRC-32 checksum of the archive member."""
+    if not os.path.isfile(path) or os.path.getsize(path) != member.file_size:
+        return False
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc == member.CRC
+
+
+def _range_start(request):
+    """Return the Range header value matching the Content-Range of a 206 response."""
+    content_range = request.headers.get('Content-Range', '')
+    start = content_range.removeprefix('bytes ').split('-')[0]
+    return f"bytes={start}-"
+
+
+def _file_sha256(path, chunk_size):
+    """Compute the SHA-256 checksum of a file without reading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_metadata(metadata_file):
+    if not os.path.isfile(metadata_file):
+        return {}
+    with open(metadata_file) as f:
+        return json.load(f)
+
+
+def _write_metadata(metadata_file, metadata):
+    with open(metadata_file, 'w') as f:
+        json.dump(metadata, f, indent=2)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+# Column of the fingerprints computed by `validate_df`, carried with the validated rows
+FINGERPRINT_COLUMN = "row_fingerprint"
+
+
+def row_fingerprint(adult_income_dataframe, columns=None):
+    """
+    Compute a 64-bit fingerprint of every row of the adult income dataframe.
+
+    Numbers are hashed as float64 and categories as their values, so the same
+    row gets the same fingerprint whether it was loaded as int8, int64 or float,
+    and as strings or categoricals.
+
+    Validated data may carry its fingerprints in FINGERPRINT_COLUMN, which is
+    never part of a row here: the values are always hashed, so edited rows get
+    new fingerprints. Code receiving rows straight from `validate_df` reads the
+    column instead of calling this function.
+
+    Parameters
+    ----------
+    adult_income_dataframe : pandas.DataFrame
+        The DataFrame whose rows are fingerprinted.
+    columns : list of str, optional
+        Columns that make up a row. Defaults to all columns but FINGERPRINT_COLUMN.
+
+    Returns
+    -------
+    numpy.ndarray
+        One uint64 fingerprint per row.
+    """
+    if columns is None:
+        columns = adult_income_dataframe.columns.drop(FINGERPRINT_COLUMN, errors="ignore")
+    data = adult_income_dataframe[list(columns)]
+    numeric_columns = [column for column in data.columns if pd.api.types.is_numeric_dtype(data[column])]
+    data = data.astype({column: "float64" for column in numeric_columns})
+    return pd.util.hash_pandas_object(data, index=False).to_numpy(dtype=np.uint64)
@@ -0,0 +1,97 @@
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, ParameterGrid
+from sklearn.neighbors import KNeighborsClassifier
+
+
+def search_knn(preprocessor, X, y, param_grid, cv=5, n_jobs=1, random_state=None):
+    """
+    Cross-validate a KNN classifier over a grid of parameters, preprocessing each fold once.
+
+    The preprocessor is fitted on the training part of every fold and both parts are
+    transformed up front. The transformed folds are then shared by all candidates,
+    so the preprocessing runs `cv` times instead of once per candidate and fold.
+    Folds and (candidate, fold) fits run in parallel with joblib, which memory maps
+    the large transformed arrays into the worker processes instead of copying them.
+
+    Parameters:
+    ----------
+    preprocessor : sklearn transformer
+        Unfitted transformer of the features, such as a ColumnTransformer.
+    X : pandas.DataFrame
+        The training features.
+    y : pandas.Series
+        The training target.
+    param_grid : dict or list of dict
+        Parameters of KNeighborsClassifier to search, as in GridSearchCV.
+    cv : int, optional
+        Number of stratified folds.
+    n_jobs : int, optional
+        Number of parallel jobs, -1 to use all cores.
+    random_state : int, optional
+        Seed of the shuffled folds.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per candidate with its parameters, 'mean_test_score',
+        'std_test_score', 'mean_fit_time', 'mean_score_time', 'total_time' and
+        'rank_test_score', sorted by rank.
+    dict
+        Parameters of the best candidate.
+    """
+    # Score on integer codes of the target, which every KNN code path accepts
+    y = pd.Series(pd.factorize(y)[0], index=X.index)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(X, y)
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        # Preprocess every fold once
+        transformed_folds = parallel(
+            delayed(_transform_fold)(clone(preprocessor), X, y, train, test)
+            for train, test in folds
+        )
+
+        # Fit and score every candidate on the transformed folds
+        candidates = list(ParameterGrid(param_grid))
+        scores = parallel(
+            delayed(_fit_and_score)(candidate, *fold)
+            for candidate in candidates
+            for fold in transformed_folds
+        )
+
+    scores = np.array(scores).reshape(len(candidates), cv, 3)
+    results = pd.DataFrame(candidates)
+    results["mean_test_score"] = scores[:, :, 0].mean(axis=1)
+    results["std_test_score"] = scores[:, :, 0].std(axis=1)
+    results["mean_fit_time"] = scores[:, :, 1].mean(axis=1)
+    results["mean_score_time"] = scores[:, :, 2].mean(axis=1)
+    results["total_time"] = scores[:, :, 1:].sum(axis=(1, 2))
+    results["rank_test_score"] = results["mean_test_score"].rank(ascending=False, method="min").astype(int)
+    results = results.sort_values("rank_test_score", kind="stable").reset_index(drop=True)
+
+    return results, candidates[int(np.argmax(scores[:, :, 0].mean(axis=1)))]
+
+
+def _transform_fold(preprocessor, X, y, train, test):
+    """Fit the preprocessor on the training part of a fold and transform both parts."""
+    X_train, X_test = X.iloc[train], X.iloc[test]
+    X_train_transformed = preprocessor.fit_transform(X_train)
+    return X_train_transformed, y.iloc[train].to_numpy(), preprocessor.transform(X_test), y.iloc[test].to_numpy()
+
+
+def _fit_and_score(candidate, X_train, y_train, X_test, y_test):
+    """Return the accuracy, fit time and score time of one candidate on one fold."""
+    model = KNeighborsClassifier(**candidate)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    score = model.score(X_test, y_test)
+    score_time = time.perf_counter() - start
+
+    return score, fit_time, score_time
@@ -0,0 +1,110 @@
+import os
+import ast
+import json
+import shutil
+import hashlib
+from src.validation_cache import hash_file
+
+
+def stage_cache_key(stage_name, code_paths, params, input_paths):
+    """
+    Build the content-addressed key of a pipeline stage.
+
+    Parameters
+    ----------
+    stage_name : str
+        Name of the stage.
+    code_paths : list of str
+        Source files of the stage, see `stage_code_paths`.
+    params : dict
+        Parameters the stage is run with.
+    input_paths : list of str
+        Files the stage reads.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 key, which changes whenever the code, a parameter or
+        the content of an input does.
+    """
+    manifest = {
+        "stage": stage_name,
+        "code": {os.path.relpath(path): hash_file(path) for path in code_paths},
+        "params": params,
+        "inputs": {path: hash_file(path) for path in input_paths},
+    }
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def stage_code_paths(script_path, root_dir=None):
+    """
+    List the script and every `src` module it imports, directly or not.
+
+    Parameters
+    ----------
+    script_path : str
+        Path to the stage's script.
+    root_dir : str, optional
+        Project root holding the `src` package. Defaults to the parent of the
+        script's directory.
+
+    Returns
+    -------
+    list of str
+        Sorted paths of the source files.
+    """
+    if root_dir is None:
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(script_path)))
+    paths, pending = set(), [os.path.abspath(script_path)]
+    while pending:
+        path = pending.pop()
+        if path in paths:
+            continue
+        paths.add(path)
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("src."):
+                module_path = os.path.join(root_dir, *node.module.split(".")) + ".py"
+                if os.path.isfile(module_path):
+                    pending.append(module_path)
+    return sorted(paths)
+
+
+def restore_stage(cache_dir, stage_name, key, output_paths):
+    """
+    Copy the cached outputs of a stage into place.
+
+    Returns
+    -------
+    bool
+        Whether the cache held every output for `key`. Nothing is copied on a miss.
+    """
+    entry_dir = os.path.join(cache_dir, stage_name, key)
+    cached_paths = [os.path.join(entry_dir, _cache_name(path)) for path in output_paths]
+    if not all(os.path.isfile(path) for path in cached_paths):
+        return False
+    for cached_path, path in zip(cached_paths, output_paths):
+        if os.path.isfile(path) and hash_file(path) == hash_file(cached_path):
+            continue
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy2(cached_path, path)
+    return True
+
+
+def store_stage(cache_dir, stage_name, key, output_paths):
+    """Copy the outputs of a finished stage into the cache under `key`."""
+    entry_dir = os.path.join(cache_dir, stage_name, key)
+    partial_dir = entry_dir + ".tmp"
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    os.makedirs(partial_dir)
+    for path in output_paths:
+        shutil.copy2(path, os.path.join(partial_dir, _cache_name(path)))
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(partial_dir, entry_dir)
+
+
+def _cache_name(path):
+    """Flatten an output path into a file name, keeping outputs with equal base names apart."""
+    return os.path.normpath(path).replace(os.sep, "__")
@@ -1,117 +1,232 @@
-import logging
 import json
+import hashlib
+import numpy as np
 import pandas as pd
-import pandera as pa
-from src.create_dir_and_file_if_not_exist import create_dir_and_file_if_not_exist
+from src.validation_cache import validation_cache_key, hash_frame, read_cached_result, write_cached_result
+from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
 
 
-def validate_df(adult_income_dataframe):
+# Allowed values of the categorical columns, in the order of the adult.names file
+CATEGORIES = {
+    "workclass": [
+        "Private", "Self-emp-not-inc", "Self-emp-inc", "Federal-gov",
+        "Local-gov", "State-gov", "Without-pay", "Never-worked"
+    ],
+    "education": [
+        "Bachelors", "Some-college", "11th", "HS-grad", "Prof-school",
+        "Assoc-acdm", "Assoc-voc", "9th", "7th-8th", "12th", "Masters",
+        "1st-4th", "10th", "Doctorate", "5th-6th", "Preschool"
+    ],
+    "marital-status": [
+        "Married-civ-spouse", "Divorced", "Never-married", "Separated",
+        "Widowed", "Married-spouse-absent", "Married-AF-spouse"
+    ],
+    "occupation": [
+        "Tech-support", "Craft-repair", "Other-service", "Sales",
+        "Exec-managerial", "Prof-specialty", "Handlers-cleaners",
+        "Machine-op-inspct", "Adm-clerical", "Farming-fishing",
+        "Transport-moving", "Priv-house-serv", "Protective-serv",
+        "Armed-Forces"
+    ],
+    "relationship": [
+        "Wife", "Own-child", "Husband", "Not-in-family",
+        "Other-relative", "Unmarried"
+    ],
+    "race": [
+        "White", "Asian-Pac-Islander", "Amer-Indian-Eskimo",
+        "Other", "Black"
+    ],
+    "sex": ["Female", "Male"],
+    "native-country": [
+        "United-States", "Cambodia", "England", "Puerto-Rico", "Canada",
+        "Germany", "Outlying-US(Guam-USVI-etc)", "India", "Japan",
+        "Greece", "South", "China", "Cuba", "Iran", "Honduras",
+        "Philippines", "Italy", "Poland", "Jamaica", "Vietnam",
+        "Mexico", "Portugal", "Ireland", "France",
+        "Dominican-Republic", "Laos", "Ecuador", "Taiwan",
+        "Haiti", "Columbia", "Hungary", "Guatemala", "Nicaragua",
+        "Scotland", "Thailand", "Yugoslavia", "El-Salvador",
+        "Trinadad&Tobago", "Peru", "Hong", "Holand-Netherlands"
+    ],
+    "income": [">50K", "<=50K"],
+}
+
+# Inclusive bounds of the integer columns, None where any integer is allowed
+INTEGER_RANGES = {
+    "age": (0, 120),
+    "fnlwgt": None,
+    "education-num": (0, 50),
+    "capital-gain": None,
+    "capital-loss": None,
+    "hours-per-week": (0, 120),
+}
+
+# Column order of the raw adult.data file
+COLUMNS = [
+    'age', 'workclass', 'fnlwgt', 'education', 'education-num',
+    'marital-status', 'occupation', 'relationship', 'race', 'sex',
+    'capital-gain', 'capital-loss', 'hours-per-week', 'native-country', 'income'
+]
+
+# Bump when the checks change meaning, to invalidate cached validation results
+SCHEMA_VERSION = 1
+
+# Identifies the schema in cache keys, changing whenever the allowed values do
+SCHEMA_KEY = hashlib.sha256(
+    json.dumps([SCHEMA_VERSION, COLUMNS, CATEGORIES, INTEGER_RANGES]).encode()
+).hexdigest()
+
+
+def validate_df(adult_income_dataframe, return_report=False, cache_dir=None, error_sink=None, fingerprint=False):
     """
     Validates the adult income dataframe.
 
+    Every check is a vectorized operation over a whole column, and the results are
+    combined into a single boolean row mask. Rows failing any check are dropped,
+    along with duplicate and empty rows. Only the number of failing rows per check
+    is kept, and an `error_sink` keeps a bounded sample of the failing rows.
+    Duplicates are found by hashing every row once into a 64-bit fingerprint,
+    from the values of the schema columns rather than from any fingerprints the
+    frame carries, which may no longer match rows edited since.
+
     Parameters
     ----------
     adult_income_dataframe : pandas.DataFrame
-        The DataFrame containing adult income dataframe with the columns: 
+        The DataFrame containing adult income dataframe with the columns:
         'age', 'workclass', 'fnlwgt', 'education', 'education-num',
         'marital-status', 'occupation', 'relationship', 'race', 'sex',
         'capital-gain', 'capital-loss', 'hours-per-week', 'native-country', 'income'.
+    return_report : bool, optional
+        Whether to also return the number of rows failing each check.
+    cache_dir : str, optional
+        Directory of a persistent cache of validation results, keyed by a content
+        hash of the DataFrame and the schema. An unchanged DataFrame returns the
+        cached result without being validated again.
+    error_sink : ErrorSink, optional
+        Sink the failures are added to, with examples of failing rows. Cached
+        results add nothing to it.
+    fingerprint : bool, optional
+        Whether to add the fingerprints of the validated rows in a uint64 column
+        called FINGERPRINT_COLUMN, so the steps after validation, such as the
+        deduplication across chunks and files and the fingerprint split, reuse
+        them instead of hashing the rows again. A FINGERPRINT_COLUMN the frame
+        already has is always recomputed.
 
     Returns
     -------
     pandas.DataFrame
         The validated DataFrame that conforms to the specified schema.
+    pandas.DataFrame
+        Only when `return_report` is True. One row per check with the columns
+        'column', 'check' and 'failure_count'.
+
+    Raises
+    ------
+    ValueError
+        If a column of the schema is missing from the DataFrame.
     """
-    
-    # Setup validation_errors.log file
-    validation_error_log_dir = create_dir_and_file_if_not_exist("data/logs", "validation_errors.log")
-    logging.basicConfig(
-        filename=validation_error_log_dir,
-        filemode="w",
-        format="%(asctime)s - %(message)s",
-        level=logging.INFO,
-    )
+    missing_columns = [column for column in COLUMNS if column not in adult_income_dataframe.columns]
+    if missing_columns:
+        raise ValueError(f"The DataFrame is missing the columns: {missing_columns}")
 
-    # schema
-    schema = pa.DataFrameSchema(
-        {
-            "age": pa.Column(int, pa.Check.between(0, 120), nullable=True),
-            "workclass": pa.Column(str, pa.Check.isin([
-                "Private", "Self-emp-not-inc", "Self-emp-inc", "Federal-gov",
-                "Local-gov", "State-gov", "Without-pay", "Never-worked"
-            ]), nullable=True),
-            "fnlwgt": pa.Column(int, nullable=True),
-            "education": pa.Column(str, pa.Check.isin([
-                "Bachelors", "Some-college", "11th", "HS-grad", "Prof-school",
-                "Assoc-acdm", "Assoc-voc", "9th", "7th-8th", "12th", "Masters",
-                "1st-4th", "10th", "Doctorate", "5th-6th", "Preschool"
-            ]), nullable=True),
-            "education-num": pa.Column(int, pa.Check.between(0, 50), nullable=True),
-            "marital-status": pa.Column(str, pa.Check.isin([
-                "Married-civ-spouse", "Divorced", "Never-married", "Separated",
-                "Widowed", "Married-spouse-absent", "Married-AF-spouse"
-            ]), nullable=True),
-            "occupation": pa.Column(str, pa.Check.isin([
-                "Tech-support", "Craft-repair", "Other-service", "Sales", 
-                "Exec-managerial", "Prof-specialty", "Handlers-cleaners", 
-                "Machine-op-inspct", "Adm-clerical", "Farming-fishing", 
-                "Transport-moving", "Priv-house-serv", "Protective-serv", 
-                "Armed-Forces"
-            ]), nullable=True),
-            "relationship": pa.Column(str, pa.Check.isin([
-                "Wife", "Own-child", "Husband", "Not-in-family", 
-                "Other-relative", "Unmarried"
-            ]), nullable=True),
-            "race": pa.Column(str, pa.Check.isin([
-                "White", "Asian-Pac-Islander", "Amer-Indian-Eskimo", 
-                "Other", "Black"
-            ]), nullable=True),
-            "sex": pa.Column(str, pa.Check.isin(["Female", "Male"]), nullable=True),
-            "capital-gain": pa.Column(int, nullable=True),
-            "capital-loss": pa.Column(int, nullable=True),
-            "hours-per-week": pa.Column(int, pa.Check.between(0, 120), nullable=True),
-            "native-country": pa.Column(str, pa.Check.isin([
-                "United-States", "Cambodia", "England", "Puerto-Rico", "Canada", 
-                "Germany", "Outlying-US(Guam-USVI-etc)", "India", "Japan", 
-                "Greece", "South", "China", "Cuba", "Iran", "Honduras", 
-                "Philippines", "Italy", "Poland", "Jamaica", "Vietnam", 
-                "Mexico", "Portugal", "Ireland", "France", 
-                "Dominican-Republic", "Laos", "Ecuador", "Taiwan", 
-                "Haiti", "Columbia", "Hungary", "Guatemala", "Nicaragua", 
-                "Scotland", "Thailand", "Yugoslavia", "El-Salvador", 
-                "Trinadad&Tobago", "Peru", "Hong", "Holand-Netherlands"
-            ]), nullable=True),
-            "income": pa.Column(str, pa.Check.isin([">50K", "<=50K"]), nullable=True)
-        },
-        checks=[
-            pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
-            pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found."),
-        ],
-    )
- 
-    # Initialize error cases DataFrame
-    error_cases = pd.DataFrame()
+    if cache_dir is not None:
+        key = validation_cache_key(SCHEMA_KEY, hash_frame(adult_income_dataframe), *(["fingerprint"] if fingerprint else []))
+        cached = read_cached_result(cache_dir, key)
+        if cached is None:
+            cached = validate_df(adult_income_dataframe, return_report=True, fingerprint=fingerprint)
+            write_cached_result(cache_dir, key, *cached)
+        return cached if return_report else cached[0]
+
+    # Compare string values without the leading spaces of the raw file
     data = adult_income_dataframe.copy()
+    for column in CATEGORIES:
+        if pd.api.types.is_object_dtype(data[column]):
+            data[column] = data[column].str.strip()
+
+    # Build one row mask from all column checks
+    invalid = np.zeros(len(data), dtype=bool)
+    failures = []
+    for column, check, failed in _run_checks(data):
+        invalid |= failed
+        failures.append((column, check, failed))
+
+    empty = data.drop(columns=FINGERPRINT_COLUMN, errors="ignore").isna().all(axis=1).to_numpy()
+    failures.append(("DataFrame", "empty_rows", empty))
+    invalid |= empty
+
+    fingerprints = row_fingerprint(data, COLUMNS)
+    duplicated = np.zeros(len(data), dtype=bool)
+    duplicated[~invalid] = pd.Series(fingerprints[~invalid]).duplicated().to_numpy()
+    failures.append(("DataFrame", "duplicate_rows", duplicated))
+    invalid |= duplicated
+
+    report = pd.DataFrame(
+        [(column, check, int(failed.sum())) for column, check, failed in failures],
+        columns=["column", "check", "failure_count"],
+    )
+    if error_sink is not None:
+        error_sink.add(data, failures)
+
+    # Filter out invalid rows, along with the categories only they used
+    validated_data = data[~invalid].reset_index(drop=True)
+    if fingerprint or FINGERPRINT_COLUMN in validated_data.columns:
+        validated_data[FINGERPRINT_COLUMN] = fingerprints[~invalid]
+    for column in CATEGORIES:
+        if isinstance(validated_data[column].dtype, pd.CategoricalDtype):
+            validated_data[column] = validated_data[column].cat.set_categories(CATEGORIES[column])
+
+    if return_report:
+        return validated_data, report
+    return validated_data
+
+
+def _isin(allowed):
+    """Compile a check flagging values outside `allowed` with a categorical code lookup."""
+    categories = pd.Index(allowed)
+
+    def check(series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Look up the few categories once, then index by code
+            valid_category = np.append(series.cat.categories.isin(categories), True)
+            return ~valid_category[series.cat.codes.to_numpy()]
+        return (categories.get_indexer(series) == -1) & series.notna().to_numpy()
+
+    return check
+
+
+def _integer(series):
+    """Flag values that are not integers."""
+    values = pd.to_numeric(series, errors="coerce")
+    return (series.notna() & (values.isna() | (values % 1 != 0))).to_numpy()
+
+
+def _between(low, high):
+    """Compile a check flagging numbers outside the inclusive range [low, high]."""
+    def check(series):
+        values = pd.to_numeric(series, errors="coerce")
+        return ((values < low) | (values > high)).to_numpy()
+
+    return check
+
+
+def _compile_checks():
+    """Turn the schema into a list of (column, check name, check function)."""
+    checks = []
+    for column in COLUMNS:
+        if column in CATEGORIES:
+            checks.append((column, "isin", _isin(CATEGORIES[column])))
+        else:
+            checks.append((column, "integer", _integer))
+            if INTEGER_RANGES[column] is not None:
+                low, high = INTEGER_RANGES[column]
+                checks.append((column, f"between({low}, {high})", _between(low, high)))
+    return checks
+
+
+_CHECKS = _compile_checks()
+
 
-    # Validate data and handle errors
-    try:
-        validated_data = schema.validate(data, lazy=True)
-    except pa.errors.SchemaErrors as e:
-        error_cases = e.failure_cases
-
-        # Convert the error message to a JSON string
-        error_message = json.dumps(e.message, indent=2)
-        logging.error("\n" + error_message)
-
-    # Filter out invalid rows based on the error cases
-    if not error_cases.empty:
-        invalid_indices = error_cases["index"].dropna().unique()
-        validated_data = data
-        validated_data.drop(index=invalid_indices)
-        validated_data = validated_data.reset_index(drop=True)
-        validated_data = validated_data.drop_duplicates()
-        validated_data = validated_data.dropna(how="all")
-    else:
-        validated_data = data
-
-    return validated_data
\ No newline at end of file
+def _run_checks(data):
+    """Yield (column, check name, failed row mask) for every check of the schema."""
+    for column, check, check_function in _CHECKS:
+        yield column, check, check_function(data[column])
@@ -0,0 +1,53 @@
+from src.fingerprint_index import FingerprintIndex
+from src.row_fingerprint import FINGERPRINT_COLUMN
+from src.validate_df import validate_df
+
+
+def validate_df_iter(adult_income_chunks, seen=None, error_sink=None, fingerprint=False):
+    """
+    Validates the adult income dataframe one chunk at a time.
+
+    Each chunk is validated with `validate_df`. Duplicates of rows from earlier
+    chunks are found with a `FingerprintIndex` of 64-bit row fingerprints, which
+    takes 8 bytes per clean row instead of the rows themselves, and to which each
+    chunk adds a sorted run rather than re-sorting the rows seen so far.
+
+    Parameters
+    ----------
+    adult_income_chunks : iterable of pandas.DataFrame
+        Chunks of the adult income dataframe, for example from
+        `pandas.read_csv(..., chunksize=...)`.
+    seen : FingerprintIndex or numpy.ndarray, optional
+        Fingerprints of rows validated before, such as by an earlier run over the
+        start of the same file, as an index or a sorted uint64 array. Their
+        duplicates are dropped too. An index is updated in place with the
+        fingerprints of the validated rows.
+    error_sink : ErrorSink, optional
+        Sink the failures of every chunk are added to.
+    fingerprint : bool, optional
+        Whether to keep the fingerprints of the validated rows in FINGERPRINT_COLUMN.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The validated rows of the chunk.
+    pandas.DataFrame
+        The report of `validate_df` for the chunk, with duplicates of rows from
+        earlier chunks added to the 'duplicate_rows' check.
+    """
+    if not isinstance(seen, FingerprintIndex):
+        seen = FingerprintIndex([] if seen is None else [seen])
+    for chunk in adult_income_chunks:
+        validated_chunk, report = validate_df(chunk, return_report=True, error_sink=error_sink, fingerprint=True)
+
+        fingerprints = validated_chunk[FINGERPRINT_COLUMN].to_numpy()
+        if not fingerprint:
+            validated_chunk = validated_chunk.drop(columns=FINGERPRINT_COLUMN)
+        duplicated = seen.contains(fingerprints)
+        seen.add(fingerprints[~duplicated])
+        if error_sink is not None:
+            error_sink.add(validated_chunk, [("DataFrame", "duplicate_rows", duplicated)])
+
+        is_duplicate_check = report["check"] == "duplicate_rows"
+        report.loc[is_duplicate_check, "failure_count"] += int(duplicated.sum())
+        yield validated_chunk[~duplicated].reset_index(drop=True), report
@@ -1,16 +1,30 @@
 import os
+import zipfile
 
 
-def validate_raw_file(raw_dir):
+def validate_raw_file(raw_dir, member=None):
     """
     Validates the raw file.
 
     Parameters
     ----------
     raw file: str
-        The directory to the raw file being validated.
+        The directory to the raw file being validated, or to the ZIP archive
+        holding it when `member` is given.
+    member: str, optional
+        Name of the raw file inside the ZIP archive at `raw_dir`.
+
+    Both the training file, adult.data, and the test file, adult.test, of the
+    dataset are raw files.
     """
     if not os.path.exists(raw_dir):
         raise FileNotFoundError(f"Unable to find raw file in {raw_dir}. Please check the download step.")
-    if not raw_dir.endswith('.data'):
-        raise ValueError(f"{raw_dir} is not a DATA file. Please ensure the correct file format.")
\ No newline at end of file
+    if member is not None:
+        if not zipfile.is_zipfile(raw_dir):
+            raise ValueError(f"{raw_dir} is not a ZIP file. Please ensure the correct file format.")
+        with zipfile.ZipFile(raw_dir, 'r') as zip_ref:
+            if member not in zip_ref.namelist():
+                raise FileNotFoundError(f"Unable to find {member} in {raw_dir}. Please check the download step.")
+        raw_dir = member
+    if not raw_dir.endswith(('.data', '.test')):
+        raise ValueError(f"{raw_dir} is not a DATA file. Please ensure the correct file format.")
@@ -0,0 +1,199 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+
+def validate_training_data(
+    train_df,
+    label="income",
+    class_ratio_less_than=0.4,
+    pps_less_than=0.9,
+    correlation_threshold=0.8,
+    max_correlated_pairs=3,
+    sample_size=None,
+    random_state=522,
+    n_bins=10,
+    n_folds=4):
+    """
+    Validate the training data with the conditions of the deepchecks checks
+    ClassImbalance, FeatureLabelCorrelation and FeatureFeatureCorrelation.
+
+    Every statistic is computed from contingency tables of the integer codes of
+    the features, so each feature is read only once and no model is fitted.
+    Numeric features with more than `n_bins` distinct values are first cut into
+    at most `n_bins` quantile bins, the splits a shallow decision tree would
+    consider, and other features are categorical. Missing values count as a category of
+    their own.
+
+    - Class imbalance: the ratio of the least to the most frequent label must be
+      less than `class_ratio_less_than`, the condition of deepchecks'
+      `add_condition_class_ratio_less_than`.
+    - Feature-label correlation: the predictive power score of every feature must
+      be less than `pps_less_than`. As in ppscore, it is the weighted F1 score of
+      predicting the label from the feature, cross-validated over `n_folds` folds
+      and normalized by the better of two naive baselines, the most common label
+      and a random shuffle of the labels. Each held-out row is predicted as the
+      most frequent label of its category in the other folds, or as their most
+      common label for a category they do not have, so a near-unique feature
+      without signal scores close to 0 rather than 1.
+    - Feature-feature correlation: no more than `max_correlated_pairs` pairs of
+      features may have a symmetric Theil's U, the normalized mutual information
+      deepchecks uses for categorical features, above `correlation_threshold`.
+
+    Parameters:
+    ----------
+    train_df : pandas.DataFrame
+        The training data, with the features and the label.
+    label : str, optional
+        Name of the label column, 'income' by default.
+    class_ratio_less_than : float, optional
+        Upper bound of the ratio of the least to the most frequent label.
+    pps_less_than : float, optional
+        Upper bound of the predictive power score of each feature.
+    correlation_threshold : float, optional
+        Correlation above which a pair of features counts as correlated.
+    max_correlated_pairs : int, optional
+        Number of correlated pairs of features allowed.
+    sample_size : int, optional
+        Number of rows to validate, sampled without replacement with
+        `random_state`. All rows are used when it is None or at least the number
+        of rows.
+    random_state : int, optional
+        Seed of the sample and of the cross-validation folds.
+    n_bins : int, optional
+        Largest number of quantile bins of numeric features with more distinct values.
+    n_folds : int, optional
+        Number of cross-validation folds of the predictive power score.
+
+    Returns:
+    -------
+    dict
+        'class_ratio', the ratio of the least to the most frequent label,
+        'pps', a pandas.Series of the predictive power score of each feature, and
+        'correlated_pairs', a list of (feature, feature, correlation) above the
+        threshold.
+
+    Raises:
+    ------
+    ValueError
+        If any of the three conditions does not hold.
+    """
+    if sample_size is not None and sample_size < len(train_df):
+        train_df = train_df.sample(n=sample_size, random_state=random_state)
+
+    features = [column for column in train_df.columns if column != label]
+    codes = {column: _codes(train_df[column], n_bins) for column in features}
+    codes[label] = _codes(train_df[label], None)
+    folds = np.random.default_rng(random_state).permutation(len(train_df)) % n_folds
+
+    # Class imbalance
+    label_counts = np.bincount(codes[label][0])
+    label_counts = label_counts[label_counts > 0]
+    class_ratio = label_counts.min() / label_counts.max()
+    if class_ratio >= class_ratio_less_than:
+        raise ValueError("Class imbalance check failed: Target classes do not meet the required distribution.")
+
+    # Feature-label correlation
+    pps = pd.Series(
+        [_pps(_fold_contingency_tables(codes[feature], codes[label], folds, n_folds)) for feature in features],
+        index=features,
+        dtype=float,
+    )
+    if (pps >= pps_less_than).any():
+        raise ValueError("Feature-Label correlation check failed: One or more features exceed the correlation threshold.")
+
+    # Feature-feature correlation
+    correlated_pairs = []
+    for feature_1, feature_2 in itertools.combinations(features, 2):
+        correlation = _symmetric_theil_u(_contingency_table(codes[feature_1], codes[feature_2]))
+        if correlation > correlation_threshold:
+            correlated_pairs.append((feature_1, feature_2, correlation))
+    if len(correlated_pairs) > max_correlated_pairs:
+        raise ValueError("Feature-Feature correlation check failed: Too many highly correlated feature pairs.")
+
+    return {"class_ratio": class_ratio, "pps": pps, "correlated_pairs": correlated_pairs}
+
+
+def _codes(series, n_bins):
+    """Return the integer codes of a column, with missing values as code 0, and their number."""
+    if (n_bins is not None and pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+            and series.nunique() > n_bins):
+        # Quantile bins, each closed by a value repeated across quantiles, such as the zeros of capital-gain
+        values = series.to_numpy(dtype=np.float64)
+        edges = np.unique(np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        codes = np.digitize(values, edges, right=True) + 1
+        codes[np.isnan(values)] = 0
+        return codes, len(edges) + 2
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        n_codes = len(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series)
+        n_codes = len(uniques)
+    return codes + 1, n_codes + 1
+
+
+def _contingency_table(x, y):
+    """Count every pair of codes of two columns with a single bincount."""
+    (x_codes, n_x), (y_codes, n_y) = x, y
+    counts = np.bincount(x_codes * n_y + y_codes, minlength=n_x * n_y).reshape(n_x, n_y)
+    return counts[counts.sum(axis=1) > 0][:, counts.sum(axis=0) > 0]
+
+
+def _fold_contingency_tables(x, y, folds, n_folds):
+    """Count every pair of codes of two columns in each fold, as an array of shape (n_folds, n_x, n_y)."""
+    (x_codes, n_x), (y_codes, n_y) = x, y
+    counts = np.bincount((folds * n_x + x_codes) * n_y + y_codes, minlength=n_folds * n_x * n_y)
+    return counts.reshape(n_folds, n_x, n_y)
+
+
+def _weighted_f1(confusion):
+    """Weighted F1 score of the predictions counted in `confusion[true label, predicted label]`."""
+    support = confusion.sum(axis=1)
+    denominator = confusion.sum(axis=0) + support
+    f1 = np.divide(2 * np.diag(confusion), denominator, out=np.zeros(len(support)), where=denominator > 0)
+    return float((f1 * support).sum() / support.sum())
+
+
+def _pps(fold_counts):
+    """Cross-validated predictive power score of the label from a feature, given its contingency table per fold."""
+    counts = fold_counts.sum(axis=0)
+    support = counts.sum(axis=0)
+    proportions = support / support.sum()
+
+    # Predict the held-out rows of each fold from the most frequent label of their category in the other folds
+    confusion = np.zeros((len(support), len(support)))
+    for held_out in fold_counts:
+        training = counts - held_out
+        predicted = np.where(training.sum(axis=1) > 0, training.argmax(axis=1), training.sum(axis=0).argmax())
+        np.add.at(confusion.T, predicted, held_out)
+    model_f1 = _weighted_f1(confusion)
+
+    # Predict the most common label for all rows
+    most_common = np.zeros_like(confusion)
+    most_common[:, support.argmax()] = support
+    most_common_f1 = _weighted_f1(most_common)
+
+    # A random shuffle of the labels has an expected precision and recall of each label's proportion
+    random_f1 = float((proportions ** 2).sum())
+
+    baseline_f1 = max(most_common_f1, random_f1)
+    if model_f1 < baseline_f1 or baseline_f1 == 1:
+        return 0.0
+    return (model_f1 - baseline_f1) / (1 - baseline_f1)
+
+
+def _entropy(counts):
+    """Entropy of the distribution given by counts, in nats."""
+    p = counts[counts > 0] / counts.sum()
+    return float(-(p * np.log(p)).sum())
+
+
+def _symmetric_theil_u(counts):
+    """Symmetric Theil's U of two features, given their contingency table."""
+    h_x = _entropy(counts.sum(axis=1))
+    h_y = _entropy(counts.sum(axis=0))
+    if h_x + h_y == 0:
+        return 1.0
+    mutual_information = h_x + h_y - _entropy(counts.ravel())
+    return 2 * mutual_information / (h_x + h_y)
@@ -0,0 +1,95 @@
+import os
+import json
+import pickle
+import hashlib
+import numpy as np
+
+
+def validation_cache_key(*parts):
+    """
+    Build the key of a cached validation result.
+
+    Parameters
+    ----------
+    *parts : str
+        The schema key of `validate_df`, followed by the content hashes and
+        options that identify the validated input.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 key.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode() + b"\0")
+    return digest.hexdigest()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Compute the SHA-256 checksum of a file without reading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_frame(adult_income_dataframe):
+    """Compute a content hash of a DataFrame from its columns, dtypes and the fingerprints of its values."""
+    # Imported here so that hashing files does not load numpy and pandas
+    from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
+
+    # Carried fingerprints may be stale, so only the values make up the key
+    adult_income_dataframe = adult_income_dataframe.drop(columns=FINGERPRINT_COLUMN, errors="ignore")
+
+    columns = [(str(column), str(dtype)) for column, dtype in adult_income_dataframe.dtypes.items()]
+    digest = hashlib.sha256(json.dumps(columns).encode())
+    digest.update(row_fingerprint(adult_income_dataframe).tobytes())
+    return digest.hexdigest()
+
+
+def hash_rows(adult_income_dataframe, fingerprints=None):
+    """
+    Compute a content hash of a DataFrame from its column names and the fingerprints of its rows.
+
+    Unlike `hash_frame`, the dtypes are left out and the values are hashed as
+    `row_fingerprint` does, so the same rows get the same hash whether they were
+    validated in memory or read back from a CSV, Parquet or Feather file.
+
+    `fingerprints`, such as those `validate_df` carried with the rows, are
+    hashed instead of the rows when given, and must be the `row_fingerprint`
+    of all the columns hashed.
+    """
+    from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
+
+    adult_income_dataframe = adult_income_dataframe.drop(columns=FINGERPRINT_COLUMN, errors="ignore")
+    if fingerprints is None:
+        fingerprints = row_fingerprint(adult_income_dataframe)
+    digest = hashlib.sha256(json.dumps([str(column) for column in adult_income_dataframe.columns]).encode())
+    digest.update(np.asarray(fingerprints, dtype=np.uint64).tobytes())
+    return digest.hexdigest()
+
+
+def cache_path(cache_dir, key, filename):
+    """Return the path of `filename` in the cache entry `key`, creating the entry's directory."""
+    entry_dir = os.path.join(cache_dir, key[:2], key)
+    os.makedirs(entry_dir, exist_ok=True)
+    return os.path.join(entry_dir, filename)
+
+
+def read_cached_result(cache_dir, key):
+    """Return the cached (validated DataFrame, report) for `key`, or None on a miss."""
+    path = os.path.join(cache_dir, key[:2], key, "result.pickle")
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def write_cached_result(cache_dir, key, validated_data, report):
+    """Store the validated DataFrame and report under `key`."""
+    path = cache_path(cache_dir, key, "result.pickle")
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump((validated_data, report), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
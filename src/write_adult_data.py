@@ -0,0 +1,109 @@
+import os
+import pandas as pd
+from src.data_format import data_format
+from src.row_fingerprint import FINGERPRINT_COLUMN
+from src.validate_df import INTEGER_RANGES, CATEGORIES, COLUMNS
+
+
+def write_adult_data(adult_data, path, append=False, columns=None):
+    """
+    Write adult income data to a CSV, Parquet or Feather file.
+
+    The format follows the extension of `path`, as in `read_adult_data`. Parquet
+    and Feather keep the compact dtypes, so nothing needs to be parsed again when
+    the file is read back.
+
+    Parameters
+    ----------
+    adult_data : pandas.DataFrame, pandas.Series or iterable of pandas.DataFrame
+        The data to write. An iterable of chunks is written one chunk at a time
+        and never held in memory as a whole.
+    path : str
+        Path of the file to write.
+    append : bool, optional
+        Whether to append the rows to an existing CSV file, without writing
+        its header again. Parquet and Feather files cannot be appended to.
+    columns : list of str, optional
+        Columns of the file written when an iterable yields no chunk at all, so
+        that a file with only a header, or an empty table, is still written.
+        Defaults to the columns of the adult income dataframe.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+
+    Raises
+    ------
+    ValueError
+        If `append` is True and `path` is not a CSV file.
+    """
+    if isinstance(adult_data, pd.Series):
+        adult_data = adult_data.to_frame()
+    if isinstance(adult_data, pd.DataFrame):
+        adult_data = [adult_data]
+
+    file_format = data_format(path)
+    if append and file_format != "csv":
+        raise ValueError(f"Only CSV files can be appended to, not {path}.")
+
+    n_rows = 0
+    mode = "a" if append else "w"
+    header = not (append and os.path.isfile(path) and os.path.getsize(path) > 0)
+    writer = schema = None
+    try:
+        for chunk in adult_data:
+            if file_format == "csv":
+                chunk.to_csv(path, index=False, mode=mode, header=header)
+                mode, header = "a", False
+            else:
+                table = _arrow_table(chunk, schema)
+                if writer is None:
+                    schema = table.schema
+                    writer = _arrow_writer(path, file_format, schema)
+                writer.write_table(table)
+            n_rows += len(chunk)
+
+        # Later stages expect the file even when every row was dropped
+        if header and writer is None:
+            empty = _empty_frame(COLUMNS if columns is None else columns)
+            if file_format == "csv":
+                empty.to_csv(path, index=False, mode=mode)
+            else:
+                table = _arrow_table(empty, None)
+                writer = _arrow_writer(path, file_format, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+def _empty_frame(columns):
+    """Return a DataFrame without rows, with the dtypes of the schema so that columnar files keep their types."""
+    dtypes = {column: pd.CategoricalDtype(CATEGORIES[column]) for column in columns if column in CATEGORIES}
+    dtypes.update({column: "Int64" for column in columns if column in INTEGER_RANGES})
+    if FINGERPRINT_COLUMN in columns:
+        dtypes[FINGERPRINT_COLUMN] = "uint64"
+    return pd.DataFrame(columns=columns).astype(dtypes)
+
+
+def _arrow_table(chunk, schema):
+    """Convert a chunk to an Arrow table matching the schema of earlier chunks."""
+    import pyarrow
+
+    # Integer columns may have been downcast differently, or be float with
+    # missing values, so store them all as nullable 64-bit integers
+    chunk = chunk.reset_index(drop=True).astype(
+        {column: "Int64" for column in chunk.columns if column in INTEGER_RANGES}
+    )
+    return pyarrow.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def _arrow_writer(path, file_format, schema):
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    if file_format == "parquet":
+        return pyarrow.parquet.ParquetWriter(path, schema)
+    return pyarrow.ipc.new_file(path, schema)
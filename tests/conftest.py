@@ -1,6 +1,12 @@
 # Note: This teardown test data code was adapted from: 
 # https://github.com/ttimbers/breast-cancer-predictor/blob/3.0.0/tests/conftest.py
 
+import os
+import time
+import hashlib
+import functools
+import threading
+import http.server
 import pytest
 import shutil
 
@@ -22,4 +28,72 @@ def cleanup_directories_at_end_of_session():
         try:
             shutil.rmtree(directory)
         except FileNotFoundError:
-            pass  # Directory doesn't exist, continue
\ No newline at end of file
+            pass  # Directory doesn't exist, continue
+
+class _RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler with the ETag, Last-Modified and Range support of a real mirror."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        time.sleep(self.server.delay)
+        super().do_HEAD()
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        self.server.requests_log.append((self.path, dict(self.headers)))
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        last_modified = self.date_time_string(int(os.path.getmtime(path)))
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', etag) in (etag, last_modified):
+            start = int(range_header.removeprefix('bytes=').split('-')[0])
+        if start:
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body) - start))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+
+def _serve(delay):
+    """Serve `tests/data` over HTTP on localhost, answering every request after `delay` seconds."""
+    handler = functools.partial(_RangeRequestHandler, directory='tests/data')
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.requests_log = []
+    server.delay = delay
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Serve `tests/data` over HTTP on localhost, recording the requests it receives."""
+    yield from _serve(delay=0)
+
+
+@pytest.fixture
+def slow_http_server():
+    """Serve `tests/data` like `http_server`, but half a second slower to answer each request."""
+    yield from _serve(delay=0.5)
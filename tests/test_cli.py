@@ -0,0 +1,43 @@
+# test_cli.py
+
+import sys
+import os
+import subprocess
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from scripts.cli import cli, COMMANDS
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+# TESTS
+
+# Test 1: --help lists every subcommand
+def test_cli_help_lists_commands():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name in COMMANDS:
+        assert name in result.output
+
+# Test 2: A subcommand runs the main command of its script
+def test_cli_subcommand_help():
+    result = CliRunner().invoke(cli, ["train", "--help"])
+    assert result.exit_code == 0
+    assert "--random_seed" in result.output
+
+# Test 3: Unknown subcommands are rejected
+def test_cli_unknown_command():
+    result = CliRunner().invoke(cli, ["fit"])
+    assert result.exit_code != 0
+    assert "No such command" in result.output
+
+# Test 4: Neither the CLI nor the --help of a subcommand imports the heavy libraries
+def test_cli_help_does_not_import_heavy_libraries():
+    for command in COMMANDS:
+        code = (
+            "import sys, runpy; sys.argv = ['cli.py', %r, '--help']\n"
+            "try:\n    runpy.run_path('scripts/cli.py', run_name='__main__')\n"
+            "except SystemExit:\n    pass\n"
+            "print(sorted({'pandas', 'sklearn', 'altair', 'matplotlib', 'requests'} & set(sys.modules)))" % command
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+        assert result.stdout.strip().splitlines()[-1] == "[]", command
@@ -0,0 +1,33 @@
+# test_count_by_income.py
+
+import sys
+import os
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.count_by_income import count_by_income
+
+# SETUP
+
+test_df = pd.DataFrame({
+    "sex": ["Male", "Female", "Male", "Male"],
+    "race": ["White", "White", "Black", "White"],
+    "income": [">50K", "<=50K", "<=50K", ">50K"]
+})
+
+# TESTS
+
+# Test 1: Counts match a groupby of each column on its own
+def test_count_by_income_matches_groupby():
+    counts = count_by_income(test_df, ["sex", "race"])
+    assert set(counts) == {"sex", "race"}
+    for column in ["sex", "race"]:
+        expected = test_df.groupby([column, "income"]).size().rename("count").reset_index()
+        pd.testing.assert_frame_equal(counts[column], expected)
+
+# Test 2: Categorical columns only keep the pairs that occur
+def test_count_by_income_categorical():
+    categorical = test_df.astype("category")
+    categorical["race"] = categorical["race"].cat.add_categories(["Other"])
+    counts = count_by_income(categorical, ["sex", "race"])
+    assert len(counts["race"]) == 3
+    assert counts["race"]["count"].sum() == len(test_df)
@@ -0,0 +1,78 @@
+# test_download_archives.py
+
+import sys
+import os
+import pytest
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.download_archives import download_archives
+from scripts.download_data import main as download_data
+
+# SETUP
+
+# Nothing listens on port 1, so connecting to it fails at once
+dead_mirror = 'http://127.0.0.1:1'
+
+def downloaded_paths(http_server):
+    return [path for path, _ in http_server.requests_log]
+
+# TESTS
+
+# Test 1: Several archives are downloaded and extracted
+def test_download_archives(http_server, tmp_path):
+    urls = [f"{http_server.url}/files_txt_csv.zip", f"{http_server.url}/files_csv.zip"]
+    sources = download_archives(urls, str(tmp_path), n_jobs=2)
+    assert sources == {'files_txt_csv.zip': urls[0], 'files_csv.zip': urls[1]}
+    for file in ['test1.txt', 'test2.csv', 'test3.csv']:
+        assert os.path.isfile(tmp_path / file)
+
+# Test 2: Broken mirrors are skipped for a healthy one
+def test_download_archives_mirrors(http_server, tmp_path):
+    good = f"{http_server.url}/files_txt_csv.zip"
+    mirrors = [f"{dead_mirror}/files_txt_csv.zip", f"{http_server.url}/missing/files_txt_csv.zip", good]
+    sources = download_archives([mirrors], str(tmp_path), retries=0)
+    assert sources == {'files_txt_csv.zip': good}
+    assert downloaded_paths(http_server) == ['/files_txt_csv.zip']
+    assert os.path.isfile(tmp_path / 'test1.txt')
+
+# Test 3: An archive no mirror serves raises a ValueError, after the other archives are downloaded
+def test_download_archives_failure(http_server, tmp_path):
+    urls = [f"{http_server.url}/files_csv.zip", [f"{dead_mirror}/missing.zip", f"{http_server.url}/missing.zip"]]
+    with pytest.raises(ValueError, match='Unable to download 1 of 2 archives'):
+        download_archives(urls, str(tmp_path), retries=0)
+    assert os.path.isfile(tmp_path / 'test3.csv')
+
+# Test 4: The script exits with an error instead of only printing it
+def test_download_data_failure(http_server, tmp_path):
+    result = CliRunner().invoke(download_data, ['--url', f"{http_server.url}/missing.zip", '--target_dir', str(tmp_path), '--retries', '0'])
+    assert result.exit_code == 1
+    assert 'Unable to download' in result.output
+
+# Test 5: The archive is downloaded from the fastest mirror only
+def test_download_archives_fastest_mirror(http_server, slow_http_server, tmp_path):
+    mirrors = [f"{slow_http_server.url}/files_txt_csv.zip", f"{http_server.url}/files_txt_csv.zip"]
+    sources = download_archives([mirrors], str(tmp_path))
+    assert sources == {'files_txt_csv.zip': mirrors[1]}
+    assert downloaded_paths(http_server) == ['/files_txt_csv.zip']
+    assert downloaded_paths(slow_http_server) == []
+
+# Test 6: Distinct archives with the same file name, or mirrors with different ones, are rejected
+def test_download_archives_ambiguous_names(http_server, tmp_path):
+    urls = [f"{http_server.url}/us/files_csv.zip", f"{http_server.url}/eu/files_csv.zip"]
+    with pytest.raises(ValueError, match='would both be saved as files_csv.zip'):
+        download_archives(urls, str(tmp_path))
+    with pytest.raises(ValueError, match='same file name'):
+        download_archives([[f"{http_server.url}/files_csv.zip", f"{http_server.url}/files_txt_csv.zip"]], str(tmp_path))
+    assert http_server.requests_log == []
+
+# Test 7: The script adds each --mirror to the --url with the same file name
+def test_download_data_mirrors(http_server, tmp_path):
+    args = ['--url', f"{dead_mirror}/files_txt_csv.zip", '--mirror', f"{http_server.url}/files_txt_csv.zip",
+            '--target_dir', str(tmp_path), '--retries', '0']
+    result = CliRunner().invoke(download_data, args)
+    assert result.exit_code == 0, result.output
+    assert f"files_txt_csv.zip downloaded from {http_server.url}/files_txt_csv.zip" in result.output
+
+    result = CliRunner().invoke(download_data, args + ['--mirror', f"{http_server.url}/other.zip"])
+    assert result.exit_code == 2
+    assert 'no --url ends in' in result.output
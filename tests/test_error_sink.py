@@ -0,0 +1,64 @@
+# test_error_sink.py
+
+import sys
+import os
+import json
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.error_sink import ErrorSink
+
+# SETUP
+
+def batch(start, n_rows):
+    """Rows numbered from `start`, every other one failing a check."""
+    data = pd.DataFrame({"row": np.arange(start, start + n_rows)})
+    return data, [("row", "odd", (data["row"] % 2 == 1).to_numpy()), ("DataFrame", "empty_rows", np.zeros(n_rows, dtype=bool))]
+
+# TESTS
+
+# Test 1: Counts are exact and the sample stays bounded over many batches
+def test_error_sink_bounded():
+    error_sink = ErrorSink(sample_size=5, random_state=0)
+    for start in range(0, 10_000, 100):
+        error_sink.add(*batch(start, 100))
+    assert error_sink.counts == {("row", "odd"): 5_000, ("DataFrame", "empty_rows"): 0}
+    assert error_sink.failing_rows == 5_000
+    assert len(error_sink.examples) == 5
+    assert all(example["failed_checks"] == ["row:odd"] and example["values"]["row"] % 2 == 1 for example in error_sink.examples)
+
+# Test 2: Every failing row is equally likely to be sampled
+def test_error_sink_uniform():
+    sampled = np.zeros(100, dtype=int)
+    for seed in range(500):
+        error_sink = ErrorSink(sample_size=10, random_state=seed)
+        for start in range(0, 200, 20):
+            error_sink.add(*batch(start, 20))
+        for example in error_sink.examples:
+            sampled[example["values"]["row"] // 2] += 1
+    # Each of the 100 failing rows is expected in 10% of the 500 samples
+    assert sampled.sum() == 5_000
+    assert sampled[:50].sum() / sampled.sum() > 0.45 and sampled[50:].sum() / sampled.sum() > 0.45
+
+# Test 3: Merged sinks add their counts and keep at most one sample
+def test_error_sink_merge():
+    first, second = ErrorSink(sample_size=4, random_state=0), ErrorSink(sample_size=4, random_state=1)
+    first.add(*batch(0, 10))
+    second.add(*batch(10, 4))
+    first.merge(second)
+    assert first.counts[("row", "odd")] == 7
+    assert first.failing_rows == 7
+    assert len(first.examples) == 4
+    assert len({example["values"]["row"] for example in first.examples}) == 4
+
+# Test 4: The counts, a summary and the examples are written as JSON lines
+def test_error_sink_write(tmp_path):
+    error_sink = ErrorSink(sample_size=2, random_state=0)
+    error_sink.add(*batch(0, 10))
+    path = str(tmp_path / "logs" / "validation_errors.jsonl")
+    error_sink.write(path)
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["type"] for record in records] == ["count", "count", "summary", "example", "example"]
+    assert records[0] == {"type": "count", "column": "row", "check": "odd", "failure_count": 5}
+    assert records[2]["failing_rows"] == 5
@@ -0,0 +1,43 @@
+# test_evaluate_predictions.py
+
+import sys
+import os
+import pytest
+import pandas as pd
+from sklearn.metrics import accuracy_score, roc_auc_score, f1_score
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.evaluate_predictions import evaluate_predictions
+
+# SETUP
+
+classes = ["<=50K", ">50K"]
+y_true = pd.Series(["<=50K", ">50K", ">50K", "<=50K", "<=50K", ">50K"])
+predictions = pd.DataFrame({
+    "prediction": ["<=50K", ">50K", "<=50K", "<=50K", ">50K", ">50K"],
+    "proba_<=50K": [0.8, 0.2, 0.6, 0.6, 0.4, 0.0],
+    "proba_>50K": [0.2, 0.8, 0.4, 0.4, 0.6, 1.0],
+})
+
+# TESTS
+
+# Test 1: Label and probability metrics match sklearn
+def test_evaluate_predictions_metrics():
+    metrics, _, _ = evaluate_predictions(y_true, predictions, classes)
+    values = metrics.set_index("metric")["value"]
+    assert values["accuracy"] == pytest.approx(accuracy_score(y_true, predictions["prediction"]))
+    assert values["f1_macro"] == pytest.approx(f1_score(y_true, predictions["prediction"], average="macro"))
+    assert values["roc_auc"] == pytest.approx(roc_auc_score(y_true == ">50K", predictions["proba_>50K"]))
+    assert {"average_precision", "log_loss"} <= set(values.index)
+
+# Test 2: Confusion matrix and per-class report follow the order of the classes
+def test_evaluate_predictions_confusion_matrix():
+    _, matrix, report = evaluate_predictions(y_true, predictions, classes)
+    assert matrix.loc["<=50K"].tolist() == [2, 1]
+    assert matrix.loc[">50K"].tolist() == [1, 2]
+    assert list(report.index) == classes
+    assert report["support"].tolist() == [3, 3]
+
+# Test 3: Probability metrics are left out without probabilities
+def test_evaluate_predictions_without_proba():
+    metrics, _, _ = evaluate_predictions(y_true, predictions[["prediction"]], classes)
+    assert "roc_auc" not in set(metrics["metric"])
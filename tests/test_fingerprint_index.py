@@ -0,0 +1,64 @@
+# test_fingerprint_index.py
+
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fingerprint_index import FingerprintIndex
+
+# SETUP
+
+fingerprints = np.unique(np.random.default_rng(0).integers(0, 2**63, 10_500, dtype=np.uint64))[:10_000]
+np.random.default_rng(1).shuffle(fingerprints)
+
+def filled(batch_size=100):
+    index = FingerprintIndex()
+    for start in range(0, 5_000, batch_size):
+        index.add(fingerprints[start:start + batch_size])
+    return index
+
+# TESTS
+
+# Test 1: Added fingerprints are found, others are not
+def test_contains():
+    index = filled()
+    assert len(index) == 5_000
+    assert index.contains(fingerprints[:5_000]).all()
+    assert not index.contains(fingerprints[5_000:]).any()
+
+# Test 2: Runs are merged so there are only logarithmically many of them
+def test_runs_merged():
+    index = filled(batch_size=10)
+    assert len(index._runs) <= 2 * np.log2(500)
+    sizes = [len(run) for _, run in index._runs]
+    assert all(older > 2 * newer for older, newer in zip(sizes, sizes[1:]))
+    assert all((np.diff(run.astype(np.float64)) > 0).all() for _, run in index._runs)
+
+# Test 3: An index starting from a sorted array finds its fingerprints
+def test_from_array():
+    index = FingerprintIndex([np.sort(fingerprints[:10])])
+    assert index.contains(fingerprints[:20]).tolist() == [True] * 10 + [False] * 10
+    assert not FingerprintIndex().contains(fingerprints[:5]).any()
+
+# Test 4: Saving writes only the new runs and removes the files of merged runs
+def test_save_load(tmp_path):
+    directory = str(tmp_path / "fingerprints")
+    assert len(FingerprintIndex.load(directory)) == 0
+    index = filled()
+    index.save(directory)
+    files = sorted(os.listdir(directory))
+    assert len(files) == len(index._runs)
+
+    loaded = FingerprintIndex.load(directory)
+    assert len(loaded) == 5_000
+    assert loaded.contains(fingerprints[:5_000]).all()
+    mtimes = {name: os.stat(os.path.join(directory, name)).st_mtime_ns for name in files}
+    loaded.add(fingerprints[5_000:5_001])
+    loaded.save(directory)
+    assert {name: os.stat(os.path.join(directory, name)).st_mtime_ns for name in files} == mtimes
+    assert len(os.listdir(directory)) == len(files) + 1
+
+    loaded.add(fingerprints[5_001:])
+    loaded.save(directory)
+    assert len(os.listdir(directory)) == len(loaded._runs)
+    assert FingerprintIndex.load(directory).contains(fingerprints).all()
@@ -0,0 +1,32 @@
+# test_fingerprint_split.py
+
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fingerprint_split import fingerprint_split
+
+# SETUP
+
+fingerprints = np.random.default_rng(0).integers(0, 2**63, 10_000, dtype=np.uint64) * np.uint64(2)
+
+# TESTS
+
+# Test 1: About test_size of the rows are in the test split
+def test_fingerprint_split_size():
+    in_test = fingerprint_split(fingerprints, test_size=0.2, random_seed=522)
+    assert in_test.dtype == bool
+    assert abs(in_test.mean() - 0.2) < 0.02
+
+# Test 2: Appended rows do not move earlier rows, and duplicates share a split
+def test_fingerprint_split_stable():
+    in_test = fingerprint_split(fingerprints[:5_000], random_seed=522)
+    grown = fingerprint_split(np.concatenate([fingerprints, fingerprints[:10]]), random_seed=522)
+    assert (grown[:5_000] == in_test).all()
+    assert (grown[-10:] == grown[:10]).all()
+
+# Test 3: The seed chooses a different test split
+def test_fingerprint_split_seed():
+    first = fingerprint_split(fingerprints, random_seed=1)
+    second = fingerprint_split(fingerprints, random_seed=2)
+    assert 0 < (first != second).mean() < 1
@@ -0,0 +1,54 @@
+# test_generate_adult_data.py
+
+import sys
+import os
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.generate_adult_data import generate_adult_data
+from src.validate_df import validate_df, COLUMNS
+
+# SETUP
+
+reference = pd.DataFrame({
+    "age": [25, 38, 28, 44],
+    "workclass": ["Private", "Private", "Local-gov", "?"],
+    "fnlwgt": [226802, 89814, 336951, 160323],
+    "education": ["11th", "HS-grad", "Assoc-acdm", "Some-college"],
+    "education-num": [7, 9, 12, 10],
+    "marital-status": ["Never-married", "Married-civ-spouse", "Married-civ-spouse", "Married-civ-spouse"],
+    "occupation": ["Machine-op-inspct", "Farming-fishing", "Protective-serv", "Machine-op-inspct"],
+    "relationship": ["Own-child", "Husband", "Husband", "Husband"],
+    "race": ["Black", "White", "White", "Black"],
+    "sex": ["Male", "Male", "Male", "Male"],
+    "capital-gain": [0, 0, 0, 7688],
+    "capital-loss": [0, 0, 0, 0],
+    "hours-per-week": [40, 50, 40, 40],
+    "native-country": ["United-States", "United-States", "United-States", "United-States"],
+    "income": ["<=50K", "<=50K", ">50K", ">50K"],
+})
+
+# TESTS
+
+# Test 1: Without a reference every generated row passes validation
+def test_generate_adult_data_valid():
+    data = generate_adult_data(1000, random_state=522)
+    assert list(data.columns) == COLUMNS
+    assert len(data) == 1000
+    _, report = validate_df(data, return_report=True)
+    checks = report[report["column"] != "DataFrame"]
+    assert (checks["failure_count"] == 0).all()
+
+# Test 2: With a reference the marginals follow it, invalid values included
+def test_generate_adult_data_reference():
+    data = generate_adult_data(20000, reference, random_state=522)
+    assert set(data["workclass"].unique()) == {"Private", "Local-gov", "?"}
+    assert abs((data["workclass"] == "Private").mean() - 0.5) < 0.02
+    assert set(data["age"].unique()) <= set(reference["age"])
+    assert (data["sex"] == "Male").all()
+
+# Test 3: The same seed generates the same data
+def test_generate_adult_data_seed():
+    pd.testing.assert_frame_equal(
+        generate_adult_data(100, reference, random_state=1),
+        generate_adult_data(100, reference, random_state=1),
+    )
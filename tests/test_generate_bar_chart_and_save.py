@@ -31,3 +31,24 @@ def test_plot_exist():
     assert os.path.getsize(file_path) > 0, f"The saved plot exist but is empty at {file_path}"
     os.remove(file_path)
 
+
+def test_plot_from_counts_skips_unchanged():
+    counts = pd.DataFrame({
+        "age": [0, 120],
+        "income": [">50K", "<=50K"],
+        "count": [3, 5]
+    })
+    assert generate_bar_chart_and_save(counts, 'Age', 'age', test_dir, plot_1,
+        count_column="count", skip_unchanged=True)
+    assert not generate_bar_chart_and_save(counts, 'Age', 'age', test_dir, plot_1,
+        count_column="count", skip_unchanged=True)
+
+    # Changed counts are rendered again
+    counts["count"] = [4, 5]
+    assert generate_bar_chart_and_save(counts, 'Age', 'age', test_dir, plot_1,
+        count_column="count", skip_unchanged=True)
+
+    file_path = os.path.join(test_dir, plot_1)
+    assert os.path.getsize(file_path) > 0
+    os.remove(file_path)
+    os.remove(file_path + '.sha256')
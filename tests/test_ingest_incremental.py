@@ -0,0 +1,149 @@
+# test_ingest_incremental.py
+
+import sys
+import os
+import json
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.ingest_incremental import ingest_incremental
+from src.read_adult_data import read_adult_data
+from src.validate_df import validate_df
+
+# SETUP
+
+rows = [
+    "39, State-gov, 77516, Bachelors, 13, Never-married, Adm-clerical, Not-in-family, White, Male, 2174, 0, 40, United-States, <=50K\n",
+    "50, Self-emp-not-inc, 83311, Bachelors, 13, Married-civ-spouse, Exec-managerial, Husband, White, Male, 0, 0, 13, United-States, <=50K\n",
+    "38, Private, 215646, HS-grad, 9, Divorced, Handlers-cleaners, Not-in-family, White, Male, 0, 0, 40, United-States, <=50K\n",
+    "53, Private, 234721, 11th, 7, Married-civ-spouse, Handlers-cleaners, Husband, Black, Male, 0, 0, 40, United-States, <=50K\n",
+    "28, Private, 338409, Bachelors, 13, Married-civ-spouse, Prof-specialty, Wife, Black, Female, 0, 0, 40, Cuba, <=50K\n",
+    "37, ?, 284582, Masters, 14, Married-civ-spouse, Exec-managerial, Wife, White, Female, 0, 0, 40, United-States, <=50K\n",
+]
+
+def paths(tmp_path):
+    return str(tmp_path / "adult.data"), str(tmp_path / "cleaned_data.csv"), str(tmp_path / "state")
+
+def write_raw(path, lines, mode="w"):
+    with open(path, mode) as f:
+        f.write("".join(lines))
+
+def expected(raw_path):
+    """The cleaned data of a full, non-incremental run."""
+    with open(raw_path, "rb") as f:
+        complete = f.read()
+    complete = complete[:complete.rfind(b"\n") + 1]
+    tmp = raw_path + ".complete"
+    with open(tmp, "wb") as f:
+        f.write(complete)
+    return validate_df(read_adult_data(tmp, header=False, verbose=False), fingerprint=True)
+
+# TESTS
+
+# Test 1: Appended rows are validated and appended, with the same result as a full run
+def test_ingest_incremental_appends(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    write_raw(raw_path, rows[:3])
+    first = ingest_incremental(raw_path, output_file, state_dir)
+    assert first["rebuilt"] and first["rows_written"] == 3
+
+    # New rows, including a duplicate of an earlier row and an invalid row
+    write_raw(raw_path, rows[3:] + rows[:1], mode="a")
+    second = ingest_incremental(raw_path, output_file, state_dir)
+    assert not second["rebuilt"]
+    assert (second["rows_read"], second["rows_written"]) == (4, 2)
+    assert (second["rows"], second["clean_rows"]) == (7, 5)
+    failures = second["report"].set_index("check")["failure_count"]
+    assert failures["duplicate_rows"] == 1
+
+    result = read_adult_data(output_file, verbose=False)
+    assert result.astype(str).equals(expected(raw_path).astype(str))
+
+# Test 2: A last line without a newline waits for the next call
+def test_ingest_incremental_partial_line(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    write_raw(raw_path, rows[:2] + [rows[2][:20]])
+    assert ingest_incremental(raw_path, output_file, state_dir)["rows_written"] == 2
+
+    write_raw(raw_path, [rows[2][20:]], mode="a")
+    result = ingest_incremental(raw_path, output_file, state_dir)
+    assert not result["rebuilt"] and result["rows_written"] == 1
+    assert len(read_adult_data(output_file, verbose=False)) == 3
+
+# Test 3: Nothing new does nothing
+def test_ingest_incremental_no_new_rows(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    write_raw(raw_path, rows[:3])
+    ingest_incremental(raw_path, output_file, state_dir)
+    size = os.path.getsize(output_file)
+    result = ingest_incremental(raw_path, output_file, state_dir)
+    assert not result["rebuilt"] and result["rows_read"] == 0
+    assert os.path.getsize(output_file) == size
+
+# Test 4: A rewritten or truncated raw file is processed again from the start
+def test_ingest_incremental_rewritten_file(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    write_raw(raw_path, rows[:3])
+    ingest_incremental(raw_path, output_file, state_dir)
+
+    write_raw(raw_path, rows[1:4])
+    result = ingest_incremental(raw_path, output_file, state_dir)
+    assert result["rebuilt"] and result["clean_rows"] == 3
+    assert read_adult_data(output_file, verbose=False).astype(str).equals(expected(raw_path).astype(str))
+
+    write_raw(raw_path, rows[1:2])
+    assert ingest_incremental(raw_path, output_file, state_dir)["rebuilt"]
+
+# Test 5: Rows appended by an interrupted call, after the watermark was saved, are dropped
+def test_ingest_incremental_interrupted(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    write_raw(raw_path, rows[:2])
+    ingest_incremental(raw_path, output_file, state_dir)
+    with open(output_file, "a") as f:
+        f.write("partial,row\n")
+
+    write_raw(raw_path, rows[2:3], mode="a")
+    result = ingest_incremental(raw_path, output_file, state_dir)
+    assert not result["rebuilt"]
+    assert len(read_adult_data(output_file, verbose=False)) == 3
+    with open(os.path.join(state_dir, "watermark.json")) as f:
+        assert json.load(f)["offset"] == os.path.getsize(raw_path)
+
+# Test 6: Each call saves its fingerprints as a new run, leaving older runs untouched
+def test_ingest_incremental_index_runs(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    index_dir = os.path.join(state_dir, "fingerprints")
+    write_raw(raw_path, rows[:3])
+    ingest_incremental(raw_path, output_file, state_dir)
+    first_run = os.path.join(index_dir, sorted(os.listdir(index_dir))[0])
+    mtime = os.stat(first_run).st_mtime_ns
+
+    write_raw(raw_path, rows[3:4], mode="a")
+    result = ingest_incremental(raw_path, output_file, state_dir)
+    assert not result["rebuilt"] and result["clean_rows"] == 4
+    assert len(os.listdir(index_dir)) == 2
+    assert os.stat(first_run).st_mtime_ns == mtime
+
+    # A duplicate of a row in either run is still dropped
+    write_raw(raw_path, rows[:1] + rows[3:5], mode="a")
+    result = ingest_incremental(raw_path, output_file, state_dir)
+    assert (result["rows_written"], result["clean_rows"]) == (1, 5)
+    assert read_adult_data(output_file, verbose=False).astype(str).equals(expected(raw_path).astype(str))
+
+# Test 7: An edit in the middle of the processed rows is only caught when hashing the whole prefix
+def test_ingest_incremental_mid_file_edit(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    edited = rows[:2] + [rows[2].replace("38,", "83,")] + rows[3:5]
+    for window, rebuilt in [(16, False), (None, True)]:
+        write_raw(raw_path, rows[:5])
+        assert ingest_incremental(raw_path, output_file, state_dir, window=window)["rebuilt"]
+        write_raw(raw_path, edited)
+        assert ingest_incremental(raw_path, output_file, state_dir, window=window)["rebuilt"] == rebuilt
+
+# Test 8: New rows are streamed in chunks of rows, never past the last complete line
+def test_ingest_incremental_streamed_chunks(tmp_path):
+    raw_path, output_file, state_dir = paths(tmp_path)
+    write_raw(raw_path, rows[:5] + [rows[5][:20]])
+    result = ingest_incremental(raw_path, output_file, state_dir, chunksize=2)
+    assert (result["rows_read"], result["rows_written"]) == (5, 5)
+    assert result["offset"] == len("".join(rows[:5]).encode())
+    assert read_adult_data(output_file, verbose=False).astype(str).equals(expected(raw_path).astype(str))
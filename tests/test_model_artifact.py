@@ -0,0 +1,78 @@
+# test_model_artifact.py
+
+import sys
+import os
+import json
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_artifact import save_model, load_model
+
+# SETUP
+
+X = pd.DataFrame({
+    "sex": ["Female", "Male", "Male", "Female", "Male", "Female"],
+    "race": ["White", "Black", "White", "Other", "Black", "White"],
+})
+y = pd.Series(["<=50K", ">50K", ">50K", "<=50K", "<=50K", ">50K"])
+
+pipe = make_pipeline(
+    make_column_transformer((OneHotEncoder(sparse_output=False), ["sex", "race"])),
+    KNeighborsClassifier(n_neighbors=3),
+).fit(X, y)
+
+# TESTS
+
+# Test 1: The loaded model memory maps the KNN training matrix and predicts the same
+def test_save_and_load_model(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    header = save_model(pipe, path, metadata={"random_seed": 522})
+    assert header["metadata"] == {"random_seed": 522}
+
+    model = load_model(path, verify=True, metadata={"random_seed": 522})
+    assert isinstance(model[-1]._fit_X, np.memmap)
+    assert (model.predict_proba(X) == pipe.predict_proba(X)).all()
+
+# Test 2: Pickle files are still loaded with pickle
+def test_load_model_pickle(tmp_path):
+    path = str(tmp_path / "model.pickle")
+    with open(path, "wb") as f:
+        pickle.dump(pipe, f)
+    assert list(load_model(path).predict(X)) == list(pipe.predict(X))
+
+# Test 3: Stale artifacts are detected from their header
+def test_load_model_stale(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    save_model(pipe, path, metadata={"random_seed": 522})
+
+    with pytest.raises(ValueError, match="stale"):
+        load_model(path, metadata={"random_seed": 1})
+
+    with open(path + ".json") as f:
+        header = json.load(f)
+    with open(path + ".json", "w") as f:
+        json.dump({**header, "sklearn_version": "0.0"}, f)
+    with pytest.raises(ValueError, match="scikit-learn"):
+        load_model(path)
+
+    os.remove(path + ".json")
+    with pytest.raises(ValueError, match="no header"):
+        load_model(path)
+
+# Test 4: A changed artifact fails verification
+def test_load_model_checksum(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    save_model(pipe, path)
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last_byte = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last_byte[0] ^ 1]))
+    with pytest.raises(ValueError, match="checksum"):
+        load_model(path, verify=True)
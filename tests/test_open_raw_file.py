@@ -0,0 +1,25 @@
+# test_open_raw_file.py
+
+import sys
+import os
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.open_raw_file import open_raw_file
+
+# SETUP
+
+test_zip = 'tests/data/files_txt_csv.zip'
+
+# TESTS
+
+# Test 1: A member is read straight from the archive without extracting it
+def test_open_member():
+    with open_raw_file(test_zip, 'test2.csv') as f:
+        df = pd.read_csv(f)
+    assert isinstance(df, pd.DataFrame)
+    assert not os.path.exists('test2.csv')
+
+# Test 2: A plain file on disk is opened as is
+def test_open_plain_file():
+    with open_raw_file('tests/data/non_zip.csv') as f:
+        assert f.read() == open('tests/data/non_zip.csv', 'rb').read()
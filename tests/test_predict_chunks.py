@@ -0,0 +1,83 @@
+import sys
+import os
+import pickle
+import pytest
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.predict_chunks import predict_chunks
+
+# SETUP
+
+X = pd.DataFrame({
+    "sex": ["Female", "Male", "Male", "Female", "Male", "Female"],
+    "race": ["White", "Black", "White", "Other", "Black", "White"],
+})
+y = pd.Series(["<=50K", ">50K", ">50K", "<=50K", "<=50K", ">50K"])
+
+@pytest.fixture
+def model_path(tmp_path):
+    pipe = make_pipeline(
+        make_column_transformer((OneHotEncoder(handle_unknown="ignore"), ["sex", "race"])),
+        KNeighborsClassifier(n_neighbors=3),
+    ).fit(X, y)
+    path = tmp_path / "model.pickle"
+    with open(path, "wb") as f:
+        pickle.dump(pipe, f)
+    return str(path), pipe
+
+# TESTS
+
+# Test 1: Chunked predictions match a single predict call, in order
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_predict_chunks(model_path, n_jobs):
+    path, pipe = model_path
+    chunks = [X.iloc[i:i + 2] for i in range(0, len(X), 2)]
+    result = pd.concat(predict_chunks(path, chunks, n_jobs=n_jobs), ignore_index=True)
+    assert list(result["prediction"]) == list(pipe.predict(X))
+
+# Test 2: Probabilities get one column per class
+def test_predict_chunks_proba(model_path):
+    path, pipe = model_path
+    result = next(predict_chunks(path, [X], proba=True))
+    assert list(result.columns) == ["prediction", "proba_<=50K", "proba_>50K"]
+    assert list(result["prediction"]) == list(pipe.predict(X))
+    assert (result[["proba_<=50K", "proba_>50K"]].to_numpy() == pipe.predict_proba(X)).all()
+
+# Test 3: A fitted model is scored as is, in this process or in workers
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_predict_chunks_fitted_model(model_path, n_jobs):
+    _, pipe = model_path
+    chunks = [X.iloc[i:i + 2] for i in range(0, len(X), 2)]
+    result = pd.concat(predict_chunks(pipe, chunks, n_jobs=n_jobs), ignore_index=True)
+    assert list(result["prediction"]) == list(pipe.predict(X))
+
+# Test 4: The predict and evaluate scripts load the model only once when scoring in this process
+def test_scripts_load_model_once(model_path, tmp_path, monkeypatch):
+    from click.testing import CliRunner
+    import src.model_artifact
+    import src.predict_chunks
+    from scripts.predict import main as predict
+    from scripts.evaluate_model import main as evaluate
+
+    path, pipe = model_path
+    X.to_csv(tmp_path / "X.csv", index=False)
+    y.to_frame("income").to_csv(tmp_path / "y.csv", index=False)
+    loads, load_model = [], src.model_artifact.load_model
+    def counted_load_model(*args, **kwargs):
+        loads.append(args[0])
+        return load_model(*args, **kwargs)
+    monkeypatch.setattr(src.predict_chunks, "load_model", counted_load_model)
+    monkeypatch.setattr(src.model_artifact, "load_model", counted_load_model)
+
+    result = CliRunner().invoke(predict, ["--input_dir", str(tmp_path / "X.csv"), "--pickle_loc", path,
+                                          "--output_dir", str(tmp_path / "out")])
+    assert result.exit_code == 0, result.output
+    result = CliRunner().invoke(evaluate, ["--x_dir", str(tmp_path / "X.csv"), "--y_dir", str(tmp_path / "y.csv"),
+                                           "--pickle_loc", path, "--results_figure_dir", str(tmp_path / "figures"),
+                                           "--results_table_dir", str(tmp_path / "tables")])
+    assert result.exit_code == 0, result.output
+    assert loads == [path, path]
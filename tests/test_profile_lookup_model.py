@@ -0,0 +1,48 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profile_lookup_model import ProfileLookupModel
+
+# SETUP
+
+rng = np.random.default_rng(522)
+X = pd.DataFrame({
+    "sex": rng.choice(["Female", "Male"], 200),
+    "race": rng.choice(["White", "Black", "Other"], 200),
+    "age": rng.integers(17, 90, 200),
+})
+y = rng.choice(["<=50K", ">50K"], 200)
+pipe = make_pipeline(
+    make_column_transformer((OneHotEncoder(handle_unknown="ignore"), ["sex", "race"])),
+    KNeighborsClassifier(),
+).fit(X, y)
+
+# TESTS
+
+# Test 1: Lookups give exactly the pipeline's output
+def test_same_as_pipeline():
+    model = ProfileLookupModel(pipe, ["sex", "race"]).compile(X)
+    assert len(model) == 6
+    assert (model.predict(X) == pipe.predict(X)).all()
+    assert (model.predict_proba(X) == pipe.predict_proba(X)).all()
+
+# Test 2: Unseen profiles are scored on demand and kept
+def test_new_profiles():
+    model = ProfileLookupModel(pipe, ["sex", "race"]).compile(X[X["race"] != "Other"])
+    assert len(model) == 4
+    new = pd.DataFrame({"sex": ["Male", "Female"], "race": ["Other", "Asian"], "age": [30, 40]})
+    assert (model.predict(new) == pipe.predict(new)).all()
+    assert len(model) == 6
+
+# Test 3: Columns the pipeline drops do not make up the profile
+def test_dropped_columns_ignored():
+    model = ProfileLookupModel(pipe, ["sex", "race"]).compile(X)
+    shuffled_ages = X.assign(age=rng.permutation(X["age"]))
+    assert (model.predict(shuffled_ages) == pipe.predict(X)).all()
+    assert len(model) == 6
@@ -0,0 +1,76 @@
+# test_profiler.py
+
+import sys
+import os
+import json
+import threading
+import click
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.profiler import Profiler, profile_option, step
+
+# SETUP
+
+@click.command()
+@profile_option
+@click.option('--n_rows', type=int, default=10)
+def command(n_rows):
+    with step("load") as record:
+        record["rows"] = n_rows
+    with step("fit", rows=n_rows):
+        with step("encode"):
+            pass
+    click.echo("done")
+
+# TESTS
+
+# Test 1: Steps are recorded as complete trace events with their rows
+def test_profiler_step():
+    profiler = Profiler()
+    with profiler.step("outer", rows=3):
+        with profiler.step("inner") as record:
+            record["rows"] = 2
+    inner, outer = profiler.events
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert inner["ph"] == outer["ph"] == "X"
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert (inner["args"]["rows"], outer["args"]["rows"]) == (2, 3)
+    assert {"cpu_time_s", "process_cpu_time_s", "process_peak_rss_mb", "rss_mb"} <= set(outer["args"])
+    if outer["args"]["rss_mb"] is not None and outer["args"]["process_peak_rss_mb"] is not None:
+        assert outer["args"]["rss_mb"] <= outer["args"]["process_peak_rss_mb"]
+
+# Test 2: Steps of worker threads nest under the open step of the main thread
+def test_profiler_threads():
+    profiler = Profiler()
+
+    def plot():
+        with profiler.step("plot"):
+            pass
+
+    with profiler.step("render"):
+        thread = threading.Thread(target=plot)
+        thread.start()
+        thread.join()
+    lines = profiler.summary().splitlines()
+    render, plot_event = profiler.events[1], profiler.events[0]
+    assert render["args"]["cpu_time_s"] <= render["args"]["process_cpu_time_s"] + 1e-3
+    assert plot_event["tid"] != render["tid"]
+    assert lines[1].startswith("render ")
+    assert lines[2].startswith("  plot ")
+
+# Test 3: --profile writes a trace file with every step of the command
+def test_profile_option(tmp_path):
+    path = str(tmp_path / "trace.json")
+    result = CliRunner().invoke(command, ["--n_rows=5", f"--profile={path}"])
+    assert result.exit_code == 0, result.output
+    assert "done" in result.output
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert sorted(event["name"] for event in events) == ["encode", "fit", "load", "test_profiler"]
+    assert {event["name"]: event["args"].get("rows") for event in events}["load"] == 5
+
+# Test 4: Without --profile nothing is recorded
+def test_profile_option_disabled(tmp_path):
+    result = CliRunner().invoke(command, [])
+    assert result.exit_code == 0
+    assert "Profile saved" not in result.output
@@ -0,0 +1,62 @@
+import sys
+import os
+import io
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_adult_data import read_adult_data
+from src.validate_df import CATEGORIES, COLUMNS
+from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
+
+raw_rows = (
+    "39, State-gov, 77516, Bachelors, 13, Never-married, Adm-clerical, Not-in-family, White, Male, 2174, 0, 40, United-States, <=50K\n"
+    "50, ?, 83311, Bachelors, 13, Married-civ-spouse, Exec-managerial, Husband, White, Male, 0, 0, 13, United-States, >50K\n"
+)
+
+# Case 1: Raw rows are stripped, categorical and downcast
+def test_compact_dtypes():
+    result = read_adult_data(io.StringIO(raw_rows), header=False)
+    assert result.loc[0, "workclass"] == "State-gov"
+    assert result["sex"].dtype == pd.CategoricalDtype(CATEGORIES["sex"])
+    assert result["age"].dtype == "int8"
+    assert result["fnlwgt"].dtype == "int32"
+
+# Case 2: Values outside the schema are kept as extra categories
+def test_unknown_values_kept():
+    result = read_adult_data(io.StringIO(raw_rows), header=False)
+    assert list(result["workclass"].cat.categories) == CATEGORIES["workclass"] + ["?"]
+    assert result.loc[1, "workclass"] == "?"
+
+# Case 3: Files with a header and only some of the columns
+def test_header_and_column_subset():
+    result = read_adult_data(io.StringIO("income\n<=50K\n>50K\n"))
+    assert list(result.columns) == ["income"]
+    assert result["income"].dtype == pd.CategoricalDtype(CATEGORIES["income"])
+
+# Case 4: Chunks are compacted the same way
+def test_chunks():
+    chunks = list(read_adult_data(io.StringIO(raw_rows), header=False, chunksize=1))
+    assert len(chunks) == 2
+    assert chunks[1]["hours-per-week"].dtype == "int8"
+
+# Case 5: The memory saved is reported
+def test_memory_report(capsys):
+    read_adult_data(io.StringIO(raw_rows), header=False)
+    assert "over default dtypes" in capsys.readouterr().out
+
+# Case 6: The first line and the income labels of adult.test are normalised
+def test_adult_test_quirks():
+    test_rows = "|1x3 Cross validator\n" + raw_rows.replace("<=50K\n", "<=50K.\n").replace(">50K\n", ">50K.\n")
+    result = read_adult_data(io.StringIO(test_rows), header=False)
+    assert len(result) == 2
+    assert list(result["income"]) == ["<=50K", ">50K"]
+    assert result["income"].dtype == pd.CategoricalDtype(CATEGORIES["income"])
+
+# Case 7: Row fingerprints are read back from a CSV file as uint64
+def test_fingerprint_column(tmp_path):
+    result = read_adult_data(io.StringIO(raw_rows), header=False)
+    result[FINGERPRINT_COLUMN] = row_fingerprint(result, COLUMNS)
+    path = str(tmp_path / "cleaned_data.csv")
+    result.to_csv(path, index=False)
+    reread = read_adult_data(path)
+    assert reread[FINGERPRINT_COLUMN].dtype == "uint64"
+    assert reread[FINGERPRINT_COLUMN].equals(result[FINGERPRINT_COLUMN])
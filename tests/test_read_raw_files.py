@@ -0,0 +1,57 @@
+# test_read_raw_files.py
+
+import sys
+import os
+import zipfile
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_raw_files import read_raw_files
+from src.validate_df import CATEGORIES
+
+# SETUP
+
+rows = [
+    "39, State-gov, 77516, Bachelors, 13, Never-married, Adm-clerical, Not-in-family, White, Male, 2174, 0, 40, United-States, <=50K\n",
+    "50, Self-emp-not-inc, 83311, Bachelors, 13, Married-civ-spouse, Exec-managerial, Husband, White, Male, 0, 0, 13, United-States, >50K\n",
+    "38, Private, 215646, HS-grad, 9, Divorced, Handlers-cleaners, Not-in-family, White, Male, 0, 0, 40, United-States, <=50K\n",
+    "37, ?, 284582, Masters, 14, Married-civ-spouse, Exec-managerial, Wife, White, Female, 0, 0, 40, United-States, <=50K\n",
+]
+
+def archive(tmp_path):
+    """A ZIP archive with an adult.data and an adult.test sharing one row."""
+    path = str(tmp_path / "adult.zip")
+    test_rows = [row.replace("50K\n", "50K.\n") for row in rows[1:]]
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        zip_ref.writestr("adult.data", "".join(rows[:2]))
+        zip_ref.writestr("adult.test", "|1x3 Cross validator\n" + "".join(test_rows))
+    return path
+
+# TESTS
+
+# Test 1: Files are merged with their source, without the rows repeated across files
+def test_read_raw_files_merge(tmp_path):
+    path = archive(tmp_path)
+    data, report = read_raw_files([(path, "adult.data"), (path, "adult.test")])
+    assert list(data["source_file"]) == ["adult.data", "adult.data", "adult.test"]
+    assert list(data["income"]) == ["<=50K", ">50K", "<=50K"]
+    assert data["income"].dtype == pd.CategoricalDtype(CATEGORIES["income"])
+    assert isinstance(data["workclass"].dtype, pd.CategoricalDtype)
+
+    duplicates = report[report["check"] == "duplicate_rows"].set_index("source_file")["failure_count"]
+    assert (duplicates["adult.data"], duplicates["adult.test"]) == (0, 1)
+
+# Test 2: Worker processes give the same result
+def test_read_raw_files_parallel(tmp_path):
+    path = archive(tmp_path)
+    sources = [(path, "adult.data"), (path, "adult.test")]
+    data, report = read_raw_files(sources)
+    parallel_data, parallel_report = read_raw_files(sources, n_jobs=2)
+    pd.testing.assert_frame_equal(data, parallel_data)
+    pd.testing.assert_frame_equal(report, parallel_report)
+
+# Test 3: The first file listed keeps the shared rows
+def test_read_raw_files_order(tmp_path):
+    path = archive(tmp_path)
+    data, _ = read_raw_files([(path, "adult.test"), (path, "adult.data")])
+    assert list(data["source_file"]) == ["adult.test", "adult.test", "adult.data"]
+    assert list(data["source_file"].cat.categories) == ["adult.test", "adult.data"]
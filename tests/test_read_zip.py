@@ -6,6 +6,8 @@
 
 import os
 import sys
+import json
+import hashlib
 import pytest
 import responses
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -53,4 +55,134 @@ def test_invalid_url(mock_response):
 # Test 3: Non-zip URL should raise a ValueError
 def test_non_zip_url():
     with pytest.raises(ValueError, match='The URL provided does not point to a ZIP file.'):
-        read_zip(url_3, test_dir_1)
\ No newline at end of file
+        read_zip(url_3, test_dir_1)
+
+# Test 4: The archive is streamed from a local server and extracted
+def test_read_zip_local_server(http_server, tmp_path):
+    read_zip(f"{http_server.url}/files_txt_csv.zip", str(tmp_path))
+    for file in test_dir_1_files:
+        assert os.path.isfile(tmp_path / file)
+    assert not os.path.exists(tmp_path / 'files_txt_csv.zip.part')
+
+# Test 5: An unchanged archive is not downloaded again
+def test_read_zip_not_modified(http_server, tmp_path):
+    url = f"{http_server.url}/files_txt_csv.zip"
+    read_zip(url, str(tmp_path))
+    read_zip(url, str(tmp_path))
+    assert 'If-None-Match' in http_server.requests_log[-1][1]
+    assert len(http_server.requests_log) == 2
+
+# Test 6: A known checksum skips the request entirely
+def test_read_zip_matching_checksum(http_server, tmp_path):
+    url = f"{http_server.url}/files_txt_csv.zip"
+    with open('tests/data/files_txt_csv.zip', 'rb') as f:
+        expected = hashlib.sha256(f.read()).hexdigest()
+    read_zip(url, str(tmp_path), sha256=expected)
+    read_zip(url, str(tmp_path), sha256=expected)
+    assert len(http_server.requests_log) == 1
+
+# Test 7: A wrong checksum raises a ValueError and keeps nothing
+def test_read_zip_checksum_mismatch(http_server, tmp_path):
+    with pytest.raises(ValueError, match='does not match the expected checksum'):
+        read_zip(f"{http_server.url}/files_txt_csv.zip", str(tmp_path), sha256='0' * 64)
+    assert not os.path.exists(tmp_path / 'files_txt_csv.zip')
+
+# Test 8: An interrupted download is resumed with a Range request
+def test_read_zip_resume(http_server, tmp_path):
+    url = f"{http_server.url}/files_txt_csv.zip"
+    with open('tests/data/files_txt_csv.zip', 'rb') as f:
+        archive = f.read()
+    read_zip(url, str(tmp_path))
+    etag = json.load(open(tmp_path / 'files_txt_csv.zip.json'))['etag']
+
+    # Simulate a download that stopped half way through
+    os.remove(tmp_path / 'files_txt_csv.zip')
+    with open(tmp_path / 'files_txt_csv.zip.part', 'wb') as f:
+        f.write(archive[:len(archive) // 2])
+    with open(tmp_path / 'files_txt_csv.zip.json', 'w') as f:
+        json.dump({'url': url, 'partial': {'url': url, 'etag': etag}}, f)
+
+    read_zip(url, str(tmp_path))
+    assert http_server.requests_log[-1][1]['Range'] == f"bytes={len(archive) // 2}-"
+    with open(tmp_path / 'files_txt_csv.zip', 'rb') as f:
+        assert f.read() == archive
+
+# Test 9: A download interrupted while replacing an older archive is resumed too
+def test_read_zip_resume_over_old_archive(http_server, tmp_path):
+    url = f"{http_server.url}/files_txt_csv.zip"
+    with open('tests/data/files_txt_csv.zip', 'rb') as f:
+        archive = f.read()
+    read_zip(url, str(tmp_path), extract=False)
+    etag = json.load(open(tmp_path / 'files_txt_csv.zip.json'))['etag']
+
+    # The old archive is still on disk, and the metadata only describes the new, partial one
+    with open(tmp_path / 'files_txt_csv.zip', 'wb') as f:
+        f.write(b'an older archive')
+    with open(tmp_path / 'files_txt_csv.zip.part', 'wb') as f:
+        f.write(archive[:len(archive) // 2])
+    with open(tmp_path / 'files_txt_csv.zip.json', 'w') as f:
+        json.dump({'url': url, 'partial': {'url': url, 'etag': etag}}, f)
+
+    read_zip(url, str(tmp_path), extract=False)
+    assert http_server.requests_log[-1][1]['Range'] == f"bytes={len(archive) // 2}-"
+    with open(tmp_path / 'files_txt_csv.zip', 'rb') as f:
+        assert f.read() == archive
+
+# Test 10: A part of the archive other than the one asked for is never appended
+@responses.activate
+def test_read_zip_mismatched_content_range(tmp_path):
+    with open('tests/data/files_txt_csv.zip', 'rb') as f:
+        archive = f.read()
+    half = len(archive) // 2
+    with open(tmp_path / 'foo.zip.part', 'wb') as f:
+        f.write(archive[:half])
+    with open(tmp_path / 'foo.zip.json', 'w') as f:
+        json.dump({'url': mock_url, 'partial': {'url': mock_url, 'etag': '"v1"'}}, f)
+
+    content_range = {'Content-Range': f"bytes 10-{len(archive) - 1}/{len(archive)}", 'ETag': '"v1"'}
+    responses.add(responses.GET, mock_url, status=206, body=archive[10:], headers=content_range)
+    responses.add(responses.GET, mock_url, status=200, body=archive, headers={'ETag': '"v1"'})
+    read_zip(mock_url, str(tmp_path), extract=False)
+    assert responses.calls[0].request.headers['Range'] == f"bytes={half}-"
+    assert 'Range' not in responses.calls[1].request.headers
+    with open(tmp_path / 'foo.zip', 'rb') as f:
+        assert f.read() == archive
+
+    # A server answering every request with a part is an error
+    os.remove(tmp_path / 'foo.zip')
+    responses.replace(responses.GET, mock_url, status=206, body=archive[10:], headers=content_range)
+    with pytest.raises(ValueError, match='sent part of the archive'):
+        read_zip(mock_url, str(tmp_path), extract=False)
+
+# Test 11: A deleted archive is downloaded again, even though its metadata is left
+@pytest.mark.parametrize("extract", [True, False])
+def test_read_zip_deleted_archive(http_server, tmp_path, extract):
+    url = f"{http_server.url}/files_txt_csv.zip"
+    read_zip(url, str(tmp_path), extract=extract)
+    os.remove(tmp_path / 'files_txt_csv.zip')
+
+    read_zip(url, str(tmp_path), extract=extract)
+    assert 'If-None-Match' not in http_server.requests_log[-1][1]
+    assert os.path.isfile(tmp_path / 'files_txt_csv.zip')
+
+# Test 12: Members of a new archive replace older files of the same size
+def test_read_zip_replaces_same_size_members(http_server, tmp_path):
+    url = f"{http_server.url}/files_txt_csv.zip"
+    read_zip(url, str(tmp_path))
+    with open(tmp_path / 'test1.txt', 'rb') as f:
+        content = f.read()
+    with open(tmp_path / 'test1.txt', 'wb') as f:
+        f.write(bytes(len(content)))
+
+    # The archive on disk is current, but the extracted member is not
+    read_zip(url, str(tmp_path))
+    with open(tmp_path / 'test1.txt', 'rb') as f:
+        assert f.read() == content
+
+    # A newly downloaded archive is always extracted in full
+    os.remove(tmp_path / 'files_txt_csv.zip')
+    with open(tmp_path / 'test1.txt', 'wb') as f:
+        f.write(bytes(len(content)))
+    read_zip(url, str(tmp_path))
+    with open(tmp_path / 'test1.txt', 'rb') as f:
+        assert f.read() == content
@@ -0,0 +1,31 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
+from test_validate_df import valid_data, duplicates
+
+# Case 1: One uint64 fingerprint per row, equal for equal rows
+def test_fingerprint_duplicates():
+    fingerprints = row_fingerprint(duplicates)
+    assert fingerprints.dtype == np.uint64
+    assert len(fingerprints) == 3
+    assert fingerprints[1] == fingerprints[2]
+    assert fingerprints[0] != fingerprints[1]
+
+# Case 2: Fingerprints do not depend on the dtypes the frame was loaded with
+def test_fingerprint_dtypes():
+    compact = valid_data.astype({"age": "int8", "hours-per-week": "float32", "race": "category"})
+    assert (row_fingerprint(compact) == row_fingerprint(valid_data)).all()
+
+# Case 3: Only the given columns make up a row
+def test_fingerprint_columns():
+    changed = valid_data.assign(fnlwgt=[1, 2])
+    columns = valid_data.columns.drop("fnlwgt")
+    assert (row_fingerprint(changed, columns) == row_fingerprint(valid_data, columns)).all()
+
+# Case 4: Fingerprints carried by the frame are not part of a row
+def test_fingerprint_carried():
+    carried = valid_data.assign(**{FINGERPRINT_COLUMN: np.array([1, 2], dtype=np.uint64)})
+    assert (row_fingerprint(carried) == row_fingerprint(valid_data)).all()
@@ -0,0 +1,39 @@
+# test_run_pipeline.py
+
+import sys
+import os
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import scripts.run_pipeline as run_pipeline
+
+# SETUP
+
+pipeline_stages = run_pipeline.pipeline_stages
+
+def fake_run_stage(calls, archive):
+    """Record the stages run and write their outputs, the download writing `archive[0]`."""
+    outputs = {name: output_paths for name, _, _, output_paths in pipeline_stages(None, 522, "csv")}
+    def run_stage(name, params):
+        calls.append(name)
+        for path in outputs[name]:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(archive[0] if name == "download_data" else name)
+    return run_stage
+
+# TESTS
+
+# Test 1: The download runs every time, and the later stages rerun only when the archive changed
+def test_download_never_cached(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls, archive = [], ["first"]
+    monkeypatch.setattr(run_pipeline, "run_stage", fake_run_stage(calls, archive))
+    monkeypatch.setattr(run_pipeline, "pipeline_stages", lambda *args: pipeline_stages(*args)[:2])
+
+    for _ in range(2):
+        assert CliRunner().invoke(run_pipeline.main, []).exit_code == 0
+    assert calls == ["download_data", "read_and_validate", "download_data"]
+
+    archive[0] = "changed"
+    assert CliRunner().invoke(run_pipeline.main, []).exit_code == 0
+    assert calls[3:] == ["download_data", "read_and_validate"]
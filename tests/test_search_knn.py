@@ -0,0 +1,52 @@
+# test_search_knn.py
+
+import sys
+import os
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.neighbors import KNeighborsClassifier
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.search_knn import search_knn
+
+# SETUP
+
+rng = np.random.default_rng(522)
+n_rows = 300
+X = pd.DataFrame({
+    "sex": rng.choice(["Female", "Male"], n_rows),
+    "race": rng.choice(["White", "Black", "Other"], n_rows),
+})
+y = pd.Series(np.where((X["sex"] == "Male") ^ (rng.random(n_rows) < 0.2), ">50K", "<=50K"), name="income")
+
+preprocessor = make_column_transformer((OneHotEncoder(sparse_output=False), ["sex", "race"]))
+param_grid = {"n_neighbors": [3, 15], "weights": ["uniform", "distance"], "metric": ["euclidean", "manhattan"]}
+
+# TESTS
+
+# Test 1: Scores match a grid search over the full pipeline with the same folds
+def test_search_knn_matches_grid_search():
+    results, best_params = search_knn(preprocessor, X, y, param_grid, cv=3, random_state=522)
+
+    grid_search = GridSearchCV(
+        make_pipeline(preprocessor, KNeighborsClassifier()),
+        {f"kneighborsclassifier__{name}": values for name, values in param_grid.items()},
+        cv=StratifiedKFold(n_splits=3, shuffle=True, random_state=522),
+    ).fit(X, y)
+    expected = pd.DataFrame(grid_search.cv_results_["params"]).rename(columns=lambda name: name.split("__")[1])
+    expected["mean_test_score"] = grid_search.cv_results_["mean_test_score"]
+
+    merged = results.merge(expected, on=list(param_grid), suffixes=("", "_expected"))
+    assert len(merged) == 8
+    np.testing.assert_allclose(merged["mean_test_score"], merged["mean_test_score_expected"])
+    assert results.loc[0, "mean_test_score"] == results["mean_test_score"].max()
+    assert {name: results.loc[0, name] for name in param_grid} == best_params
+
+# Test 2: The results table has the timing of every candidate, also when run in parallel
+def test_search_knn_timing_parallel():
+    results, _ = search_knn(preprocessor, X, y, param_grid, cv=3, n_jobs=2, random_state=522)
+    assert (results[["mean_fit_time", "mean_score_time", "total_time"]] > 0).all().all()
+    assert results["rank_test_score"].is_monotonic_increasing
@@ -0,0 +1,52 @@
+# test_split_and_fit.py
+
+import sys
+import os
+import numpy as np
+import pytest
+import scipy.sparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.generate_adult_data import generate_adult_data
+from scripts.split_and_fit import split_and_fit
+from src.model_artifact import load_model
+from src.validate_df import validate_df
+from src.validation_cache import hash_rows
+
+# SETUP
+
+def training_data(n_rows=400, random_state=0):
+    """Synthetic cleaned data whose labels are imbalanced enough to pass the class ratio check."""
+    rng = np.random.default_rng(random_state)
+    data = generate_adult_data(n_rows, random_state=random_state)
+    data["income"] = np.where(rng.random(n_rows) < 0.25, ">50K", "<=50K")
+    return data
+
+# TESTS
+
+# Test 1: The sparse pipeline keeps a CSR training matrix, reports its footprint and predicts
+@pytest.mark.parametrize("sparse", [False, True])
+def test_split_and_fit_sparse(tmp_path, capsys, sparse):
+    pipe, X_test, y_test = split_and_fit(training_data(), 522, str(tmp_path / "models"), sparse=sparse)
+    encoded = pipe[-1]._fit_X
+    assert scipy.sparse.issparse(encoded) == sparse
+    assert encoded.dtype == np.float32
+    if sparse:
+        assert encoded.format == "csr"
+        assert scipy.sparse.issparse(pipe[:-1].transform(X_test))
+
+    if sparse:
+        encoded_bytes = encoded.data.nbytes + encoded.indices.nbytes + encoded.indptr.nbytes
+    else:
+        encoded_bytes = encoded.nbytes
+    output = capsys.readouterr().out
+    assert (f"Encoded training matrix: {type(encoded).__name__} of shape {encoded.shape}, "
+            f"{encoded_bytes / 1e6:.2f} MB") in output
+    assert len(pipe.predict(X_test)) == len(y_test) == 80
+    assert os.path.isfile(tmp_path / "models" / "model.joblib")
+
+# Test 2: The training data hash reuses carried fingerprints and matches the hash of the rows
+def test_training_data_hash(tmp_path):
+    validated = validate_df(training_data(), fingerprint=True)
+    split_and_fit(validated, 522, str(tmp_path / "models"), split="fingerprint")
+    expected = {"training_data_sha256": hash_rows(validated)}
+    load_model(str(tmp_path / "models" / "model.joblib"), metadata=expected)
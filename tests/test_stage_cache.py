@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stage_cache import stage_cache_key, stage_code_paths, restore_stage, store_stage
+
+# Case 1: Stage code includes the src modules imported along the way
+def test_stage_code_paths():
+    paths = [os.path.relpath(path) for path in stage_code_paths("scripts/read_and_validate.py")]
+    assert os.path.join("scripts", "read_and_validate.py") in paths
+    assert os.path.join("src", "validate_df.py") in paths
+    assert os.path.join("src", "row_fingerprint.py") in paths
+    assert os.path.join("src", "generate_bar_chart_and_save.py") not in paths
+
+# Case 2: Keys change with the parameters and input content, not timestamps
+def test_stage_cache_key(tmp_path):
+    input_path = tmp_path / "cleaned_data.csv"
+    input_path.write_text("a,b\n")
+    code = ["scripts/eda.py"]
+    key = stage_cache_key("eda", code, {"random_seed": 522}, [str(input_path)])
+    os.utime(input_path, (0, 0))
+    assert key == stage_cache_key("eda", code, {"random_seed": 522}, [str(input_path)])
+    assert key != stage_cache_key("eda", code, {"random_seed": 123}, [str(input_path)])
+    input_path.write_text("a,b\n1,2\n")
+    assert key != stage_cache_key("eda", code, {"random_seed": 522}, [str(input_path)])
+
+# Case 3: Stored outputs are restored, misses restore nothing
+def test_store_and_restore(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    output_path = tmp_path / "results" / "test_score.csv"
+    assert not restore_stage(cache_dir, "evaluate_model", "abc", [str(output_path)])
+
+    output_path.parent.mkdir()
+    output_path.write_text("test_score\n0.8\n")
+    store_stage(cache_dir, "evaluate_model", "abc", [str(output_path)])
+    output_path.unlink()
+    assert restore_stage(cache_dir, "evaluate_model", "abc", [str(output_path)])
+    assert output_path.read_text() == "test_score\n0.8\n"
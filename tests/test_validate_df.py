@@ -1,12 +1,14 @@
 import sys
 import os
+import logging
 import click
 import pytest
 import pandas as pd
-import pandera as pa
 import numpy as np
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.validate_df import validate_df
+from src.error_sink import ErrorSink
+from src.row_fingerprint import row_fingerprint, FINGERPRINT_COLUMN
 
 valid_data = pd.DataFrame({
     "age": [0, 120],
@@ -84,4 +86,69 @@ def test_validate_remove_nan():
 def test_empty_dataframe():
     empty_df = pd.DataFrame(columns=valid_data.columns)
     result = validate_df(empty_df)
-    assert result.empty   
\ No newline at end of file
+    assert result.empty   
+# Case 6: Test for Invalid Values - Rows outside the schema are dropped
+def test_validate_remove_invalid_values():
+    invalid = pd.concat([valid_data, valid_data.iloc[[0]], valid_data.iloc[[1]]], ignore_index=True)
+    invalid.loc[2, "workclass"] = "?"
+    invalid.loc[3, "age"] = 121
+    result = validate_df(invalid)
+    assert result.equals(valid_data), "The rows with invalid values were not dropped"
+
+# Case 7: Test for the Report - One failure count per check
+def test_validate_report():
+    invalid = pd.concat([duplicates, na_rows.iloc[[2]]], ignore_index=True)
+    invalid.loc[0, "race"] = "Unknown"
+    invalid.loc[1, "hours-per-week"] = 12.5
+    result, report = validate_df(invalid, return_report=True)
+    counts = report.set_index(["column", "check"])["failure_count"]
+    assert len(result) == 1
+    assert counts[("race", "isin")] == 1
+    assert counts[("hours-per-week", "integer")] == 1
+    assert counts[("DataFrame", "empty_rows")] == 1
+    assert counts[("DataFrame", "duplicate_rows")] == 0
+    assert counts.sum() == 3
+
+# Case 8: Test for Leading Spaces - Values of the raw file are stripped
+def test_validate_strip_spaces():
+    spaced = valid_data.copy()
+    spaced["workclass"] = " " + spaced["workclass"]
+    assert validate_df(spaced).equals(valid_data)
+
+# Case 9: Test for Categorical Columns - Codes are checked against the schema
+def test_validate_categorical_columns():
+    categorical = valid_data.astype({"workclass": "category", "sex": "category"})
+    categorical.loc[1, "workclass"] = np.nan
+    result = validate_df(categorical)
+    assert len(result) == 2
+    assert isinstance(result["workclass"].dtype, pd.CategoricalDtype)
+
+# Case 10: Test for the Error Sink - Failures are collected without configuring logging
+def test_validate_error_sink():
+    invalid = pd.concat([duplicates, na_rows.iloc[[2]]], ignore_index=True)
+    invalid.loc[0, "race"] = "Unknown"
+    handlers = list(logging.getLogger().handlers)
+    error_sink = ErrorSink(sample_size=10)
+    _, report = validate_df(invalid, return_report=True, error_sink=error_sink)
+    assert error_sink.report.equals(report)
+    assert error_sink.failing_rows == 3
+    assert error_sink.examples[0]["failed_checks"] == ["race:isin"]
+    assert logging.getLogger().handlers == handlers
+
+# Case 11: Test for Row Fingerprints - The fingerprints of the validated rows are added
+def test_validate_fingerprint_column():
+    rows = pd.concat([duplicates, na_rows.iloc[[2]]], ignore_index=True)
+    result, report = validate_df(rows, return_report=True, fingerprint=True)
+    counts = report.set_index("check")["failure_count"]
+    assert (counts["duplicate_rows"], counts["empty_rows"]) == (1, 1)
+    assert list(result[FINGERPRINT_COLUMN]) == list(row_fingerprint(duplicates.iloc[:2]))
+
+# Case 12: Test for Edited Rows - Fingerprints carried from before an edit are not trusted
+def test_validate_edited_after_fingerprint():
+    validated = validate_df(valid_data, fingerprint=True)
+    edited = validated.copy()
+    edited.iloc[1] = edited.iloc[0]
+    edited.loc[1, "age"] = 40
+    result = validate_df(edited, fingerprint=True)
+    assert len(result) == 2
+    assert list(result[FINGERPRINT_COLUMN]) == list(row_fingerprint(edited.drop(columns=FINGERPRINT_COLUMN)))
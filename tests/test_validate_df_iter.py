@@ -0,0 +1,44 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validate_df import validate_df
+from src.validate_df_iter import validate_df_iter
+from src.row_fingerprint import row_fingerprint
+from src.error_sink import ErrorSink
+from test_validate_df import valid_data, duplicates
+
+rows = pd.concat([duplicates, valid_data, duplicates], ignore_index=True)
+rows.loc[4, "sex"] = "Unknown"
+
+# Case 1: Chunked validation gives the same rows as validating the whole frame
+def test_same_as_validate_df():
+    chunks = [rows.iloc[i:i + 2] for i in range(0, len(rows), 2)]
+    result = pd.concat([chunk for chunk, _ in validate_df_iter(chunks)], ignore_index=True)
+    assert result.equals(validate_df(rows))
+
+# Case 2: Duplicates across chunk boundaries are counted and dropped
+def test_duplicates_across_chunks():
+    results = list(validate_df_iter([duplicates, duplicates.iloc[[1]], valid_data]))
+    assert [len(chunk) for chunk, _ in results] == [2, 0, 0]
+    counts = [report.set_index("check").loc["duplicate_rows", "failure_count"] for _, report in results]
+    assert counts == [1, 1, 2]
+
+# Case 3: No chunks give no output
+def test_no_chunks():
+    assert list(validate_df_iter([])) == []
+
+# Case 4: Duplicates of rows seen before the first chunk are dropped
+def test_seen_fingerprints():
+    seen = np.sort(row_fingerprint(validate_df(duplicates)))
+    results = list(validate_df_iter([valid_data, duplicates], seen=seen))
+    assert [len(chunk) for chunk, _ in results] == [0, 0]
+
+# Case 5: The error sink counts the failures of every chunk, including duplicates across chunks
+def test_error_sink():
+    error_sink = ErrorSink(sample_size=2)
+    reports = [report for _, report in validate_df_iter([duplicates, duplicates.iloc[[1]], rows], error_sink=error_sink)]
+    total = pd.concat(reports).groupby(["column", "check"], sort=False, as_index=False).sum()
+    assert error_sink.report.equals(total)
+    assert len(error_sink.examples) == 2
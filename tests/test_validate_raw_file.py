@@ -1,6 +1,7 @@
 import sys
 import os
 import tempfile
+import zipfile
 import pytest
 import pandas as pd
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -30,3 +31,32 @@ def test_nonexistent_file():
     with pytest.raises(FileNotFoundError) as excinfo:
         validate_raw_file(nonexistent_file)
     assert "Unable to find raw file" in str(excinfo.value)
+
+def test_valid_member(tmp_path):
+    """Test with a .data member inside a ZIP archive."""
+    archive = tmp_path / "adult.zip"
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("adult.data", "")
+    validate_raw_file(str(archive), "adult.data")
+
+def test_missing_member(tmp_path):
+    """Test with a member that is not in the ZIP archive."""
+    archive = tmp_path / "adult.zip"
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("adult.names", "")
+    with pytest.raises(FileNotFoundError) as excinfo:
+        validate_raw_file(str(archive), "adult.data")
+    assert "Unable to find adult.data" in str(excinfo.value)
+
+def test_member_of_non_zip():
+    """Test with a member of a file that is not a ZIP archive."""
+    with pytest.raises(ValueError) as excinfo:
+        validate_raw_file("tests/data/non_zip.csv", "adult.data")
+    assert "is not a ZIP file" in str(excinfo.value)
+
+def test_valid_test_member(tmp_path):
+    """Test with the .test member of the dataset archive."""
+    archive = tmp_path / "adult.zip"
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("adult.test", "")
+    validate_raw_file(str(archive), "adult.test")
@@ -0,0 +1,72 @@
+# test_validate_training_data.py
+
+import sys
+import os
+import pytest
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validate_training_data import validate_training_data
+
+# SETUP
+
+rng = np.random.default_rng(522)
+n_rows = 1000
+
+# Independent features and a 25%/75% label
+train_df = pd.DataFrame({
+    "sex": rng.choice(["Female", "Male"], n_rows),
+    "race": rng.choice(["White", "Black", "Other"], n_rows),
+    "workclass": rng.choice(["Private", "State-gov", "Local-gov"], n_rows),
+    "income": rng.choice([">50K", "<=50K"], n_rows, p=[0.25, 0.75]),
+})
+
+# TESTS
+
+# Test 1: Independent features pass every check
+def test_validate_training_data_passes():
+    result = validate_training_data(train_df)
+    assert 0.2 < result["class_ratio"] < 0.4
+    assert list(result["pps"].index) == ["sex", "race", "workclass"]
+    assert (result["pps"] < 0.1).all()
+    assert result["correlated_pairs"] == []
+
+# Test 2: Balanced classes fail the class ratio condition, as in deepchecks
+def test_validate_training_data_class_ratio():
+    balanced = train_df.assign(income=np.tile([">50K", "<=50K"], n_rows // 2))
+    with pytest.raises(ValueError, match="Class imbalance"):
+        validate_training_data(balanced)
+
+# Test 3: A feature that predicts the label fails the predictive power score condition
+def test_validate_training_data_pps():
+    leaky = train_df.assign(leak=train_df["income"].map({">50K": "a", "<=50K": "b"}))
+    with pytest.raises(ValueError, match="Feature-Label"):
+        validate_training_data(leaky)
+
+# Test 4: More than the allowed number of correlated feature pairs fail
+def test_validate_training_data_correlated_pairs():
+    copies = train_df.assign(**{f"sex_{i}": train_df["sex"].astype("category") for i in range(2)})
+    result = validate_training_data(copies)
+    assert len(result["correlated_pairs"]) == 3
+    assert all(correlation == pytest.approx(1.0) for _, _, correlation in result["correlated_pairs"])
+
+    copies["sex_2"] = copies["sex"]
+    with pytest.raises(ValueError, match="Feature-Feature"):
+        validate_training_data(copies)
+
+# Test 5: Sampling is reproducible with the same seed
+def test_validate_training_data_sample():
+    first = validate_training_data(train_df, sample_size=200, random_state=1)
+    second = validate_training_data(train_df, sample_size=200, random_state=1)
+    pd.testing.assert_series_equal(first["pps"], second["pps"])
+    assert first["class_ratio"] == second["class_ratio"]
+
+# Test 6: Near-unique features without signal pass, numeric or categorical, even in small samples
+def test_validate_training_data_high_cardinality():
+    noisy = train_df.assign(
+        fnlwgt=rng.integers(10_000, 1_000_000, n_rows),
+        row_id=[f"id{i}" for i in range(n_rows)],
+    )
+    result = validate_training_data(noisy, sample_size=200, random_state=1)
+    assert result["pps"]["fnlwgt"] < 0.2
+    assert result["pps"]["row_id"] == 0.0
@@ -0,0 +1,88 @@
+import sys
+import os
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validate_df import validate_df, SCHEMA_KEY
+from src.validation_cache import validation_cache_key, hash_frame, hash_file, read_cached_result, write_cached_result
+from test_validate_df import valid_data, duplicates
+
+# Case 1: Keys depend on every part
+def test_cache_key():
+    assert validation_cache_key(SCHEMA_KEY, "a") == validation_cache_key(SCHEMA_KEY, "a")
+    assert validation_cache_key(SCHEMA_KEY, "a") != validation_cache_key(SCHEMA_KEY, "b")
+    assert validation_cache_key("ab", "c") != validation_cache_key("a", "bc")
+
+# Case 2: Frame hashes follow the content
+def test_hash_frame():
+    assert hash_frame(valid_data) == hash_frame(valid_data.copy())
+    assert hash_frame(valid_data) != hash_frame(duplicates)
+    assert hash_frame(valid_data) != hash_frame(valid_data.iloc[::-1])
+
+# Case 3: File hashes match the SHA-256 checksum
+def test_hash_file(tmp_path):
+    path = tmp_path / "adult.data"
+    path.write_bytes(b"")
+    assert hash_file(str(path)) == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+
+# Case 4: Cached results round trip and are missing until written
+def test_read_write_cached_result(tmp_path):
+    assert read_cached_result(str(tmp_path), "ab" * 32) is None
+    report = pd.DataFrame({"column": ["age"], "check": ["integer"], "failure_count": [0]})
+    write_cached_result(str(tmp_path), "ab" * 32, valid_data, report)
+    cached_data, cached_report = read_cached_result(str(tmp_path), "ab" * 32)
+    assert cached_data.equals(valid_data) and cached_report.equals(report)
+
+# Case 5: validate_df reuses the cached result of an unchanged frame
+def test_validate_df_cache(tmp_path):
+    result, report = validate_df(duplicates, return_report=True, cache_dir=str(tmp_path))
+    assert len(result) == 2
+
+    # Replace the cached result, which the next call must return unchanged
+    key = validation_cache_key(SCHEMA_KEY, hash_frame(duplicates))
+    write_cached_result(str(tmp_path), key, result.iloc[:1], report)
+    assert len(validate_df(duplicates, cache_dir=str(tmp_path))) == 1
+    assert len(validate_df(valid_data, cache_dir=str(tmp_path))) == 2
+
+# Case 6: Frames edited after validation get a new key, whatever fingerprints they carry
+def test_validate_df_cache_edited(tmp_path):
+    validated = validate_df(valid_data, fingerprint=True)
+    assert validate_df(validated, cache_dir=str(tmp_path)).loc[0, "age"] == 0
+    edited = validated.copy()
+    edited.loc[0, "age"] = 100
+    assert hash_frame(edited) != hash_frame(validated)
+    assert validate_df(edited, cache_dir=str(tmp_path)).loc[0, "age"] == 100
+
+# Case 7: A cached validation run restores its error log rather than keeping an older one
+def test_read_and_validate_cached_error_log(tmp_path):
+    from click.testing import CliRunner
+    from scripts.read_and_validate import main as read_and_validate
+    raw_files = {
+        "clean.data": "39, State-gov, 77516, Bachelors, 13, Never-married, Adm-clerical, Not-in-family, White, Male, 2174, 0, 40, United-States, <=50K\n",
+        "dirty.data": "37, ?, 284582, Masters, 14, Married-civ-spouse, Exec-managerial, Wife, White, Female, 0, 0, 40, United-States, <=50K\n",
+    }
+    error_log = str(tmp_path / "logs" / "validation_errors.jsonl")
+    logs = []
+    for name in ["dirty.data", "clean.data", "dirty.data"]:
+        (tmp_path / name).write_text(raw_files["clean.data"] + raw_files[name])
+        result = CliRunner().invoke(read_and_validate, [
+            "--raw_dir", str(tmp_path / name), "--processor_dir", str(tmp_path / "processed"),
+            "--cache_dir", str(tmp_path / "cache"), "--error_log", error_log,
+        ])
+        assert result.exit_code == 0, result.output
+        with open(error_log) as f:
+            logs.append(f.read())
+    assert "restored" in result.output
+    assert logs[0] == logs[2] != logs[1]
+
+# Case 8: Row hashes ignore dtypes and carried fingerprints, but not values or column names, and reuse given fingerprints
+def test_hash_rows(tmp_path):
+    from src.validation_cache import hash_rows
+    from src.read_adult_data import read_adult_data
+    from src.row_fingerprint import FINGERPRINT_COLUMN
+    path = str(tmp_path / "cleaned_data.csv")
+    validate_df(valid_data, fingerprint=True).to_csv(path, index=False)
+    reread = read_adult_data(path, verbose=False)
+    assert hash_rows(reread) == hash_rows(valid_data) == hash_rows(reread.drop(columns=FINGERPRINT_COLUMN))
+    assert hash_rows(reread, reread[FINGERPRINT_COLUMN].to_numpy()) == hash_rows(valid_data)
+    assert hash_rows(valid_data) != hash_rows(duplicates)
+    assert hash_rows(valid_data) != hash_rows(valid_data.rename(columns={"age": "years"}))
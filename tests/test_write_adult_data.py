@@ -0,0 +1,72 @@
+import sys
+import os
+import io
+import pytest
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_adult_data import read_adult_data
+from src.write_adult_data import write_adult_data
+from test_validate_df import valid_data
+
+compact = read_adult_data(io.StringIO(valid_data.to_csv(index=False)), verbose=False)
+
+# Case 1: Data written in every format reads back with the same values and dtypes
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_round_trip(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"cleaned_data{extension}")
+    assert write_adult_data(compact, path) == 2
+    assert read_adult_data(path, verbose=False).equals(compact)
+
+# Case 2: Chunks are appended to a single file
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_write_chunks(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"cleaned_data{extension}")
+    chunks = [compact.iloc[[0]], compact.iloc[[1]]]
+    assert write_adult_data(iter(chunks), path) == 2
+    assert read_adult_data(path, verbose=False).equals(compact)
+
+# Case 3: Columnar chunks with differently downcast integers share one schema
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_write_chunks_mixed_dtypes(tmp_path, extension):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"cleaned_data{extension}")
+    chunks = [compact.iloc[[0]], compact.iloc[[1]].astype({"age": "float64", "fnlwgt": "int64"})]
+    write_adult_data(iter(chunks), path)
+    assert read_adult_data(path, verbose=False).equals(compact)
+
+# Case 4: Only the requested columns are read back
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_column_projection(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"cleaned_data{extension}")
+    write_adult_data(compact, path)
+    result = read_adult_data(path, verbose=False, columns=["sex", "income"])
+    assert result.equals(compact[["sex", "income"]])
+    chunks = list(read_adult_data(path, chunksize=1, columns=["age"]))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+
+# Case 5: Rows are appended to an existing CSV file without a second header
+def test_append(tmp_path):
+    path = str(tmp_path / "cleaned_data.csv")
+    write_adult_data(compact.iloc[[0]], path)
+    assert write_adult_data(compact.iloc[[1]], path, append=True) == 1
+    assert read_adult_data(path, verbose=False).equals(compact)
+    with pytest.raises(ValueError):
+        write_adult_data(compact, str(tmp_path / "cleaned_data.parquet"), append=True)
+
+# Case 6: No chunks at all still write a file with the columns and no rows
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_write_no_chunks(tmp_path, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"cleaned_data{extension}")
+    assert write_adult_data(iter([]), path) == 0
+    result = read_adult_data(path, verbose=False)
+    assert len(result) == 0 and list(result.columns) == list(valid_data.columns)
+    assert write_adult_data(iter([]), path, columns=["age", "income"]) == 0
+    assert list(read_adult_data(path, verbose=False).columns) == ["age", "income"]